@@ -0,0 +1,111 @@
+"""Pre-rendered reference data responses.
+
+The symptom category and symptom lists are rendered to JSON and gzip bytes
+once per reference data version (see `apps.health.reference`). The bytes
+are kept in the shared cache and in process memory, so a list request only
+reads the version and copies bytes.
+"""
+
+import gzip
+import hashlib
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+from apps.api.v1.health.serializer.serializers import (
+    SymptomCategorySerializer,
+    SymptomListItemSerializer,
+)
+from apps.health import reference
+from apps.health.models import Symptom, SymptomCategory
+
+
+class RenderedDocument(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+
+_local_bundle = (None, None)
+
+
+def get_bundle():
+    """Return `{name: RenderedDocument}` for the current reference data version."""
+    global _local_bundle
+
+    version = reference.get_version()
+    local_version, bundle = _local_bundle
+    if local_version == version:
+        return bundle
+
+    key = f"health-reference-bundle:{version}"
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = _build_bundle()
+        cache.set(key, bundle, settings.CACHE_TIMEOUT)
+    _local_bundle = (version, bundle)
+    return bundle
+
+
+def document_response(request, name):
+    """Serve a pre-rendered document, with 304 and gzip when the client allows."""
+    document = get_bundle()[name]
+    # If-None-Match uses the weak comparison.
+    etags = [
+        tag.removeprefix("W/")
+        for tag in parse_etags(request.headers.get("If-None-Match", ""))
+    ]
+    if document.etag in etags or "*" in etags:
+        response = HttpResponseNotModified()
+    elif accepts_gzip(request.headers.get("Accept-Encoding", "")):
+        response = HttpResponse(document.gzipped, content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(document.body, content_type="application/json")
+    response["ETag"] = document.etag
+    response["Vary"] = "Accept-Encoding"
+    response["Cache-Control"] = "public, no-cache"
+    return response
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an `Accept-Encoding` header allows gzip, honouring `q=0`."""
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0) > 0
+
+
+def _build_bundle():
+    categories = SymptomCategory.objects.prefetch_related("symptoms").order_by("name")
+    # Each symptom nests its category without that category's symptoms, so
+    # the document grows linearly with the number of symptoms.
+    symptoms = Symptom.objects.select_related("category")
+    return {
+        "categories": _render(SymptomCategorySerializer(categories, many=True).data),
+        "symptoms": _render(SymptomListItemSerializer(symptoms, many=True).data),
+    }
+
+
+def _render(data):
+    body = JSONRenderer().render(data)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    # mtime=0 keeps the compressed bytes identical for identical content.
+    return RenderedDocument(body, gzip.compress(body, mtime=0), etag)
@@ -1,6 +1,16 @@
+import datetime
+
 from rest_framework import serializers
 
-from apps.health.models import DailyLog, Symptom, SymptomCategory
+from apps.health.models import (
+    AGE_GROUPS,
+    DailyLog,
+    Symptom,
+    SymptomCategory,
+    SymptomCooccurrence,
+)
+
+MAX_SYNC_DAYS = 1000
 
 
 class SymptomSerializer(serializers.ModelSerializer):
@@ -25,6 +35,22 @@ class SymptomWithCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "category"]
 
 
+class SymptomCategoryInfoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SymptomCategory
+        fields = ["id", "name", "description"]
+
+
+class SymptomListItemSerializer(serializers.ModelSerializer):
+    """Симптом с категорией, но без списка симптомов этой категории."""
+
+    category = SymptomCategoryInfoSerializer(read_only=True)
+
+    class Meta:
+        model = Symptom
+        fields = ["id", "name", "category"]
+
+
 class SymptomRetrieveSerializer(serializers.ModelSerializer):
     category = serializers.CharField(source="category.name", read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
@@ -85,3 +111,142 @@ class DailyLogSerializer(serializers.ModelSerializer):
             instance.symptoms.set(validated_data["symptoms_id"])
         instance.save()
         return instance
+
+
+class SymptomDiffSerializer(serializers.Serializer):
+    add = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        default=list,
+        max_length=64,
+        help_text="Id симптомов, которые нужно добавить",
+    )
+    remove = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        default=list,
+        max_length=64,
+        help_text="Id симптомов, которые нужно удалить",
+    )
+
+    def validate(self, attrs):
+        if set(attrs["add"]) & set(attrs["remove"]):
+            raise serializers.ValidationError(
+                "A symptom cannot be both added and removed.",
+            )
+        known = {symptom_id for symptom_id in Symptom.ids_by_bit() if symptom_id}
+        unknown = [
+            str(symptom_id) for symptom_id in attrs["add"] if symptom_id not in known
+        ]
+        if unknown:
+            raise serializers.ValidationError({"add": f"Unknown symptoms: {unknown}"})
+        return attrs
+
+
+class SymptomDiffResultSerializer(serializers.Serializer):
+    id = serializers.UUIDField(allow_null=True)
+    date = serializers.DateField()
+    symptoms_id = serializers.ListField(child=serializers.UUIDField())
+    updated_at = serializers.DateTimeField(allow_null=True)
+
+
+class DailyLogSyncItemSerializer(serializers.Serializer):
+    pet_id = serializers.UUIDField()
+    days = serializers.DictField(
+        child=serializers.ListField(child=serializers.UUIDField(), max_length=64),
+        allow_empty=False,
+        help_text="Симптомы по датам: `{YYYY-MM-DD: [id симптомов]}`",
+    )
+
+    def validate_days(self, value):
+        today = DailyLog.local_today(self.context.get("timezone"))
+        days = {}
+        for date, symptom_ids in value.items():
+            try:
+                date = datetime.date.fromisoformat(date)
+            except ValueError:
+                raise serializers.ValidationError(
+                    "Date has wrong format. Use YYYY-MM-DD.",
+                )
+            if date > today:
+                raise serializers.ValidationError("Date cannot be in the future.")
+            days[date] = symptom_ids
+        return days
+
+
+class DailyLogSyncSerializer(serializers.Serializer):
+    logs = DailyLogSyncItemSerializer(many=True, allow_empty=False, max_length=100)
+
+    def validate_logs(self, value):
+        pet_ids = [item["pet_id"] for item in value]
+        if len(set(pet_ids)) != len(pet_ids):
+            raise serializers.ValidationError("Each pet can be listed only once.")
+        if sum(len(item["days"]) for item in value) > MAX_SYNC_DAYS:
+            raise serializers.ValidationError(
+                f"Cannot sync more than {MAX_SYNC_DAYS} days at once.",
+            )
+
+        known = {symptom_id for symptom_id in Symptom.ids_by_bit() if symptom_id}
+        unknown = sorted(
+            {
+                str(symptom_id)
+                for item in value
+                for symptom_ids in item["days"].values()
+                for symptom_id in symptom_ids
+                if symptom_id not in known
+            },
+        )
+        if unknown:
+            raise serializers.ValidationError(f"Unknown symptoms: {unknown}")
+        return value
+
+
+class DailyLogSyncResultSerializer(SymptomDiffResultSerializer):
+    pet_id = serializers.UUIDField()
+
+
+class SymptomCalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    symptoms = serializers.ListField(child=serializers.UUIDField())
+
+
+class SymptomCalendarCountSerializer(serializers.Serializer):
+    symptom_id = serializers.UUIDField()
+    days = serializers.IntegerField(help_text="Количество дней с симптомом")
+
+
+class SymptomCalendarSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    days = SymptomCalendarDaySerializer(many=True)
+    symptom_counts = SymptomCalendarCountSerializer(many=True)
+
+
+class SymptomCooccurrenceSerializer(serializers.ModelSerializer):
+    symptom = SymptomSerializer(read_only=True)
+    other_symptom = SymptomSerializer(read_only=True)
+
+    class Meta:
+        model = SymptomCooccurrence
+        fields = [
+            "symptom",
+            "other_symptom",
+            "together",
+            "support",
+            "confidence",
+            "lift",
+            "computed_at",
+        ]
+
+
+class SymptomTrendQuerySerializer(serializers.Serializer):
+    symptom = serializers.PrimaryKeyRelatedField(queryset=Symptom.objects.all())
+    breed = serializers.UUIDField(required=False)
+    age_group = serializers.ChoiceField(choices=AGE_GROUPS, required=False)
+
+
+class SymptomTrendPointSerializer(serializers.Serializer):
+    month = serializers.DateField()
+    log_count = serializers.IntegerField(help_text="Количество дневных логов за месяц")
+    days = serializers.IntegerField(help_text="Количество логов с симптомом")
+    frequency = serializers.FloatField(help_text="Доля логов с симптомом")
@@ -11,6 +11,12 @@ router.register(
     basename="symptomcategory",
 )
 router.register(r"symptoms", views.SymptomViewSet, basename="symptom")
+router.register(
+    r"symptom-cooccurrences",
+    views.SymptomCooccurrenceViewSet,
+    basename="symptom-cooccurrence",
+)
+router.register(r"symptom-trends", views.SymptomTrendViewSet, basename="symptom-trend")
 
 
 urlpatterns = [
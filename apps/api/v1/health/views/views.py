@@ -1,17 +1,31 @@
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
-from rest_framework import permissions, status, viewsets
+from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.api.v1.health.bundle import document_response
 from apps.api.v1.health.serializer.serializers import (
     DailyLogSerializer,
     SymptomCategorySerializer,
+    SymptomCooccurrenceSerializer,
+    SymptomListItemSerializer,
+    SymptomTrendPointSerializer,
+    SymptomTrendQuerySerializer,
     SymptomWithCategorySerializer,
 )
-from apps.health.models import DailyLog, Symptom, SymptomCategory
+from apps.health.analytics import trend_series
+from apps.health.models import (
+    DailyLog,
+    Symptom,
+    SymptomCategory,
+    SymptomCooccurrence,
+    SymptomTrend,
+)
 from apps.pets.models import Pet
+from utils.datetime_utils import request_timezone
+from utils.pagintaion import CustomPageNumberPagination
 
 
 class IsOwner(permissions.BasePermission):
@@ -31,6 +45,9 @@ class SymptomCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
     authentication_classes = []
 
+    def list(self, request, *args, **kwargs):
+        return document_response(request, "categories")
+
 
 @extend_schema(tags=["Reference Data"], summary="Получение списка доступных симптомов")
 class SymptomViewSet(viewsets.ReadOnlyModelViewSet):
@@ -43,6 +60,62 @@ class SymptomViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
     authentication_classes = []
 
+    @extend_schema(responses={200: SymptomListItemSerializer(many=True)})
+    def list(self, request, *args, **kwargs):
+        """Список симптомов с категорией (без вложенного списка её симптомов)."""
+        return document_response(request, "symptoms")
+
+
+@extend_schema(
+    tags=["Health"],
+    summary="Симптомы, которые встречаются вместе",
+)
+class SymptomCooccurrenceViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Пары симптомов по всем питомцам, от самых сильно связанных (lift).
+
+    Пересчитывается каждую ночь; фильтр `symptom` оставляет пары одного симптома.
+    """
+
+    queryset = SymptomCooccurrence.objects.select_related(
+        "symptom",
+        "other_symptom",
+    ).order_by("-lift", "-together")
+    serializer_class = SymptomCooccurrenceSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CustomPageNumberPagination
+    filterset_fields = ["symptom"]
+
+
+@extend_schema(tags=["Health"], summary="Частота симптома по месяцам")
+class SymptomTrendViewSet(viewsets.GenericViewSet):
+    serializer_class = SymptomTrendPointSerializer
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[SymptomTrendQuerySerializer],
+        responses={200: SymptomTrendPointSerializer(many=True)},
+    )
+    def list(self, request, *args, **kwargs):
+        """Доля дневных логов с симптомом по месяцам по всем питомцам.
+
+        Необязательные фильтры `breed` и `age_group` сужают выборку до породы
+        и возрастной группы. Пересчитывается каждую ночь.
+        """
+        query = SymptomTrendQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        trends = SymptomTrend.objects.all()
+        if "breed" in query.validated_data:
+            trends = trends.filter(breed_id=query.validated_data["breed"])
+        if "age_group" in query.validated_data:
+            trends = trends.filter(age_group=query.validated_data["age_group"])
+
+        series = trend_series(
+            trends.values_list("month", "log_count", "symptom_counts"),
+            query.validated_data["symptom"].bit,
+        )
+        return Response(SymptomTrendPointSerializer(series, many=True).data)
+
 
 class DailyLogViewSet(viewsets.ModelViewSet):
     serializer_class = DailyLogSerializer
@@ -67,7 +140,7 @@ class DailyLogViewSet(viewsets.ModelViewSet):
                     {"detail": "У пользователя нет питомцев."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-        log = DailyLog.get_today_log(pet)
+        log = DailyLog.find_today_log(pet, user_timezone=request_timezone(request))
         serializer = self.get_serializer(log)
         return Response(serializer.data)
 
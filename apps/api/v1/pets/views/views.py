@@ -1,3 +1,6 @@
+import datetime
+import uuid
+
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
@@ -9,17 +12,27 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from apps.api.v1.health.serializer.serializers import DailyLogSerializer
+from apps.api.v1.health.serializer.serializers import (
+    DailyLogSerializer,
+    DailyLogSyncResultSerializer,
+    DailyLogSyncSerializer,
+    SymptomCalendarSerializer,
+    SymptomDiffResultSerializer,
+    SymptomDiffSerializer,
+)
 from apps.api.v1.health.views.views import IsOwner
 from apps.api.v1.pets.serializer.serializers import (
     BreedSerializer,
     PetSerializer,
     TemperamentSerializer,
 )
-from apps.health.models import DailyLog
+from apps.health.models import DailyLog, Symptom
 from apps.pets.models import Breed, Pet, Temperament
+from utils.datetime_utils import local_today, request_timezone
 from utils.pagintaion import CustomPageNumberPagination
 
+MAX_CALENDAR_DAYS = 366
+
 
 @extend_schema(tags=["User Pets Management"])
 class PetViewSet(viewsets.ModelViewSet):
@@ -93,7 +106,10 @@ class PetViewSet(viewsets.ModelViewSet):
     parameters=[
         OpenApiParameter(
             name="timezone",
-            description="Часовой пояс пользователя (например, Europe/Minsk)",
+            description=(
+                "Часовой пояс пользователя (например, Europe/Minsk), "
+                "по умолчанию из профиля"
+            ),
             required=False,
             type=str,
             location=OpenApiParameter.QUERY,
@@ -110,17 +126,67 @@ class SymptomLogViewSet(
     pagination_class = None
     queryset = DailyLog.objects.all()
 
+    def _find_log(self, pk, user_timezone=None):
+        """Лог за сегодня без записи в БД, кешируется на время запроса."""
+        if not hasattr(self, "_today_logs"):
+            self._today_logs = {}
+        key = (pk, user_timezone)
+        if key not in self._today_logs:
+            self._today_logs[key] = DailyLog.find_today_log(
+                pk,
+                user_timezone=user_timezone,
+            )
+        return self._today_logs[key]
+
     def _get_log(self, pk, user_timezone=None):
-        return DailyLog.get_today_log(pk, user_timezone=user_timezone)
+        """Лог за сегодня, созданный в БД при необходимости."""
+        log = self._find_log(pk, user_timezone=user_timezone).materialize()
+        self._today_logs[(pk, user_timezone)] = log
+        return log
+
+    def _apply_diff(self, pk, add=(), remove=(), user_timezone=None):
+        """Применить изменения симптомов к логу за сегодня.
+
+        Возвращает новое состояние лога или None, если питомец не найден.
+        Лог создается, только если есть что добавить.
+        """
+        try:
+            uuid.UUID(str(pk))
+        except ValueError:
+            return None
+
+        today = DailyLog.local_today(user_timezone)
+        owner = self.request.user.pk
+        row = DailyLog.apply_symptom_diff(pk, today, add, remove, owner=owner)
+        if row is None:
+            if not Pet.objects.filter(pk=pk, owner=owner).exists():
+                return None
+            if not add:
+                return {
+                    "id": None,
+                    "date": today,
+                    "symptoms_id": [],
+                    "updated_at": None,
+                }
+            DailyLog.materialize_log(pk, today)
+            row = DailyLog.apply_symptom_diff(pk, today, add, remove, owner=owner)
+
+        log_id, symptom_mask, updated_at = row
+        return {
+            "id": log_id,
+            "date": today,
+            "symptoms_id": Symptom.ids_of_mask(symptom_mask),
+            "updated_at": updated_at,
+        }
 
     def list(self, request, *args, **kwargs):
-        user_timezone = request.GET.get("timezone", None)
-        log = self._get_log(kwargs.get("pet_pk"), user_timezone=user_timezone)
+        user_timezone = request_timezone(request)
+        log = self._find_log(kwargs.get("pet_pk"), user_timezone=user_timezone)
         serializer = self.get_serializer(log)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def create(self, request, *args, **kwargs):
-        user_timezone = request.GET.get("timezone", None)
+        user_timezone = request_timezone(request)
         serializer = self.get_serializer(
             data=request.data,
             context={"timezone": user_timezone, "pet_id": kwargs.get("pet_pk")},
@@ -137,8 +203,8 @@ class SymptomLogViewSet(
     )
     def clear_all_symptom(self, request, *args, **kwargs):
         """Очищает все симптомы для указанного питомца."""
-        user_timezone = request.GET.get("timezone", None)
-        log = self._get_log(kwargs.get("pet_pk"), user_timezone=user_timezone)
+        user_timezone = request_timezone(request)
+        log = self._find_log(kwargs.get("pet_pk"), user_timezone=user_timezone)
 
         if not log:
             return Response(
@@ -146,30 +212,163 @@ class SymptomLogViewSet(
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        log.symptoms.clear()
-        log.save()
+        # Пустой лог, которого еще нет в БД, очищать не нужно.
+        if not log.is_virtual:
+            log.symptoms.clear()
+            log.save()
         return Response(
             {"detail": "All symptoms removed successfully."},
             status=status.HTTP_200_OK,
         )
 
+    @extend_schema(
+        summary="Календарь симптомов питомца",
+        responses={
+            200: SymptomCalendarSerializer,
+            400: OpenApiResponse(
+                description="Некорректный запрос",
+                examples=[
+                    OpenApiExample(
+                        name="Дата невалидна",
+                        value={"date": "Date has wrong format. Use YYYY-MM-DD."},
+                    ),
+                    OpenApiExample(
+                        name="Слишком большой диапазон",
+                        value={"date": "Range cannot be longer than 366 days."},
+                    ),
+                ],
+            ),
+        },
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                required=False,
+                type=datetime.date,
+                description="Дата начала периода. По умолчанию год до `to`.",
+            ),
+            OpenApiParameter(
+                name="to",
+                required=False,
+                type=datetime.date,
+                description="Дата окончания периода, по умолчанию текущая дата.",
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get"], url_path="calendar")
+    def calendar(self, request, *args, **kwargs):
+        """Возвращает симптомы питомца по дням и число дней с каждым симптомом за период."""
+        try:
+            end_date = request.query_params.get("to")
+            end_date = (
+                datetime.date.fromisoformat(end_date)
+                if end_date
+                else local_today(request_timezone(request))
+            )
+            start_date = request.query_params.get("from")
+            start_date = (
+                datetime.date.fromisoformat(start_date)
+                if start_date
+                else end_date - datetime.timedelta(days=MAX_CALENDAR_DAYS - 1)
+            )
+        except ValueError:
+            return Response(
+                {"date": "Date has wrong format. Use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end_date < start_date:
+            return Response(
+                {"date": "End date cannot be before start date"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (end_date - start_date).days >= MAX_CALENDAR_DAYS:
+            return Response(
+                {"date": f"Range cannot be longer than {MAX_CALENDAR_DAYS} days."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pet = Pet.objects.filter(pk=kwargs.get("pet_pk"), owner=request.user).first()
+        if not pet:
+            return Response(
+                {"detail": "Pet not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        days, counts = DailyLog.symptom_calendar(pet.pk, start_date, end_date)
+        serializer = SymptomCalendarSerializer(
+            {
+                "start_date": start_date,
+                "end_date": end_date,
+                "days": [
+                    {"date": date, "symptoms": symptom_ids}
+                    for date, symptom_ids in days
+                ],
+                "symptom_counts": [
+                    {"symptom_id": symptom_id, "days": count}
+                    for symptom_id, count in counts.most_common()
+                ],
+            },
+        )
+        return Response(serializer.data)
+
+    @extend_schema(
+        summary="Добавить и удалить симптомы за сегодня одним запросом",
+        request=SymptomDiffSerializer,
+        responses={
+            200: SymptomDiffResultSerializer,
+            400: OpenApiResponse(
+                description="Некорректный запрос",
+                examples=[
+                    OpenApiExample(
+                        name="Симптом и добавляется, и удаляется",
+                        value={
+                            "non_field_errors": [
+                                "A symptom cannot be both added and removed.",
+                            ],
+                        },
+                    ),
+                ],
+            ),
+            404: OpenApiResponse(description="Питомец не найден"),
+        },
+    )
+    @action(detail=False, methods=["patch"], url_path="diff", url_name="diff")
+    def diff(self, request, *args, **kwargs):
+        """Применяет изменения `{add: [...], remove: [...]}` к симптомам за сегодня.
+
+        Возвращает id симптомов лога после изменения.
+        """
+        serializer = SymptomDiffSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        state = self._apply_diff(
+            kwargs.get("pet_pk"),
+            add=serializer.validated_data["add"],
+            remove=serializer.validated_data["remove"],
+            user_timezone=request_timezone(request),
+        )
+        if state is None:
+            return Response(
+                {"detail": "Pet not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(SymptomDiffResultSerializer(state).data)
+
     # TODO: Добавить документацию к методам add_symptom и remove_symptom\
-    # TODO: Использовать Timezone
     @action(detail=False, methods=["patch"], url_path="add", url_name="add_symptom")
     def add_symptom(self, request, *args, **kwargs):
         """Добавляет указанные симптом для указанного питомца."""
         symptom_id = request.data.get("symptoms_id", None)
-        log = self._get_log(kwargs.get("pet_pk"), user_timezone=None)
+        state = self._apply_diff(
+            kwargs.get("pet_pk"),
+            add=symptom_id or [],
+            user_timezone=request_timezone(request),
+        )
 
-        if not log:
+        if not state:
             return Response(
                 {"detail": "DailyLog not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        log.add_symptoms(symptom_id)
-        log.save()
-
         return Response(
             {"detail": "Symptom added successfully."},
             status=status.HTTP_200_OK,
@@ -184,23 +383,95 @@ class SymptomLogViewSet(
     def remove_symptom(self, request, *args, **kwargs):
         """Удаляет указанные симптом для указанного питомца."""
         symptom_id = request.data.get("symptoms_id", None)
-        log = self._get_log(kwargs.get("pet_pk"), user_timezone=None)
+        state = self._apply_diff(
+            kwargs.get("pet_pk"),
+            remove=symptom_id or [],
+            user_timezone=request_timezone(request),
+        )
 
-        if not log:
+        if not state:
             return Response(
                 {"detail": "DailyLog not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        log.remove_symptoms(symptom_id)
-        log.save()
-
         return Response(
             {"detail": "Symptom removed successfully."},
             status=status.HTTP_200_OK,
         )
 
 
+@extend_schema(tags=["User Pets Management"])
+class DailyLogSyncViewSet(viewsets.GenericViewSet):
+    serializer_class = DailyLogSyncSerializer
+    permission_classes = [IsAuthenticated]
+    queryset = DailyLog.objects.none()
+    pagination_class = None
+
+    @extend_schema(
+        summary="Синхронизация симптомов, записанных офлайн",
+        request=DailyLogSyncSerializer,
+        responses={
+            200: DailyLogSyncResultSerializer(many=True),
+            400: OpenApiResponse(description="Некорректный запрос"),
+            404: OpenApiResponse(description="Питомец не найден"),
+        },
+        parameters=[
+            OpenApiParameter(
+                name="timezone",
+                required=False,
+                type=str,
+                description="Часовой пояс для проверки дат, по умолчанию из профиля",
+            ),
+        ],
+    )
+    @action(detail=False, methods=["post"], url_path="sync")
+    def sync(self, request, *args, **kwargs):
+        """Загрузить симптомы за много дней и питомцев одним запросом.
+
+        Симптомы каждого переданного дня заменяются целиком, поэтому повтор
+        запроса безопасен. Число запросов к БД не зависит от размера пачки.
+        """
+        serializer = self.get_serializer(
+            data=request.data,
+            context={"timezone": request_timezone(request)},
+        )
+        serializer.is_valid(raise_exception=True)
+        logs = serializer.validated_data["logs"]
+
+        pet_ids = {item["pet_id"] for item in logs}
+        owned = Pet.objects.filter(id__in=pet_ids, owner=request.user).count()
+        if owned != len(pet_ids):
+            return Response(
+                {"detail": "Pet not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        rows = DailyLog.bulk_sync(
+            owner=request.user.pk,
+            days={
+                (item["pet_id"], date): symptom_ids
+                for item in logs
+                for date, symptom_ids in item["days"].items()
+            },
+        )
+        return Response(
+            DailyLogSyncResultSerializer(
+                [
+                    {
+                        "id": log_id,
+                        "pet_id": pet_id,
+                        "date": date,
+                        "symptoms_id": Symptom.ids_of_mask(symptom_mask),
+                        "updated_at": updated_at,
+                    }
+                    for log_id, pet_id, date, symptom_mask, updated_at in rows
+                ],
+                many=True,
+            ).data,
+        )
+
+
 @extend_schema(tags=["Reference Data"])
 class BreedViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Breed.objects.all()
@@ -1,23 +1,27 @@
-from django.db.models import Q
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
 from django_filters import rest_framework as filters
 
-from apps.reminders.models import Reminder, ReminderType
+from apps.reminders.models import SEARCH_CONFIG, Reminder, ReminderType
+
+RECURRING = Q(is_recurring=True, frequency_in_minutes__gt=0) | ~Q(rrule="")
 
 
 class ReminderFilter(filters.FilterSet):
     search = filters.CharFilter(method="filter_search")
 
+    # One-off reminders are matched by their time, recurring ones by their
+    # upcoming occurrence only: past occurrences are not stored, so a window
+    # before now never matches them. The occurrences endpoint expands them.
     time_from = filters.DateTimeFilter(
-        field_name="reminder_time",
-        lookup_expr="gte",
+        method="filter_time_from",
         input_formats=["%Y-%m-%dT%H:%M:%SZ"],
-        help_text="Start date for reminder time (UTC, format: YYYY-MM-DDTHH:MM:SSZ)",
+        help_text="Start date for reminder time; recurring reminders match by their upcoming occurrence, so past occurrences are not matched (UTC, format: YYYY-MM-DDTHH:MM:SSZ)",
     )
     time_to = filters.DateTimeFilter(
-        field_name="reminder_time",
-        lookup_expr="lte",
+        method="filter_time_to",
         input_formats=["%Y-%m-%dT%H:%M:%SZ"],
-        help_text="End date for reminder time (UTC, format: YYYY-MM-DDTHH:MM:SSZ)",
+        help_text="End date for reminder time; recurring reminders match by their upcoming occurrence, so past occurrences are not matched (UTC, format: YYYY-MM-DDTHH:MM:SSZ)",
     )
     reminder_type = filters.ModelChoiceFilter(
         queryset=ReminderType.objects.all(),
@@ -59,7 +63,32 @@ class ReminderFilter(filters.FilterSet):
             "ordering",
         ]
 
-    def filter_search(self, queryset, name, value):
+    def filter_time_from(self, queryset, name, value):
+        return queryset.filter(
+            (~RECURRING & Q(reminder_time__gte=value))
+            | (RECURRING & Q(next_fire_at__gte=value))
+        )
+
+    def filter_time_to(self, queryset, name, value):
         return queryset.filter(
-            Q(title__icontains=value) | Q(description__icontains=value)
+            (~RECURRING & Q(reminder_time__lte=value))
+            | (RECURRING & Q(next_fire_at__lte=value))
+        )
+
+    def filter_search(self, queryset, name, value):
+        """Full-text matches ranked by relevance, plus plain substring matches.
+
+        Full-text search finds other word forms but not a half-typed word, so
+        `icontains` matches are kept; both conditions are served by GIN
+        indexes (the substring one by the trigram indexes).
+        """
+        query = SearchQuery(value, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.filter(
+                Q(search_vector=query)
+                | Q(title__icontains=value)
+                | Q(description__icontains=value)
+            )
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-reminder_time")
         )
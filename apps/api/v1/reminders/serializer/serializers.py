@@ -83,6 +83,8 @@ class ReminderSerializer(serializers.ModelSerializer):
             "reminder_time",
             "is_recurring",
             "frequency_in_minutes",
+            "rrule",
+            "next_fire_at",
             "pet_ids",
             "pets_details",
         ]
@@ -92,6 +94,8 @@ class ReminderSerializer(serializers.ModelSerializer):
             "reminder_time": {"help_text": "The date and time when the reminder is scheduled."},
             "is_recurring": {"help_text": "Indicates if the reminder repeats."},
             "frequency_in_minutes": {"help_text": "The frequency of repetition in minutes, if applicable."},
+            "rrule": {"help_text": "RFC 5545 recurrence rule, e.g. FREQ=WEEKLY;BYDAY=MO,TH. Takes precedence over frequency_in_minutes."},
+            "next_fire_at": {"help_text": "When the reminder fires next; null once it has no occurrences left."},
         }
 
     def validate_pets(self, value):
@@ -113,7 +117,11 @@ class ReminderSerializer(serializers.ModelSerializer):
         return value
 
     def validate_frequency_in_minutes(self, value):
-        if self.initial_data.get("is_recurring", None) and not value:
+        if (
+            self.initial_data.get("is_recurring", None)
+            and not self.initial_data.get("rrule", None)
+            and not value
+        ):
             raise serializers.ValidationError(
                 "This field is required for recurring reminders.",
                 code="required_for_recurring",
@@ -133,3 +141,11 @@ class ReminderSerializer(serializers.ModelSerializer):
             instance.pets.set(pet_ids)
 
         return super().update(instance, validated_data)
+
+
+class ReminderOccurrenceSerializer(serializers.Serializer):
+    reminder = serializers.UUIDField(help_text="ID of the reminder.")
+    title = serializers.CharField(help_text="Title of the reminder.")
+    occurs_at = serializers.DateTimeField(
+        help_text="When this occurrence fires, in the user's timezone.",
+    )
@@ -1,27 +1,52 @@
+import datetime
+import itertools
+import json
+
+import pytz
+from django.http import StreamingHttpResponse
 from django_filters import rest_framework as filters
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
-from rest_framework import filters as drf_filters
-from rest_framework import permissions, viewsets
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+)
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from apps.api.v1.reminders.filters import ReminderFilter
 from apps.api.v1.reminders.serializer.serializers import (
     ReminderCategorySerializer,
+    ReminderOccurrenceSerializer,
     ReminderSerializer,
 )
 from apps.reminders.models import Reminder, ReminderCategory
-from utils.pagintaion import CustomPageNumberPagination
+from apps.reminders.occurrences import occurrences, reminders_in_window
+from utils.datetime_utils import request_timezone, user_timezone
+from utils.pagintaion import PageNumberOrKeysetPagination
+
+MAX_OCCURRENCE_DAYS = 62
+OCCURRENCE_CHUNK_SIZE = 500
+
+
+class ReminderPagination(PageNumberOrKeysetPagination):
+    keyset_ordering = ("-reminder_time", "-id")
+    # Keyset pages would discard the search rank and `ordering` sort order.
+    keyset_conflicting_params = ("search", "ordering")
 
 
 @extend_schema(tags=["Reminders"])
 class ReminderViewSet(viewsets.ModelViewSet):
     queryset = (
         Reminder.objects.all()
-        .select_related("owner", "reminder_type", "reminder_type__category")
+        .select_related("reminder_type", "reminder_type__category")
         .prefetch_related("pets")
+        .defer("search_vector")
     )
     serializer_class = ReminderSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = CustomPageNumberPagination
+    pagination_class = ReminderPagination
     filter_backends = [
         filters.DjangoFilterBackend,
     ]
@@ -29,11 +54,20 @@ class ReminderViewSet(viewsets.ModelViewSet):
 
 
     def get_queryset(self):
-        return self.queryset.filter(owner=self.request.user)
+        return self.queryset.filter(owner=self.request.user).order_by(
+            "-reminder_time",
+            "-id",
+        )
 
     @extend_schema(
         summary="Получение списка напоминаний",
-        description="Получение списка всех напоминаний пользователя.",
+        description=(
+            "Получение списка всех напоминаний пользователя.\n\n"
+            "С `?pagination=cursor` список отдаётся курсорными страницами: "
+            "стоимость любой страницы как у первой, без общего количества. "
+            "Курсорный режим не совместим с `search` и `ordering` "
+            "(ответ 400): результаты поиска упорядочены по релевантности."
+        ),
         responses={
             200: ReminderSerializer(many=True),
             401: OpenApiResponse(description="Пользователь не аутентифицирован"),
@@ -182,6 +216,125 @@ class ReminderViewSet(viewsets.ModelViewSet):
     def partial_update(self, request, *args, **kwargs):
         return super().partial_update(request, *args, **kwargs)
 
+    @extend_schema(
+        summary="Вхождения напоминаний за период",
+        description=(
+            "Все срабатывания напоминаний пользователя в интервале `[from, to)` "
+            "в порядке времени, включая повторения периодических напоминаний.\n\n"
+            "Время без часового пояса трактуется и выводится в поясе запроса "
+            "(`?timezone=` или пояс профиля); правила `rrule` всегда "
+            "разворачиваются в поясе профиля, как и при отправке. "
+            f"Интервал не длиннее {MAX_OCCURRENCE_DAYS} дней. "
+            "Ответ отдаётся потоком, без пагинации."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                required=True,
+                type=datetime.datetime,
+                description="Начало периода (включительно).",
+            ),
+            OpenApiParameter(
+                name="to",
+                required=True,
+                type=datetime.datetime,
+                description="Конец периода (не включительно).",
+            ),
+        ],
+        responses={
+            200: ReminderOccurrenceSerializer(many=True),
+            400: OpenApiResponse(
+                description="Некорректный период",
+                examples=[
+                    OpenApiExample(
+                        name="Дата невалидна",
+                        value={"date": "Dates are required in ISO 8601 format."},
+                    ),
+                    OpenApiExample(
+                        name="Слишком большой диапазон",
+                        value={
+                            "date": f"Range cannot be longer than {MAX_OCCURRENCE_DAYS} days."
+                        },
+                    ),
+                ],
+            ),
+            401: OpenApiResponse(description="Пользователь не аутентифицирован"),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="occurrences")
+    def occurrences(self, request, *args, **kwargs):
+        # Rules repeat in the owner's zone, as the dispatcher fires them;
+        # the request zone only reads naive input and renders the output.
+        rule_zone = user_timezone(request.user) or pytz.UTC
+        zone = request_timezone(request) or pytz.UTC
+        try:
+            start = _parse_datetime(request.query_params.get("from"), zone)
+            end = _parse_datetime(request.query_params.get("to"), zone)
+        except (TypeError, ValueError):
+            return Response(
+                {"date": "Dates are required in ISO 8601 format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end <= start:
+            return Response(
+                {"date": "End must be after start."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end - start > datetime.timedelta(days=MAX_OCCURRENCE_DAYS):
+            return Response(
+                {"date": f"Range cannot be longer than {MAX_OCCURRENCE_DAYS} days."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        reminders = reminders_in_window(
+            Reminder.objects.filter(owner=request.user).only(
+                "id",
+                "title",
+                "reminder_time",
+                "is_recurring",
+                "frequency_in_minutes",
+                "rrule",
+            ),
+            start,
+            end,
+        )
+        return StreamingHttpResponse(
+            _stream_occurrences(
+                occurrences(list(reminders), start, end, rule_zone),
+                zone,
+            ),
+            content_type="application/json",
+        )
+
+
+def _parse_datetime(value, zone):
+    value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = zone.localize(value)
+    return value
+
+
+def _stream_occurrences(pairs, zone):
+    """Render `(occurs_at, reminder)` pairs as a JSON array, chunk by chunk."""
+    prefixes = {}
+    yield "["
+    separator = ""
+    while chunk := list(itertools.islice(pairs, OCCURRENCE_CHUNK_SIZE)):
+        items = []
+        for occurs_at, reminder in chunk:
+            prefix = prefixes.get(reminder.pk)
+            if prefix is None:
+                prefix = prefixes[reminder.pk] = json.dumps(
+                    {"reminder": str(reminder.pk), "title": reminder.title}
+                )[:-1]
+            occurs_at = occurs_at.astimezone(zone).isoformat()
+            if occurs_at.endswith("+00:00"):
+                occurs_at = occurs_at[:-6] + "Z"
+            items.append(f'{prefix}, "occurs_at": "{occurs_at}"}}')
+        yield separator + ",".join(items)
+        separator = ","
+    yield "]"
+
 
 @extend_schema(tags=["Reference Data"])
 class ReminderCategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -1,8 +1,11 @@
+import pytz
 from allauth.socialaccount.models import SocialAccount
 from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from utils.datetime_utils import get_zone
+
 User = get_user_model()
 
 
@@ -27,6 +30,13 @@ class UserSerializer(serializers.ModelSerializer):
         allow_blank=True,
         allow_null=True,
     )
+    timezone = serializers.CharField(
+        source="profile.timezone",
+        max_length=64,
+        required=False,
+        allow_blank=True,
+        help_text="Часовой пояс IANA, например Europe/Minsk",
+    )
     email = serializers.EmailField(read_only=True)
 
     social_accounts = serializers.SerializerMethodField()
@@ -40,10 +50,19 @@ class UserSerializer(serializers.ModelSerializer):
             "last_name",
             "date_of_birth",
             "bio",
+            "timezone",
             "avatar_url",
             "social_accounts",
         ]
 
+    def validate_timezone(self, value):
+        if value:
+            try:
+                get_zone(value)
+            except pytz.UnknownTimeZoneError:
+                raise serializers.ValidationError("Unknown timezone.")
+        return value
+
     @extend_schema_field(
         serializers.ListField(
             child=serializers.CharField(default="Google"),
@@ -2,15 +2,25 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter, SimpleRouter
 from rest_framework_nested import routers
 
-from apps.api.v1.pets.views.views import PetViewSet, SymptomLogViewSet
+from apps.api.v1.pets.views.views import (
+    DailyLogSyncViewSet,
+    PetViewSet,
+    SymptomLogViewSet,
+)
 from apps.api.v1.reminders.views.views import ReminderViewSet
 from apps.api.v1.users.views.views import (
     CurrentUserView,
 )
-from apps.api.v1.walks.views.views import WalkStatsViewSet, WalkViewSet
+from apps.api.v1.walks.views.views import (
+    WalkGoalViewSet,
+    WalkStatsViewSet,
+    WalkViewSet,
+)
 
 router = SimpleRouter()
 router.register(r"pets", PetViewSet, basename="pets")
+router.register(r"walk-goals", WalkGoalViewSet, basename="walk-goals")
+router.register(r"symptom-logs", DailyLogSyncViewSet, basename="symptom-logs-sync")
 
 pets_router = routers.NestedSimpleRouter(router, r"pets", lookup="pet")
 pets_router.register(r"symptoms", SymptomLogViewSet, basename="symptom-logs")
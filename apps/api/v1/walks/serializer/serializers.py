@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from apps.walks.models import Walk, WalkStats
+from apps.walks import track as track_codec
+from apps.walks.models import Walk, WalkStats, WalkTrack
 
 
 class WalkSerializer(serializers.ModelSerializer):
@@ -11,7 +12,113 @@ class WalkSerializer(serializers.ModelSerializer):
         exclude = ["owner", "pet"]
 
 
+class WalkSessionSerializer(serializers.Serializer):
+    id = serializers.UUIDField(
+        read_only=True,
+        help_text="ID the walk will get when the session is stopped",
+    )
+    start_time = serializers.DateTimeField(read_only=True)
+
+
+class WalkSyncItemSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(help_text="Client-generated walk ID")
+
+    class Meta:
+        model = Walk
+        fields = ["id", "start_time", "end_time"]
+
+    def validate(self, attrs):
+        end_time = attrs.get("end_time")
+        if end_time and attrs["start_time"] > end_time:
+            raise serializers.ValidationError("End time must be after start time")
+        return attrs
+
+
+class WalkSyncSerializer(serializers.Serializer):
+    walks = WalkSyncItemSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class WalkSyncResultSerializer(serializers.Serializer):
+    created = serializers.ListField(child=serializers.UUIDField())
+    existing = serializers.ListField(child=serializers.UUIDField())
+    conflicts = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="IDs already used by another walk; these walks were not saved",
+    )
+
+
 class WalkStatsSerializer(serializers.ModelSerializer):
     class Meta:
         model = WalkStats
         exclude = ["pet", "id"]
+
+
+class WalkStatsBucketSerializer(serializers.Serializer):
+    period_start = serializers.DateField()
+    period_end = serializers.DateField()
+    total_walks = serializers.IntegerField()
+    total_duration = serializers.IntegerField(help_text="Total duration in minutes")
+
+
+class WalkPercentileSerializer(serializers.Serializer):
+    week_start = serializers.DateField()
+    total_duration = serializers.IntegerField(
+        help_text="Total duration of the pet's walks that week in minutes",
+    )
+    percentile = serializers.FloatField(
+        help_text="Share of pets of the same breed that walked less, in percent",
+    )
+    breed_median = serializers.FloatField(
+        help_text="Approximate median weekly duration of the breed in minutes",
+    )
+    pet_count = serializers.IntegerField(
+        help_text="Number of pets of the breed the pet is compared with",
+    )
+
+
+class WalkGoalProgressSerializer(serializers.Serializer):
+    pet_id = serializers.UUIDField()
+    date = serializers.DateField()
+    minutes_today = serializers.IntegerField(help_text="Minutes walked on `date`")
+    goal_minutes = serializers.IntegerField(
+        allow_null=True,
+        help_text="Daily exercise needs of the pet's breed in minutes",
+    )
+    progress = serializers.FloatField(
+        allow_null=True,
+        help_text="Minutes walked on `date` divided by the goal",
+    )
+    days_goal_met = serializers.IntegerField(
+        help_text="Days of the last 7 (`date` included) on which the goal was met",
+    )
+    compliance = serializers.FloatField(
+        allow_null=True,
+        help_text="Share of the last 7 days on which the goal was met",
+    )
+
+
+class WalkTrackSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WalkTrack
+        fields = [
+            "point_count",
+            "distance",
+            "moving_time",
+            "pace",
+            "is_finalized",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class WalkTrackUploadSerializer(serializers.Serializer):
+    points = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.FloatField(),
+            min_length=3,
+            max_length=3,
+        ),
+        allow_empty=False,
+        max_length=track_codec.MAX_POINTS_PER_CHUNK,
+        help_text="Chunk of points: [[latitude, longitude, unix_timestamp], ...]",
+    )
@@ -1,20 +1,57 @@
 import datetime
+import hashlib
 
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.utils import timezone
+from django.utils.http import parse_etags
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
     OpenApiResponse,
     extend_schema,
 )
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from apps.api.v1.walks.serializer.serializers import WalkSerializer, WalkStatsSerializer
-from apps.walks.models import Walk, WalkStats
-from utils.pagintaion import CustomPageNumberPagination
+from apps.api.v1.walks.serializer.serializers import (
+    WalkGoalProgressSerializer,
+    WalkPercentileSerializer,
+    WalkSerializer,
+    WalkSessionSerializer,
+    WalkStatsBucketSerializer,
+    WalkStatsSerializer,
+    WalkSyncResultSerializer,
+    WalkSyncSerializer,
+    WalkTrackSerializer,
+    WalkTrackUploadSerializer,
+)
+from apps.pets.models import Pet
+from apps.walks import goals, live, versions
+from apps.walks.models import (
+    GRANULARITIES,
+    BreedWalkSketch,
+    Walk,
+    WalkStats,
+    WalkTrack,
+    WeeklyWalkStats,
+    month_start,
+    stats_today,
+    week_start,
+)
+from utils.datetime_utils import user_timezone
+from utils.pagintaion import CustomPageNumberPagination, PageNumberOrKeysetPagination
+
+# Most buckets one stats response may hold, so it reads a few dozen rollup
+# rows at most (a year is summed from 12 monthly rows); longer ranges have to
+# use a coarser granularity.
+MAX_STATS_BUCKETS = {"day": 31, "week": 26, "month": 24, "year": 5}
+
+
+class WalkHistoryPagination(PageNumberOrKeysetPagination):
+    keyset_ordering = ("-start_time", "-id")
 
 
 @extend_schema(
@@ -35,21 +72,241 @@ class WalkViewSet(
     - `retrieve` endpoint позволяет пользователям получать детали конкретной прогулки по ID прогулки.
     - `update` endpoint позволяет модифицировать детали прогулки по ID прогулки.
     - `delete` endpoint удаляет конкретную прогулку по ID прогулки.
-    - `list` endpoint возвращает все прогулки, связанные с данным питомцем и пользователем.
+    - `list` endpoint возвращает все прогулки, связанные с данным питомцем и пользователем,
+      от новых к старым; `?pagination=cursor` включает курсорную пагинацию.
     """
 
     queryset = Walk.objects.select_related("pet", "owner").all()
     serializer_class = WalkSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = CustomPageNumberPagination
+    pagination_class = WalkHistoryPagination
 
     def get_queryset(self):
         pet_pk = self.kwargs.get("pet_pk")
-        return self.queryset.filter(owner=self.request.user, pet__id=pet_pk)
+        return self.queryset.filter(owner=self.request.user, pet__id=pet_pk).order_by(
+            "-start_time",
+            "-id",
+        )
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user, pet_id=self.kwargs.get("pet_pk"))
 
+    @extend_schema(
+        summary="Начало прогулки",
+        request=None,
+        responses={
+            200: WalkSessionSerializer,
+            201: WalkSessionSerializer,
+            404: OpenApiResponse(description="Питомец не найден"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="start")
+    def start(self, request, *args, **kwargs):
+        """Начать прогулку с питомцем.
+
+        Незавершённая прогулка хранится только в кэше и живёт, пока клиент
+        присылает `heartbeat`. Если прогулка уже идёт, возвращается она же
+        со статусом 200.
+        """
+        pet_id = kwargs.get("pet_pk")
+        if not Pet.objects.filter(id=pet_id, owner=request.user).exists():
+            return Response(
+                {"detail": "Pet not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        session, created = live.start_session(request.user.id, pet_id)
+        return Response(
+            WalkSessionSerializer(session).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        summary="Продление текущей прогулки",
+        request=None,
+        responses={
+            200: WalkSessionSerializer,
+            404: OpenApiResponse(description="Активная прогулка не найдена"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="heartbeat")
+    def heartbeat(self, request, *args, **kwargs):
+        """Сообщить, что прогулка продолжается. Не обращается к базе данных."""
+        session = live.heartbeat(request.user.id, kwargs.get("pet_pk"))
+        if session is None:
+            return Response(
+                {"detail": "No active walk."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(WalkSessionSerializer(session).data)
+
+    @extend_schema(
+        summary="Завершение прогулки",
+        request=None,
+        responses={
+            201: WalkSerializer,
+            404: OpenApiResponse(description="Активная прогулка не найдена"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="stop")
+    def stop(self, request, *args, **kwargs):
+        """Завершить текущую прогулку и сохранить её.
+
+        Только на этом шаге в базе данных создаётся запись `Walk`.
+        """
+        session = live.stop_session(request.user.id, kwargs.get("pet_pk"))
+        if session is None:
+            return Response(
+                {"detail": "No active walk."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        walk = Walk(
+            id=session["id"],
+            pet_id=session["pet_id"],
+            owner=request.user,
+            start_time=session["start_time"],
+            end_time=timezone.now(),
+        )
+        try:
+            walk.save(force_insert=True)
+        except IntegrityError:
+            # A concurrent stop of the same session has already saved it.
+            walk = Walk.objects.get(id=session["id"])
+        return Response(WalkSerializer(walk).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Синхронизация прогулок, записанных офлайн",
+        request=WalkSyncSerializer,
+        responses={
+            200: WalkSyncResultSerializer,
+            400: OpenApiResponse(description="Некорректный запрос"),
+            404: OpenApiResponse(description="Питомец не найден"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="sync")
+    def sync(self, request, *args, **kwargs):
+        """Загрузить пачку прогулок, накопленных клиентом без сети.
+
+        Каждая прогулка передаётся с ID, сгенерированным клиентом. Уже
+        сохранённые ID этого питомца пропускаются, поэтому повтор запроса
+        безопасен; ID, занятые другими прогулками, возвращаются в `conflicts`.
+        Статистика обновляется приращениями только для вставленных прогулок.
+        """
+        pet_id = kwargs.get("pet_pk")
+        if not Pet.objects.filter(id=pet_id, owner=request.user).exists():
+            return Response(
+                {"detail": "Pet not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        serializer = WalkSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, existing, conflicts = Walk.bulk_sync(
+            owner=request.user,
+            pet_id=pet_id,
+            items=serializer.validated_data["walks"],
+        )
+        return Response(
+            WalkSyncResultSerializer(
+                {"created": created, "existing": existing, "conflicts": conflicts},
+            ).data,
+        )
+
+    @extend_schema(
+        summary="GPS-трек прогулки",
+        request=WalkTrackUploadSerializer,
+        responses={
+            200: WalkTrackSerializer,
+            400: OpenApiResponse(
+                description="Некорректный запрос",
+                examples=[
+                    OpenApiExample(
+                        name="Трек уже завершён",
+                        value={"detail": "Track is already finalized."},
+                    ),
+                    OpenApiExample(
+                        name="Время идёт назад",
+                        value={"detail": "Timestamps must not go backwards."},
+                    ),
+                ],
+            ),
+            404: OpenApiResponse(description="Трек не найден"),
+        },
+        parameters=[
+            OpenApiParameter(
+                name="include_points",
+                required=False,
+                type=bool,
+                description="GET: вернуть точки трека в виде колонок `latitudes`, `longitudes`, `timestamps`.",
+            ),
+        ],
+    )
+    @action(detail=True, methods=["get", "post"], url_path="track")
+    def track(self, request, *args, **kwargs):
+        """Получить трек прогулки или дописать в него очередную порцию точек.
+
+        - `GET` возвращает метрики трека (и точки при `include_points=true`).
+        - `POST` принимает `{"points": [[lat, lon, unix_ts], ...]}` и добавляет
+          точки в конец трека. Порции можно отправлять по мере записи прогулки.
+        """
+        walk = self.get_object()
+        if request.method == "POST":
+            serializer = WalkTrackUploadSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            try:
+                WalkTrack.append(walk, serializer.validated_data["points"])
+            except ValidationError as exc:
+                return Response(
+                    {"detail": exc.messages[0]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        walk_track = WalkTrack.objects.filter(walk=walk)
+        if request.query_params.get("include_points") != "true":
+            walk_track = walk_track.defer("latitudes", "longitudes", "timestamps")
+        walk_track = walk_track.first()
+        if walk_track is None:
+            return Response(
+                {"detail": "Track not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        data = WalkTrackSerializer(walk_track).data
+        if request.query_params.get("include_points") == "true":
+            latitudes, longitudes, timestamps = walk_track.decode()
+            data["points"] = {
+                "latitudes": latitudes.tolist(),
+                "longitudes": longitudes.tolist(),
+                "timestamps": timestamps.tolist(),
+            }
+        return Response(data)
+
+    @extend_schema(
+        summary="Завершение GPS-трека прогулки",
+        request=None,
+        responses={
+            200: WalkTrackSerializer,
+            404: OpenApiResponse(description="Трек не найден"),
+        },
+    )
+    @action(detail=True, methods=["post"], url_path="track/finalize")
+    def finalize_track(self, request, *args, **kwargs):
+        """Завершить трек: рассчитать дистанцию, время в движении и темп.
+
+        После завершения новые точки в трек не принимаются.
+        """
+        walk = self.get_object()
+        walk_track = WalkTrack.objects.filter(walk=walk).first()
+        if walk_track is None:
+            return Response(
+                {"detail": "Track not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        walk_track.finalize()
+        return Response(WalkTrackSerializer(walk_track).data)
+
 
 @extend_schema(
     tags=["Walks"],
@@ -69,6 +326,9 @@ class WalkStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         summary="Ежедневная статистика прогулок",
         responses={
             200: WalkStatsSerializer,
+            304: OpenApiResponse(
+                description="Статистика не изменилась (совпал `If-None-Match`)",
+            ),
             400: OpenApiResponse(
                 description="Некорректный запрос",
                 response=WalkStatsSerializer,
@@ -98,7 +358,7 @@ class WalkStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
                 name="date",
                 required=False,
                 type=datetime.date,
-                description="Дата, для которой необходимо получить статистику прогулок. По умолчанию используется текущая дата.",
+                description="Дата, для которой необходимо получить статистику прогулок. По умолчанию используется текущая дата в часовом поясе владельца.",
             ),
         ],
     )
@@ -108,22 +368,29 @@ class WalkStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
 
         Параметры:
         - `pet_pk` (обязательный): Первичный ключ питомца.
-        - `date` (необязательный): Дата, для которой требуется статистика, по умолчанию текущая дата.
+        - `date` (необязательный): Дата, для которой требуется статистика, по умолчанию текущая дата в часовом поясе владельца.
 
         Возвращает ежедневную статистику прогулок для конкретного питомца.
         """
         pet_id = kwargs.get("pet_pk")
-        date_str = request.query_params.get("date", timezone.now().date())
         try:
-            date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+            date = _parse_date(request.query_params.get("date"))
         except ValueError:
             return Response(
                 {"date": "Date has wrong format. Use YYYY-MM-DD."},
                 status=400,
             )
+        if date is None:
+            date = stats_today(user_timezone(request.user))
 
         if not pet_id:
             return Response({"pet_id": "This field is required"}, status=400)
+        if not Pet.objects.filter(pk=pet_id, owner=request.user).exists():
+            return Response({"detail": "Pet not found."}, status=404)
+
+        etag = _stats_etag(pet_id, "daily", date)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
         try:
             stat = WalkStats.objects.get(pet__id=pet_id, date=date)
         except WalkStats.DoesNotExist:
@@ -133,12 +400,15 @@ class WalkStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
             )
 
         serializer = WalkStatsSerializer(stat)
-        return Response(serializer.data)
+        return _with_etag(Response(serializer.data), etag)
 
     @extend_schema(
         summary="Недельная статистика прогулок по дням",
         responses={
             200: WalkStatsSerializer,
+            304: OpenApiResponse(
+                description="Статистика не изменилась (совпал `If-None-Match`)",
+            ),
             400: OpenApiResponse(
                 description="Некорректный запрос",
                 response=WalkStatsSerializer,
@@ -157,13 +427,14 @@ class WalkStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
                     ),
                 ],
             ),
+            404: OpenApiResponse(description="Питомец не найден"),
         },
         parameters=[
             OpenApiParameter(
                 name="start_date",
                 required=False,
                 type=datetime.date,
-                description="Дата начала диапазона, по умолчанию используется текущая дата.",
+                description="Дата начала диапазона, по умолчанию используется текущая дата в часовом поясе владельца.",
             ),
             OpenApiParameter(
                 name="end_date",
@@ -185,20 +456,19 @@ class WalkStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         Возвращает недельную статистику прогулок для питомца.
         """
         pet_id = kwargs.get("pet_pk")
-        end_date_str = request.query_params.get("end_date", timezone.now().date())
-        start_date_str = request.query_params.get(
-            "start_date",
-            (timezone.now() - datetime.timedelta(days=6)).date(),
-        )
-
         try:
-            end_date = datetime.datetime.strptime(end_date_str, "%Y-%m-%d").date()
-            start_date = datetime.datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            end_date = _parse_date(request.query_params.get("end_date"))
+            start_date = _parse_date(request.query_params.get("start_date"))
         except ValueError:
             return Response(
                 {"date": "Date has wrong format. Use YYYY-MM-DD."},
                 status=400,
             )
+        today = stats_today(user_timezone(request.user))
+        if end_date is None:
+            end_date = today
+        if start_date is None:
+            start_date = today - datetime.timedelta(days=6)
 
         if end_date < start_date:
             return Response(
@@ -207,10 +477,313 @@ class WalkStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
             )
         if not pet_id:
             return Response({"pet_pk": "This field is required"}, status=400)
+        if not Pet.objects.filter(pk=pet_id, owner=request.user).exists():
+            return Response({"detail": "Pet not found."}, status=404)
+
+        etag = _stats_etag(pet_id, "weekly", start_date, end_date)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
 
         stats = WalkStats.objects.filter(
             pet__id=pet_id,
             date__range=(start_date, end_date),
         )
         serializer = WalkStatsSerializer(stats, many=True)
+        return _with_etag(Response(serializer.data), etag)
+
+    @extend_schema(
+        summary="Статистика прогулок по периодам (день / неделя / месяц / год)",
+        responses={
+            200: WalkStatsBucketSerializer(many=True),
+            304: OpenApiResponse(
+                description="Статистика не изменилась (совпал `If-None-Match`)",
+            ),
+            400: OpenApiResponse(
+                description="Некорректный запрос",
+                examples=[
+                    OpenApiExample(
+                        name="Неизвестная гранулярность",
+                        value={"granularity": "Use one of: day, week, month, year."},
+                    ),
+                    OpenApiExample(
+                        name="Слишком большой диапазон",
+                        value={
+                            "date": "Range is too large for this granularity: "
+                            "at most 31 buckets, use a coarser granularity.",
+                        },
+                    ),
+                ],
+            ),
+            404: OpenApiResponse(description="Питомец не найден"),
+        },
+        parameters=[
+            OpenApiParameter(
+                name="granularity",
+                required=False,
+                type=str,
+                enum=GRANULARITIES,
+                description=(
+                    "Размер периода. По умолчанию `day`. Не больше 31 дня, "
+                    "26 недель, 24 месяцев или 5 лет за запрос."
+                ),
+            ),
+            OpenApiParameter(
+                name="start_date",
+                required=False,
+                type=datetime.date,
+                description="Дата начала диапазона. По умолчанию 7 дней / 12 недель / 12 месяцев / 5 лет до `end_date`.",
+            ),
+            OpenApiParameter(
+                name="end_date",
+                required=False,
+                type=datetime.date,
+                description="Дата окончания диапазона, по умолчанию используется текущая дата в часовом поясе владельца.",
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get"], url_path="buckets")
+    def bucket_stats(self, request, *args, **kwargs):
+        """Получить статистику прогулок питомца, сгруппированную по периодам.
+
+        Параметры:
+        - `pet_pk` (обязательный): Первичный ключ питомца.
+        - `granularity` (необязательный): `day`, `week`, `month` или `year`.
+        - `start_date`, `end_date` (необязательные): Диапазон дат.
+
+        Возвращает по одной записи на каждый период в диапазоне, включая пустые.
+        """
+        pet_id = kwargs.get("pet_pk")
+        granularity = request.query_params.get("granularity", "day")
+        if granularity not in GRANULARITIES:
+            return Response(
+                {"granularity": "Use one of: day, week, month, year."},
+                status=400,
+            )
+
+        try:
+            end_date = _parse_date(request.query_params.get("end_date"))
+            if end_date is None:
+                end_date = stats_today(user_timezone(request.user))
+            start_date = _parse_date(request.query_params.get("start_date"))
+            if start_date is None:
+                start_date = _default_start_date(granularity, end_date)
+        except ValueError:
+            return Response(
+                {"date": "Date has wrong format. Use YYYY-MM-DD."},
+                status=400,
+            )
+
+        if end_date < start_date:
+            return Response(
+                {"date": "End date cannot be before start date"},
+                status=400,
+            )
+        limit = MAX_STATS_BUCKETS[granularity]
+        if _bucket_count(granularity, start_date, end_date) > limit:
+            return Response(
+                {
+                    "date": "Range is too large for this granularity: "
+                    f"at most {limit} buckets, use a coarser granularity.",
+                },
+                status=400,
+            )
+
+        if not Pet.objects.filter(pk=pet_id, owner=request.user).exists():
+            return Response({"detail": "Pet not found."}, status=404)
+
+        etag = _stats_etag(pet_id, "buckets", granularity, start_date, end_date)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+
+        buckets = WalkStats.get_buckets(pet_id, granularity, start_date, end_date)
+        serializer = WalkStatsBucketSerializer(buckets, many=True)
+        return _with_etag(Response(serializer.data), etag)
+
+    @extend_schema(
+        summary="Перцентиль прогулок питомца среди собак той же породы",
+        responses={
+            200: WalkPercentileSerializer,
+            400: OpenApiResponse(
+                description="Некорректный запрос",
+                examples=[
+                    OpenApiExample(
+                        name="Дата невалидна",
+                        value={"date": "Date has wrong format. Use YYYY-MM-DD."},
+                    ),
+                ],
+            ),
+            404: OpenApiResponse(
+                description="Питомец без породы или статистика породы ещё не готова",
+                examples=[
+                    OpenApiExample(
+                        name="Статистика породы не найдена",
+                        value={"detail": "No breed statistics for this week yet."},
+                    ),
+                ],
+            ),
+        },
+        parameters=[
+            OpenApiParameter(
+                name="date",
+                required=False,
+                type=datetime.date,
+                description="Любая дата недели для сравнения. По умолчанию прошлая неделя.",
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get"], url_path="percentile")
+    def percentile(self, request, *args, **kwargs):
+        """Сравнить недельную длительность прогулок питомца с собаками той же породы.
+
+        Параметры:
+        - `pet_pk` (обязательный): Первичный ключ питомца.
+        - `date` (необязательный): Дата внутри недели, по умолчанию прошлая (завершённая) неделя.
+
+        Перцентиль считается по скетчу породы, который пересчитывается каждую ночь.
+        """
+        try:
+            date = _parse_date(request.query_params.get("date"))
+        except ValueError:
+            return Response(
+                {"date": "Date has wrong format. Use YYYY-MM-DD."},
+                status=400,
+            )
+        if date is None:
+            date = stats_today(user_timezone(request.user)) - datetime.timedelta(
+                weeks=1
+            )
+        week = week_start(date)
+
+        breed_id = (
+            Pet.objects.filter(pk=kwargs.get("pet_pk"), owner=request.user)
+            .values_list("breed_id", flat=True)
+            .first()
+        )
+        if breed_id is None:
+            return Response({"detail": "Pet not found or has no breed."}, status=404)
+
+        try:
+            sketch = BreedWalkSketch.objects.get(breed_id=breed_id, week_start=week)
+        except BreedWalkSketch.DoesNotExist:
+            return Response(
+                {"detail": "No breed statistics for this week yet."},
+                status=404,
+            )
+
+        total_duration = (
+            WeeklyWalkStats.objects.filter(pet_id=kwargs.get("pet_pk"), week_start=week)
+            .values_list("total_duration", flat=True)
+            .first()
+        ) or 0
+        serializer = WalkPercentileSerializer(
+            {
+                "week_start": week,
+                "total_duration": total_duration,
+                "percentile": sketch.percentile_rank(total_duration),
+                "breed_median": sketch.quantile(0.5),
+                "pet_count": sketch.pet_count,
+            },
+        )
         return Response(serializer.data)
+
+    @extend_schema(
+        summary="Прогресс питомца по дневной норме прогулок породы",
+        responses={
+            200: WalkGoalProgressSerializer,
+            401: OpenApiResponse(description="Необходима аутентификация пользователя"),
+            404: OpenApiResponse(description="Питомец не найден"),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="goal")
+    def goal(self, request, *args, **kwargs):
+        """Получить прогресс питомца по дневной норме прогулок (`Breed.exercise_needs`).
+
+        Параметры:
+        - `pet_pk` (обязательный): Первичный ключ питомца.
+
+        Возвращает минуты прогулок за сегодня, норму породы и долю дней
+        за последнюю неделю, в которые норма была выполнена.
+        """
+        pets = Pet.objects.filter(pk=kwargs.get("pet_pk"), owner=request.user)
+        progress = goals.goal_progress(pets, stats_today(user_timezone(request.user)))
+        if not progress:
+            return Response({"detail": "Not found."}, status=404)
+        return Response(WalkGoalProgressSerializer(progress[0]).data)
+
+
+@extend_schema(
+    tags=["Walks"],
+    summary="Прогресс по дневной норме прогулок для всех питомцев",
+)
+class WalkGoalViewSet(viewsets.GenericViewSet):
+    serializer_class = WalkGoalProgressSerializer
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Прогресс всех питомцев пользователя по дневной норме прогулок",
+        responses={200: WalkGoalProgressSerializer(many=True)},
+    )
+    def list(self, request, *args, **kwargs):
+        """Получить прогресс по дневной норме прогулок для всех питомцев пользователя.
+
+        Считается одним запросом для всех питомцев сразу.
+        """
+        progress = goals.goal_progress(
+            Pet.objects.filter(owner=request.user),
+            stats_today(user_timezone(request.user)),
+        )
+        return Response(WalkGoalProgressSerializer(progress, many=True).data)
+
+
+def _stats_etag(pet_id, *parts):
+    """Strong ETag of a stats response: the pet's stats version plus the query."""
+    query = ":".join(str(part) for part in parts)
+    digest = hashlib.sha1(query.encode()).hexdigest()[:16]
+    return f'"{versions.get_version(pet_id)}-{digest}"'
+
+
+def _etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison.
+    etags = [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+    return "*" in etags or etag in etags
+
+
+def _with_etag(response, etag):
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _not_modified(etag):
+    return _with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+def _parse_date(value):
+    if value is None:
+        return None
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _default_start_date(granularity, end_date):
+    if granularity == "week":
+        return week_start(end_date) - datetime.timedelta(weeks=11)
+    if granularity == "month":
+        year, month = divmod(end_date.year * 12 + end_date.month - 1 - 11, 12)
+        return datetime.date(year, month + 1, 1)
+    if granularity == "year":
+        return datetime.date(end_date.year - 4, 1, 1)
+    return end_date - datetime.timedelta(days=6)
+
+
+def _bucket_count(granularity, start_date, end_date):
+    if granularity == "week":
+        return (week_start(end_date) - week_start(start_date)).days // 7 + 1
+    if granularity == "month":
+        start, end = month_start(start_date), month_start(end_date)
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    if granularity == "year":
+        return end_date.year - start_date.year + 1
+    return (end_date - start_date).days + 1
@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from .models import DailyLog, Symptom, SymptomCategory
+from .models import (
+    DailyLog,
+    Symptom,
+    SymptomAlert,
+    SymptomAlertRule,
+    SymptomCategory,
+    SymptomCooccurrence,
+)
 
 
 @admin.register(SymptomCategory)
@@ -21,3 +28,42 @@ class DailyLogAdmin(admin.ModelAdmin):
     list_display = ["id", "pet", "date", "created_at", "updated_at"]
     list_filter = ["date", "pet__owner"]
     search_fields = ["pet__name", "pet__owner__username"]
+
+
+@admin.register(SymptomCooccurrence)
+class SymptomCooccurrenceAdmin(admin.ModelAdmin):
+    list_display = [
+        "symptom",
+        "other_symptom",
+        "together",
+        "support",
+        "confidence",
+        "lift",
+        "computed_at",
+    ]
+    list_filter = ["symptom__category"]
+    search_fields = ["symptom__name", "other_symptom__name"]
+    list_select_related = ["symptom__category", "other_symptom__category"]
+
+
+@admin.register(SymptomAlertRule)
+class SymptomAlertRuleAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "symptom",
+        "min_days",
+        "window_days",
+        "is_active",
+        "checked_until",
+    ]
+    list_filter = ["is_active"]
+    search_fields = ["name", "symptom__name"]
+    list_select_related = ["symptom__category"]
+
+
+@admin.register(SymptomAlert)
+class SymptomAlertAdmin(admin.ModelAdmin):
+    list_display = ["rule", "pet", "start_date", "end_date", "updated_at"]
+    list_filter = ["rule"]
+    search_fields = ["pet__name", "pet__owner__username"]
+    list_select_related = ["rule", "pet"]
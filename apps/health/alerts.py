@@ -0,0 +1,159 @@
+"""Symptom alerts such as "Vomiting three days in a row".
+
+A `SymptomAlertRule` fires on every day on which its symptom was logged on
+at least `min_days` of the trailing `window_days` days. Each run only looks
+at pets whose logs changed after the rule's watermark (`checked_until`
+against `DailyLog.updated_at`), and only from their earliest changed date
+onwards, so its cost follows the churn rather than the history. The
+trailing counts come from a window function over the covering
+`(pet, date) INCLUDE (symptom_mask)` index. Each rule is checked under a
+`SKIP LOCKED` row lock, so overlapping runs never check the same rule twice.
+
+Consecutive firing days form one `SymptomAlert`; alerts that are already
+stored are extended or merged rather than duplicated. Alerts are not
+retracted when symptoms are removed later.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.health import bitsets
+from apps.health.models import DailyLog, SymptomAlert, SymptomAlertRule
+
+# Logs committed while a run was in progress are picked up by the next one.
+WATERMARK_OVERLAP = datetime.timedelta(minutes=5)
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def check_symptom_alerts(now=None):
+    """Evaluate every active rule; return the number of alerts created or extended."""
+    now = now or timezone.now()
+    written = 0
+    rules = SymptomAlertRule.objects.filter(is_active=True)
+    for rule_id in rules.values_list("pk", flat=True):
+        with transaction.atomic():
+            # A rule that an overlapping run is checking is left to that run;
+            # the watermark is read under the lock, so it is never stale.
+            rule = (
+                rules.filter(pk=rule_id)
+                .select_related("symptom")
+                .select_for_update(skip_locked=True, of=("self",))
+                .first()
+            )
+            if rule is None or rule.symptom.bit is None:
+                continue
+            since = (
+                rule.checked_until - WATERMARK_OVERLAP if rule.checked_until else None
+            )
+            written += _save_alerts(rule, _firing_days(rule, since))
+            SymptomAlertRule.objects.filter(pk=rule.pk).update(checked_until=now)
+    return written
+
+
+def _firing_days(rule, since=None):
+    """`(pet_id, date)` of the days on which `rule` fires, for pets changed since `since`."""
+    log_table = connection.ops.quote_name(DailyLog._meta.db_table)
+    changed_filter = "WHERE updated_at >= %(since)s" if since else ""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH changed AS (
+                SELECT pet_id, MIN(date) AS first_date
+                FROM {log_table}
+                {changed_filter}
+                GROUP BY pet_id
+            ),
+            days AS (
+                SELECT
+                    log.pet_id,
+                    log.date,
+                    changed.first_date,
+                    COUNT(*) OVER (
+                        PARTITION BY log.pet_id
+                        ORDER BY log.date
+                        RANGE BETWEEN %(lookback)s PRECEDING AND CURRENT ROW
+                    ) AS symptom_days
+                FROM {log_table} AS log
+                JOIN changed ON changed.pet_id = log.pet_id
+                WHERE log.date >= changed.first_date - %(lookback_days)s
+                    AND log.symptom_mask & %(mask)s <> 0
+            )
+            SELECT pet_id, date
+            FROM days
+            WHERE symptom_days >= %(min_days)s AND date >= first_date
+            ORDER BY pet_id, date
+            """,
+            {
+                "since": since,
+                "lookback": datetime.timedelta(days=rule.window_days - 1),
+                "lookback_days": rule.window_days - 1,
+                "mask": bitsets.mask_of_bits([rule.symptom.bit]),
+                "min_days": rule.min_days,
+            },
+        )
+        return cursor.fetchall()
+
+
+def _save_alerts(rule, days):
+    """Merge the firing `days` into the stored alerts of `rule`; return the rows written."""
+    if not days:
+        return 0
+    periods = defaultdict(list)
+    for pet_id, date in days:
+        pet_periods = periods[pet_id]
+        if pet_periods and pet_periods[-1][1] + ONE_DAY == date:
+            pet_periods[-1][1] = date
+        else:
+            pet_periods.append([date, date])
+
+    stored = defaultdict(list)
+    earliest = min(date for _, date in days)
+    for alert in SymptomAlert.objects.filter(
+        rule=rule,
+        pet_id__in=list(periods),
+        end_date__gte=earliest - ONE_DAY,
+    ).order_by("start_date"):
+        stored[alert.pet_id].append(alert)
+
+    created, changed, merged = [], [], []
+    now = timezone.now()
+    for pet_id, pet_periods in periods.items():
+        intervals = sorted(
+            [(alert.start_date, alert.end_date, alert) for alert in stored[pet_id]]
+            + [(start, end, None) for start, end in pet_periods],
+            key=lambda interval: (interval[0], interval[2] is None),
+        )
+        groups = []
+        for start, end, alert in intervals:
+            if groups and start <= groups[-1][1] + ONE_DAY:
+                groups[-1][1] = max(groups[-1][1], end)
+                groups[-1][2].append(alert)
+            else:
+                groups.append([start, end, [alert]])
+
+        for start, end, alerts in groups:
+            alerts = [alert for alert in alerts if alert is not None]
+            if not alerts:
+                created.append(
+                    SymptomAlert(
+                        pet_id=pet_id,
+                        rule=rule,
+                        start_date=start,
+                        end_date=end,
+                    ),
+                )
+                continue
+            keep, *rest = alerts
+            merged.extend(alert.pk for alert in rest)
+            if (keep.start_date, keep.end_date) != (start, end):
+                keep.start_date, keep.end_date, keep.updated_at = start, end, now
+                changed.append(keep)
+
+    if merged:
+        SymptomAlert.objects.filter(pk__in=merged).delete()
+    SymptomAlert.objects.bulk_update(changed, ["start_date", "end_date", "updated_at"])
+    SymptomAlert.objects.bulk_create(created)
+    return len(created) + len(changed)
@@ -0,0 +1,160 @@
+"""Symptom co-occurrence and trend analytics over all daily logs.
+
+`DailyLog.symptom_mask` is one bit-packed row of the log x symptom incidence
+matrix. Logs are streamed as narrow tuples in chunks and every chunk is
+unpacked into an `(n, 64)` matrix `X`: co-occurrence counts accumulate as
+`X.T @ X`, and trend counts as column sums per (breed, age group, month)
+segment. Memory stays bounded by the chunk size and the number of segments.
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Coalesce
+
+from apps.health import bitsets
+from apps.health.models import (
+    AGE_GROUPS,
+    DailyLog,
+    Symptom,
+    SymptomCooccurrence,
+    SymptomTrend,
+)
+
+CHUNK_SIZE = 50_000
+MIN_TOGETHER = 5  # pairs seen together less often than this are noise
+AGE_GROUP_BOUNDS = (1, 3, 8)  # years, boundaries of puppy/young/adult/senior
+UNKNOWN_AGE_GROUP = len(AGE_GROUP_BOUNDS) + 1
+
+
+def build_symptom_analytics(chunk_size=CHUNK_SIZE, min_together=MIN_TOGETHER):
+    """Recompute and persist co-occurrence and trends; return the number of logs."""
+    rows = (
+        DailyLog.objects.order_by()
+        .annotate(
+            breed_key=Coalesce(Cast("pet__breed_id", CharField()), Value("")),
+        )
+        .values_list("symptom_mask", "date", "pet__birth_date", "breed_key")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    log_count = 0
+    cooccurrence = np.zeros((bitsets.MASK_BITS, bitsets.MASK_BITS), dtype=np.int64)
+    trends = {}
+    for chunk in _chunks(rows, chunk_size):
+        masks, dates, birth_dates, breeds = zip(*chunk)
+        incidence = bitsets.unpack(masks)
+        values = incidence.astype(np.float64)
+        cooccurrence += np.rint(values.T @ values).astype(np.int64)
+        log_count += len(masks)
+        _add_trends(trends, incidence, dates, birth_dates, breeds)
+
+    _save(log_count, cooccurrence, trends, min_together)
+    return log_count
+
+
+def _add_trends(trends, incidence, dates, birth_dates, breeds):
+    """Add the symptom counts of one chunk to `{(breed, age_group, month): counts}`."""
+    dates = np.array(dates, dtype="datetime64[D]")
+    birth_dates = np.array(birth_dates, dtype="datetime64[D]")
+    unknown_age = np.isnat(birth_dates)
+    age_days = np.where(unknown_age, 0, (dates - birth_dates).astype(np.int64))
+    age_groups = np.digitize(age_days / 365.25, AGE_GROUP_BOUNDS)
+    age_groups[unknown_age] = UNKNOWN_AGE_GROUP
+
+    breed_keys, breed_index = np.unique(np.array(breeds), return_inverse=True)
+    months = dates.astype("datetime64[M]").astype(np.int64)
+
+    segments, segment_index = np.unique(
+        np.column_stack([breed_index.reshape(-1), age_groups, months]),
+        axis=0,
+        return_inverse=True,
+    )
+    segment_index = segment_index.reshape(-1)
+    order = np.argsort(segment_index, kind="stable")
+    starts = np.searchsorted(segment_index[order], np.arange(len(segments)))
+    counts = np.add.reduceat(incidence[order].astype(np.int64), starts, axis=0)
+    sizes = np.bincount(segment_index, minlength=len(segments))
+
+    for (breed, age_group, month), size, segment_counts in zip(
+        segments,
+        sizes,
+        counts,
+    ):
+        key = (breed_keys[breed], AGE_GROUPS[age_group][0], int(month))
+        total, total_counts = trends.get(key, (0, 0))
+        trends[key] = (total + int(size), total_counts + segment_counts)
+
+
+def _save(log_count, cooccurrence, trends, min_together):
+    symptom_ids = Symptom.ids_by_bit()
+    pairs = []
+    if log_count:
+        counts = np.diag(cooccurrence)
+        off_diagonal = ~np.eye(len(counts), dtype=bool)
+        first, second = np.nonzero((cooccurrence >= min_together) & off_diagonal)
+        together = cooccurrence[first, second]
+        support = together / log_count
+        confidence = together / counts[first]
+        lift = together * log_count / (counts[first] * counts[second])
+        for row in zip(first, second, together, support, confidence, lift):
+            bit, other_bit, pair_count, pair_support, pair_confidence, pair_lift = row
+            if symptom_ids[bit] is None or symptom_ids[other_bit] is None:
+                continue
+            pairs.append(
+                SymptomCooccurrence(
+                    symptom_id=symptom_ids[bit],
+                    other_symptom_id=symptom_ids[other_bit],
+                    together=int(pair_count),
+                    support=float(pair_support),
+                    confidence=float(pair_confidence),
+                    lift=float(pair_lift),
+                ),
+            )
+
+    trend_rows = [
+        SymptomTrend(
+            breed_id=breed or None,
+            age_group=age_group,
+            month=np.datetime64(month, "M").astype("datetime64[D]").item(),
+            log_count=total,
+            symptom_counts=np.asarray(counts).astype("<u4").tobytes(),
+        )
+        for (breed, age_group, month), (total, counts) in trends.items()
+    ]
+
+    # Readers keep seeing the previous results until the commit.
+    with transaction.atomic():
+        SymptomCooccurrence.objects.all().delete()
+        SymptomCooccurrence.objects.bulk_create(pairs, batch_size=1000)
+        SymptomTrend.objects.all().delete()
+        SymptomTrend.objects.bulk_create(trend_rows, batch_size=1000)
+
+
+def trend_series(trends, bit):
+    """Sum `(month, log_count, symptom_counts)` rows into a monthly series of one symptom."""
+    series = {}
+    for month, log_count, symptom_counts in trends:
+        days = int(np.frombuffer(bytes(symptom_counts), dtype="<u4")[bit])
+        total, total_days = series.get(month, (0, 0))
+        series[month] = (total + log_count, total_days + days)
+    return [
+        {
+            "month": month,
+            "log_count": total,
+            "days": days,
+            "frequency": days / total if total else 0.0,
+        }
+        for month, (total, days) in sorted(series.items())
+    ]
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,33 @@
+"""Daily symptoms encoded as 64-bit masks.
+
+Every symptom owns one bit (`Symptom.bit`) and `DailyLog.symptom_mask` is
+the OR of the bits of the log's symptoms. Masks are stored as signed
+bigint, so a mask with bit 63 set is negative in the database; bitwise
+operators work the same on it.
+"""
+
+import numpy as np
+
+MASK_BITS = 64
+
+
+def to_signed(mask):
+    """Convert an unsigned 64-bit mask to the value stored in a bigint column."""
+    return mask - (1 << MASK_BITS) if mask >= 1 << (MASK_BITS - 1) else mask
+
+
+def mask_of_bits(bits):
+    mask = 0
+    for bit in bits:
+        mask |= 1 << bit
+    return to_signed(mask)
+
+
+def unpack(masks):
+    """Unpack masks into an `(n, 64)` bool matrix; column `i` is bit `i`."""
+    masks = np.asarray(masks, dtype="<i8")
+    return np.unpackbits(
+        masks.view(np.uint8).reshape(-1, 8),
+        axis=1,
+        bitorder="little",
+    ).astype(bool)
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("health", "0002_initial"),
+        ("pets", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dailylog",
+            index=models.Index(
+                fields=["pet", "date"],
+                include=("id",),
+                name="dailylog_pet_date_cover_idx",
+            ),
+        ),
+    ]
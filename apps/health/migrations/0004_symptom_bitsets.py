@@ -0,0 +1,74 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+def assign_symptom_bits(apps, schema_editor):
+    Symptom = apps.get_model("health", "Symptom")
+    symptoms = Symptom.objects.order_by("category__name", "name")
+    for bit, symptom in enumerate(symptoms.iterator()):
+        symptom.bit = bit
+        symptom.save(update_fields=["bit"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("health", "0003_dailylog_pet_date_cover_idx"),
+        ("pets", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="dailylog",
+            name="dailylog_pet_date_cover_idx",
+        ),
+        migrations.AddField(
+            model_name="dailylog",
+            name="symptom_mask",
+            field=models.BigIntegerField(
+                default=0,
+                editable=False,
+                help_text="Битовая маска симптомов (см. Symptom.bit), синхронизируется с symptoms",
+            ),
+        ),
+        migrations.AddField(
+            model_name="symptom",
+            name="bit",
+            field=models.PositiveSmallIntegerField(
+                editable=False,
+                help_text="Номер бита симптома в DailyLog.symptom_mask",
+                null=True,
+                unique=True,
+            ),
+        ),
+        migrations.RunPython(assign_symptom_bits, migrations.RunPython.noop),
+        migrations.RunSQL(
+            """
+            UPDATE health_dailylog AS log
+            SET symptom_mask = masks.mask
+            FROM (
+                SELECT through.dailylog_id, bit_or(1::bigint << symptom.bit) AS mask
+                FROM health_dailylog_symptoms AS through
+                JOIN health_symptom AS symptom ON symptom.id = through.symptom_id
+                GROUP BY through.dailylog_id
+            ) AS masks
+            WHERE masks.dailylog_id = log.id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="dailylog",
+            index=models.Index(
+                fields=["pet", "date"],
+                include=("symptom_mask",),
+                name="dailylog_pet_date_mask_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="symptom",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("bit__lt", 64)), name="symptom_bit_fits_mask"
+            ),
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:42
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("health", "0004_symptom_bitsets"),
+        ("pets", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SymptomCooccurrence",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "together",
+                    models.PositiveIntegerField(
+                        help_text="Количество логов с обоими симптомами"
+                    ),
+                ),
+                (
+                    "support",
+                    models.FloatField(help_text="Доля логов с обоими симптомами"),
+                ),
+                (
+                    "confidence",
+                    models.FloatField(
+                        help_text="Доля логов с `other_symptom` среди логов с `symptom`"
+                    ),
+                ),
+                (
+                    "lift",
+                    models.FloatField(
+                        help_text="Во сколько раз пара встречается чаще, чем при независимости"
+                    ),
+                ),
+                ("computed_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "other_symptom",
+                    models.ForeignKey(
+                        help_text="Симптом, встречающийся вместе с ним",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="health.symptom",
+                    ),
+                ),
+                (
+                    "symptom",
+                    models.ForeignKey(
+                        help_text="Симптом",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cooccurrences",
+                        to="health.symptom",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Совместная встречаемость симптомов",
+                "verbose_name_plural": "Совместная встречаемость симптомов",
+                "ordering": ["-lift"],
+                "unique_together": {("symptom", "other_symptom")},
+            },
+        ),
+        migrations.CreateModel(
+            name="SymptomTrend",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "age_group",
+                    models.CharField(
+                        choices=[
+                            ("puppy", "До 1 года"),
+                            ("young", "1-3 года"),
+                            ("adult", "3-8 лет"),
+                            ("senior", "Старше 8 лет"),
+                            ("unknown", "Возраст неизвестен"),
+                        ],
+                        help_text="Возрастная группа на дату лога",
+                        max_length=10,
+                    ),
+                ),
+                ("month", models.DateField(help_text="Первый день месяца")),
+                (
+                    "log_count",
+                    models.PositiveIntegerField(help_text="Количество дневных логов"),
+                ),
+                (
+                    "symptom_counts",
+                    models.BinaryField(
+                        help_text="Количество логов с каждым симптомом по номеру бита (uint32)"
+                    ),
+                ),
+                (
+                    "breed",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Порода (пусто, если порода не указана)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="symptom_trends",
+                        to="pets.breed",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Тренд симптомов",
+                "verbose_name_plural": "Тренды симптомов",
+                "unique_together": {("breed", "age_group", "month")},
+            },
+        ),
+    ]
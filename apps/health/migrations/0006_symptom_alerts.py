@@ -0,0 +1,137 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:53
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("health", "0005_symptom_analytics"),
+        ("pets", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SymptomAlert",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "start_date",
+                    models.DateField(
+                        help_text="Первый день, в который правило выполнилось"
+                    ),
+                ),
+                (
+                    "end_date",
+                    models.DateField(
+                        help_text="Последний день, в который правило выполнялось"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Тревога по симптомам",
+                "verbose_name_plural": "Тревоги по симптомам",
+                "ordering": ["-end_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SymptomAlertRule",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Название правила", max_length=100, unique=True
+                    ),
+                ),
+                (
+                    "min_days",
+                    models.PositiveSmallIntegerField(
+                        help_text="Минимальное количество дней с симптомом"
+                    ),
+                ),
+                (
+                    "window_days",
+                    models.PositiveSmallIntegerField(
+                        help_text="Окно в днях, в котором считаются дни с симптомом"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(default=True, help_text="Правило включено"),
+                ),
+                (
+                    "checked_until",
+                    models.DateTimeField(
+                        blank=True,
+                        editable=False,
+                        help_text="Логи, измененные до этого момента, уже проверены",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Правило тревоги по симптомам",
+                "verbose_name_plural": "Правила тревоги по симптомам",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="dailylog",
+            index=models.Index(fields=["updated_at"], name="dailylog_updated_at_idx"),
+        ),
+        migrations.AddField(
+            model_name="symptomalert",
+            name="pet",
+            field=models.ForeignKey(
+                help_text="Питомец",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="symptom_alerts",
+                to="pets.pet",
+            ),
+        ),
+        migrations.AddField(
+            model_name="symptomalertrule",
+            name="symptom",
+            field=models.ForeignKey(
+                help_text="Симптом",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="alert_rules",
+                to="health.symptom",
+            ),
+        ),
+        migrations.AddField(
+            model_name="symptomalert",
+            name="rule",
+            field=models.ForeignKey(
+                help_text="Правило",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="alerts",
+                to="health.symptomalertrule",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="symptomalert",
+            unique_together={("pet", "rule", "start_date")},
+        ),
+    ]
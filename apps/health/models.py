@@ -1,12 +1,25 @@
 import uuid
+from collections import Counter
+
+import numpy as np
 import pytz
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models.signals import post_migrate
+from django.db import connection, models
+from django.db.models import ExpressionWrapper, F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
 from django.dispatch import receiver
 from django.utils import timezone
 
-from apps.pets.models import Pet
+from apps.health import bitsets, reference
+from apps.pets.models import Breed, Pet
+from utils.datetime_utils import get_zone, local_today
 
 
 class SymptomCategory(models.Model):
@@ -39,16 +52,101 @@ class Symptom(models.Model):
         help_text="Категория симптома",
     )
     name = models.CharField(max_length=100, unique=True, help_text="Название симптома")
+    bit = models.PositiveSmallIntegerField(
+        unique=True,
+        null=True,
+        editable=False,
+        help_text="Номер бита симптома в DailyLog.symptom_mask",
+    )
 
     class Meta:
         verbose_name = "Симптом"
         verbose_name_plural = "Симптомы"
         ordering = ["category__name", "name"]
         unique_together = ("name", "category")
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(bit__lt=bitsets.MASK_BITS),
+                name="symptom_bit_fits_mask",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.category.name})"
 
+    def save(self, *args, **kwargs):
+        if self.bit is None:
+            self.bit = self.free_bit()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def free_bit(cls):
+        """Первый свободный бит маски симптомов"""
+        used = set(cls.objects.exclude(bit=None).values_list("bit", flat=True))
+        for bit in range(bitsets.MASK_BITS):
+            if bit not in used:
+                return bit
+        raise ValidationError("No free symptom bit left.")
+
+    @classmethod
+    def ids_by_bit(cls):
+        """Массив id симптомов, индексированный номером бита (кешируется)"""
+        key = f"health-symptom-bits:{reference.get_version()}"
+        ids = cache.get(key)
+        if ids is None:
+            ids = [None] * bitsets.MASK_BITS
+            for symptom_id, bit in cls.objects.exclude(bit=None).values_list(
+                "id",
+                "bit",
+            ):
+                ids[bit] = symptom_id
+            cache.set(key, ids, settings.CACHE_TIMEOUT)
+        return ids
+
+    @classmethod
+    def ids_of_mask(cls, mask):
+        """Id симптомов, биты которых установлены в маске"""
+        return [
+            symptom_id
+            for bit, symptom_id in enumerate(cls.ids_by_bit())
+            if symptom_id is not None and mask >> bit & 1
+        ]
+
+    @classmethod
+    def mask_of(cls, symptom_ids):
+        """Битовая маска для набора симптомов"""
+        symptom_ids = {str(symptom_id) for symptom_id in symptom_ids}
+        return bitsets.mask_of_bits(
+            bit
+            for bit, symptom_id in enumerate(cls.ids_by_bit())
+            if symptom_id is not None and str(symptom_id) in symptom_ids
+        )
+
+
+def _masked_symptoms(mask):
+    # Django types `bitand` as an IntegerField, and an IntegerField lookup
+    # against a mask wider than 32 bits matches nothing.
+    return ExpressionWrapper(
+        F("symptom_mask").bitand(mask),
+        output_field=models.BigIntegerField(),
+    )
+
+
+class DailyLogQuerySet(models.QuerySet):
+    def with_any_symptom(self, symptom_ids):
+        """Логи, в которых есть хотя бы один из симптомов"""
+        mask = Symptom.mask_of(symptom_ids)
+        return self.alias(
+            matched_symptoms=_masked_symptoms(mask),
+        ).exclude(matched_symptoms=0)
+
+    def with_all_symptoms(self, symptom_ids):
+        """Логи, в которых есть все указанные симптомы"""
+        mask = Symptom.mask_of(symptom_ids)
+        return self.alias(
+            matched_symptoms=_masked_symptoms(mask),
+        ).filter(matched_symptoms=mask)
+
 
 class DailyLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -65,6 +163,11 @@ class DailyLog(models.Model):
         related_name="daily_logs",
         help_text="Симптомы",
     )
+    symptom_mask = models.BigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Битовая маска симптомов (см. Symptom.bit), синхронизируется с symptoms",
+    )
 
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -75,11 +178,24 @@ class DailyLog(models.Model):
         help_text="Дата и время последнего обновления записи",
     )
 
+    objects = DailyLogQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Ежедневный лог"
         verbose_name_plural = "Ежедневные логи"
         unique_together = ("pet", "date")
         ordering = ["-date"]
+        indexes = [
+            # Покрывающий индекс для аналитики по симптомам: маска берется
+            # из индекса без чтения таблицы.
+            models.Index(
+                fields=["pet", "date"],
+                include=["symptom_mask"],
+                name="dailylog_pet_date_mask_idx",
+            ),
+            # Логи, измененные с последней проверки (см. alerts.py).
+            models.Index(fields=["updated_at"], name="dailylog_updated_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.pet.name} - {self.date}"
@@ -98,107 +214,488 @@ class DailyLog(models.Model):
         symptoms = Symptom.objects.filter(id__in=symptom_ids)
         self.symptoms.remove(*symptoms)
 
-    @classmethod
-    def get_today_log(cls, pet, user_timezone=None):
-        """Получить или создать лог для сегодня с учетом часового пояса пользователя"""
-        if user_timezone:
+    @staticmethod
+    def local_today(user_timezone=None):
+        """Сегодняшняя дата с учетом часового пояса пользователя (имя или объект пояса)"""
+        if isinstance(user_timezone, str):
             try:
-                user_tz = pytz.timezone(user_timezone)
-                today = timezone.now().astimezone(user_tz).date()
+                user_timezone = get_zone(user_timezone) if user_timezone else None
             except pytz.UnknownTimeZoneError:
                 raise ValidationError("Unknown timezone.")
-        else:
-            today = timezone.now().date()
+        return local_today(user_timezone)
 
-        if isinstance(pet, (int, str)):
+    @classmethod
+    def find_today_log(cls, pet, user_timezone=None):
+        """Получить лог для сегодня без записи в БД.
+
+        Если лога еще нет, возвращается пустой несохраненный лог с id,
+        вычисленным из питомца и даты: запись с этим id создается
+        только при первом изменении симптомов (см. `materialize`).
+        """
+        today = cls.local_today(user_timezone)
+        pet_id = pet.pk if isinstance(pet, Pet) else pet
+
+        log = (
+            cls.objects.filter(pet_id=pet_id, date=today)
+            .select_related("pet")
+            .prefetch_related("symptoms__category")
+            .first()
+        )
+        if log:
+            return log
+
+        if not isinstance(pet, Pet):
             pet = Pet.objects.filter(id=pet).first()
             if not pet:
                 raise ValidationError("Pet not found.")
 
-        log, created = cls.objects.get_or_create(pet=pet, date=today)
+        log = cls(id=cls.stable_id(pet.pk, today), pet=pet, date=today)
+        log._prefetched_objects_cache = {"symptoms": Symptom.objects.none()}
         return log
 
+    @staticmethod
+    def stable_id(pet_id, date):
+        """Id лога питомца за дату, одинаковый до и после сохранения"""
+        return uuid.uuid5(uuid.UUID(str(pet_id)), date.isoformat())
 
-@receiver(post_migrate)
-def create_default_symptoms(sender, **kwargs):
-    from django.db.utils import IntegrityError
-
-    if sender.name == "apps.health":
-        categories = {
-            "Mood": [
-                "Happy",
-                "Neutral",
-                "Playful",
-                "Sad",
-                "Tired",
-                "Sleeping all day",
-                "Restless",
-                "Aggressive",
-            ],
-            "Overall Well-Being": [
-                "All good",
-                "Excited",
-                "Excessive drooling",
-                "Vomiting",
-                "Diarrhea",
-                "In pain",
-                "Loss of appetite",
-                "Heavy, rapid breathing",
-                "Change in urine or stool",
-                "Frequent urination",
-                "Other behavior changes",
-                "Dry nose",
-            ],
-            "Feeding": [
-                "Today's meal: All eaten",
-                "Didn't finish",
-                "Refused to eat",
-                "Spoiled with treats",
-                "Ate something forbidden",
-                "Ate something unknown",
-                "Overate",
-                "New food/New diet",
-            ],
-            "Physical Activity": [
-                "Walk",
-                "Running",
-                "Active outdoor play",
-                "Indoor play",
-                "Mental games",
-                "Swimming",
-                "Command/Trick practice",
-                "Agility training",
-            ],
-            "Digestion and Stool": [
-                "Vomiting",
-                "Bloating",
-                "Constipation",
-                "Diarrhea",
-                "Blood in stool",
-                "Mucus in stool",
-                "Chewed grass/bark",
-                "Chewed furniture or objects",
-            ],
-            "Unusual Events": [
-                "Met a new friend (dog, cat, or human)",
-                "Traveled by transport",
-                "Vet visit",
-                "Grooming salon visit",
-                "Ran away",
-                "Home alone (for a long time)",
-                "Fought with another dog",
-                "Frightened",
-                "Separation from owner",
-                "Loss of owner",
-            ],
-        }
-
-        for category_name, symptoms in categories.items():
-            category, created = SymptomCategory.objects.get_or_create(
-                name=category_name,
+    @classmethod
+    def materialize_log(cls, pet_id, date):
+        """Получить или создать лог питомца за дату"""
+        log, created = cls.objects.get_or_create(
+            pet_id=pet_id,
+            date=date,
+            defaults={"id": cls.stable_id(pet_id, date)},
+        )
+        return log
+
+    @classmethod
+    def get_today_log(cls, pet, user_timezone=None):
+        """Получить или создать лог для сегодня с учетом часового пояса пользователя"""
+        return cls.find_today_log(pet, user_timezone=user_timezone).materialize()
+
+    @classmethod
+    def symptom_calendar(cls, pet_id, start_date, end_date):
+        """Симптомы питомца по дням за период `[start_date, end_date]`.
+
+        Читает только `(date, symptom_mask)` и раскладывает маски в NumPy.
+        Возвращает `(days, counts)`: список `(date, [symptom_id, ...])` по
+        дням, в которые были симптомы, и `{symptom_id: число дней}`.
+        """
+        rows = list(
+            cls.objects.filter(pet_id=pet_id, date__range=(start_date, end_date))
+            .exclude(symptom_mask=0)
+            .order_by("date")
+            .values_list("date", "symptom_mask"),
+        )
+        if not rows:
+            return [], Counter()
+
+        dates, masks = zip(*rows)
+        matrix = bitsets.unpack(masks)
+        ids = np.array(Symptom.ids_by_bit(), dtype=object)
+        days = [(date, list(ids[row])) for date, row in zip(dates, matrix)]
+        counts = Counter(
+            {
+                ids[bit]: int(count)
+                for bit, count in enumerate(matrix.sum(axis=0))
+                if count
+            },
+        )
+        return days, counts
+
+    @classmethod
+    def _sql_tables(cls):
+        """Имена таблиц лога, питомца, связи с симптомами и симптома для сырого SQL"""
+        return tuple(
+            connection.ops.quote_name(model._meta.db_table)
+            for model in (cls, Pet, cls.symptoms.through, Symptom)
+        )
+
+    @classmethod
+    def apply_symptom_diff(cls, pet_id, date, add=(), remove=(), owner=None):
+        """Добавить и удалить симптомы лога за `date` одним запросом.
+
+        Связи вставляются с `ON CONFLICT DO NOTHING` и удаляются одним
+        DELETE; маска меняется ровно на биты реально вставленных и удаленных
+        связей, `updated_at` обновляется тем же UPDATE. Неизвестные симптомы
+        пропускаются. Возвращает `(id, symptom_mask, updated_at)` или None,
+        если лога нет (или питомец не принадлежит `owner`).
+        """
+        log_table, pet_table, through_table, symptom_table = cls._sql_tables()
+        owner_filter = "AND pet.owner_id = %(owner)s" if owner is not None else ""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH log AS (
+                    SELECT log.id
+                    FROM {log_table} AS log
+                    JOIN {pet_table} AS pet ON pet.id = log.pet_id
+                    WHERE log.pet_id = %(pet)s AND log.date = %(date)s {owner_filter}
+                ),
+                removed AS (
+                    DELETE FROM {through_table} AS through
+                    USING log
+                    WHERE through.dailylog_id = log.id
+                        AND through.symptom_id = ANY(%(remove)s::uuid[])
+                    RETURNING through.symptom_id
+                ),
+                added AS (
+                    INSERT INTO {through_table} (dailylog_id, symptom_id)
+                    SELECT log.id, symptom.id
+                    FROM log, {symptom_table} AS symptom
+                    WHERE symptom.id = ANY(%(add)s::uuid[])
+                    ON CONFLICT DO NOTHING
+                    RETURNING symptom_id
+                )
+                UPDATE {log_table} AS daily
+                SET symptom_mask = (
+                        daily.symptom_mask & ~COALESCE(
+                            (
+                                SELECT bit_or(1::bigint << symptom.bit)
+                                FROM removed
+                                JOIN {symptom_table} AS symptom
+                                    ON symptom.id = removed.symptom_id
+                            ),
+                            0
+                        )
+                    ) | COALESCE(
+                        (
+                            SELECT bit_or(1::bigint << symptom.bit)
+                            FROM added
+                            JOIN {symptom_table} AS symptom
+                                ON symptom.id = added.symptom_id
+                        ),
+                        0
+                    ),
+                    updated_at = %(now)s
+                FROM log
+                WHERE daily.id = log.id
+                RETURNING daily.id, daily.symptom_mask, daily.updated_at
+                """,
+                {
+                    "pet": pet_id,
+                    "date": date,
+                    "owner": owner,
+                    "add": [str(symptom_id) for symptom_id in add],
+                    "remove": [str(symptom_id) for symptom_id in remove],
+                    "now": timezone.now(),
+                },
+            )
+            return cursor.fetchone()
+
+    @classmethod
+    def bulk_sync(cls, owner, days):
+        """Записать симптомы сразу за много дней и питомцев.
+
+        `days` — `{(pet_id, date): [symptom_id, ...]}`, симптомы каждого лога
+        заменяются переданными. Все делается одним запросом независимо от
+        размера пачки: логи вставляются из массивов через `unnest` с
+        `ON CONFLICT (pet_id, date) DO UPDATE`, связи с симптомами
+        вычисляются из маски, лишние удаляются, недостающие вставляются.
+        Питомцы, не принадлежащие `owner`, пропускаются. Возвращает строки
+        `(id, pet_id, date, symptom_mask, updated_at)`.
+        """
+        if not days:
+            return []
+        keys = list(days)
+        log_table, pet_table, through_table, symptom_table = cls._sql_tables()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH input AS (
+                    SELECT *
+                    FROM unnest(
+                        %(ids)s::uuid[],
+                        %(pets)s::uuid[],
+                        %(dates)s::date[],
+                        %(masks)s::bigint[]
+                    ) AS input (id, pet_id, date, symptom_mask)
+                ),
+                logs AS (
+                    INSERT INTO {log_table}
+                        (id, pet_id, date, symptom_mask, created_at, updated_at)
+                    SELECT
+                        input.id,
+                        input.pet_id,
+                        input.date,
+                        input.symptom_mask,
+                        %(now)s,
+                        %(now)s
+                    FROM input
+                    JOIN {pet_table} AS pet
+                        ON pet.id = input.pet_id AND pet.owner_id = %(owner)s
+                    ON CONFLICT (pet_id, date) DO UPDATE
+                    SET symptom_mask = EXCLUDED.symptom_mask,
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING id, pet_id, date, symptom_mask, updated_at
+                ),
+                wanted AS (
+                    SELECT logs.id AS dailylog_id, symptom.id AS symptom_id
+                    FROM logs
+                    JOIN {symptom_table} AS symptom
+                        ON logs.symptom_mask & (1::bigint << symptom.bit) <> 0
+                ),
+                removed AS (
+                    DELETE FROM {through_table} AS through
+                    USING logs
+                    WHERE through.dailylog_id = logs.id
+                        AND NOT EXISTS (
+                            SELECT 1
+                            FROM wanted
+                            WHERE wanted.dailylog_id = through.dailylog_id
+                                AND wanted.symptom_id = through.symptom_id
+                        )
+                ),
+                added AS (
+                    INSERT INTO {through_table} (dailylog_id, symptom_id)
+                    SELECT dailylog_id, symptom_id
+                    FROM wanted
+                    ON CONFLICT DO NOTHING
+                )
+                SELECT id, pet_id, date, symptom_mask, updated_at
+                FROM logs
+                ORDER BY pet_id, date
+                """,
+                {
+                    "ids": [cls.stable_id(pet_id, date) for pet_id, date in keys],
+                    "pets": [str(pet_id) for pet_id, _ in keys],
+                    "dates": [date for _, date in keys],
+                    "masks": [Symptom.mask_of(days[key]) for key in keys],
+                    "owner": owner,
+                    "now": timezone.now(),
+                },
             )
-            for symptom_name in symptoms:
-                try:
-                    Symptom.objects.get_or_create(name=symptom_name, category=category)
-                except IntegrityError:
-                    pass
+            return cursor.fetchall()
+
+    @classmethod
+    def refresh_symptom_masks(cls, log_ids):
+        """Пересчитать `symptom_mask` логов по их симптомам; вернуть `{id: маска}`.
+
+        `updated_at` тоже обновляется: по нему проверка тревог находит
+        измененные логи.
+        """
+        if not log_ids:
+            return {}
+        log_table, _, through_table, symptom_table = cls._sql_tables()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {log_table} AS log
+                SET symptom_mask = COALESCE(
+                        (
+                            SELECT bit_or(1::bigint << symptom.bit)
+                            FROM {through_table} AS through
+                            JOIN {symptom_table} AS symptom
+                                ON symptom.id = through.symptom_id
+                            WHERE through.dailylog_id = log.id
+                        ),
+                        0
+                    ),
+                    updated_at = %s
+                WHERE log.id = ANY(%s)
+                RETURNING log.id, log.symptom_mask
+                """,
+                [timezone.now(), list(log_ids)],
+            )
+            return dict(cursor.fetchall())
+
+    @property
+    def is_virtual(self):
+        """Лог еще не сохранен в БД (см. `find_today_log`)"""
+        return self._state.adding
+
+    def materialize(self):
+        """Сохранить виртуальный лог и вернуть сохраненный экземпляр"""
+        if not self.is_virtual:
+            return self
+        return DailyLog.materialize_log(self.pet_id, self.date)
+
+
+AGE_GROUPS = [
+    ("puppy", "До 1 года"),
+    ("young", "1-3 года"),
+    ("adult", "3-8 лет"),
+    ("senior", "Старше 8 лет"),
+    ("unknown", "Возраст неизвестен"),
+]
+
+
+class SymptomTrend(models.Model):
+    """Частота симптомов за месяц по породе и возрастной группе"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    breed = models.ForeignKey(
+        Breed,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="symptom_trends",
+        help_text="Порода (пусто, если порода не указана)",
+    )
+    age_group = models.CharField(
+        max_length=10,
+        choices=AGE_GROUPS,
+        help_text="Возрастная группа на дату лога",
+    )
+    month = models.DateField(help_text="Первый день месяца")
+    log_count = models.PositiveIntegerField(help_text="Количество дневных логов")
+    symptom_counts = models.BinaryField(
+        help_text="Количество логов с каждым симптомом по номеру бита (uint32)",
+    )
+
+    class Meta:
+        verbose_name = "Тренд симптомов"
+        verbose_name_plural = "Тренды симптомов"
+        unique_together = ("breed", "age_group", "month")
+
+
+class SymptomCooccurrence(models.Model):
+    """Совместная встречаемость пары симптомов по всем дневным логам"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    symptom = models.ForeignKey(
+        Symptom,
+        on_delete=models.CASCADE,
+        related_name="cooccurrences",
+        help_text="Симптом",
+    )
+    other_symptom = models.ForeignKey(
+        Symptom,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="Симптом, встречающийся вместе с ним",
+    )
+    together = models.PositiveIntegerField(
+        help_text="Количество логов с обоими симптомами"
+    )
+    support = models.FloatField(help_text="Доля логов с обоими симптомами")
+    confidence = models.FloatField(
+        help_text="Доля логов с `other_symptom` среди логов с `symptom`",
+    )
+    lift = models.FloatField(
+        help_text="Во сколько раз пара встречается чаще, чем при независимости",
+    )
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Совместная встречаемость симптомов"
+        verbose_name_plural = "Совместная встречаемость симптомов"
+        unique_together = ("symptom", "other_symptom")
+        ordering = ["-lift"]
+
+
+class SymptomAlertRule(models.Model):
+    """Правило тревоги: симптом отмечен не меньше `min_days` дней из `window_days`
+
+    При `min_days == window_days` это серия дней подряд.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=100, unique=True, help_text="Название правила")
+    symptom = models.ForeignKey(
+        Symptom,
+        on_delete=models.CASCADE,
+        related_name="alert_rules",
+        help_text="Симптом",
+    )
+    min_days = models.PositiveSmallIntegerField(
+        help_text="Минимальное количество дней с симптомом",
+    )
+    window_days = models.PositiveSmallIntegerField(
+        help_text="Окно в днях, в котором считаются дни с симптомом",
+    )
+    is_active = models.BooleanField(default=True, help_text="Правило включено")
+    checked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Логи, измененные до этого момента, уже проверены",
+    )
+
+    class Meta:
+        verbose_name = "Правило тревоги по симптомам"
+        verbose_name_plural = "Правила тревоги по симптомам"
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        if not 1 <= self.min_days <= self.window_days:
+            raise ValidationError("min_days must be between 1 and window_days.")
+
+
+class SymptomAlert(models.Model):
+    """Срабатывание правила: непрерывный период дней, в которые правило выполнялось"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    pet = models.ForeignKey(
+        Pet,
+        on_delete=models.CASCADE,
+        related_name="symptom_alerts",
+        help_text="Питомец",
+    )
+    rule = models.ForeignKey(
+        SymptomAlertRule,
+        on_delete=models.CASCADE,
+        related_name="alerts",
+        help_text="Правило",
+    )
+    start_date = models.DateField(
+        help_text="Первый день, в который правило выполнилось"
+    )
+    end_date = models.DateField(
+        help_text="Последний день, в который правило выполнялось"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Тревога по симптомам"
+        verbose_name_plural = "Тревоги по симптомам"
+        unique_together = ("pet", "rule", "start_date")
+        ordering = ["-end_date"]
+
+    def __str__(self):
+        return (
+            f"{self.rule.name}: {self.pet.name} ({self.start_date} - {self.end_date})"
+        )
+
+
+@receiver(post_save, sender=SymptomCategory)
+@receiver(post_delete, sender=SymptomCategory)
+@receiver(post_save, sender=Symptom)
+@receiver(post_delete, sender=Symptom)
+def bump_reference_version(sender, **kwargs):
+    reference.bump_version()
+
+
+@receiver(m2m_changed, sender=DailyLog.symptoms.through)
+def sync_symptom_mask(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # symptom.daily_logs.clear(): remember the logs before the rows go.
+        instance._cleared_log_ids = list(
+            instance.daily_logs.values_list("pk", flat=True),
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        masks = DailyLog.refresh_symptom_masks([instance.pk])
+        # Keep the instance in sync, so a later save() doesn't overwrite the mask.
+        instance.symptom_mask = masks.get(instance.pk, 0)
+    elif action == "post_clear":
+        DailyLog.refresh_symptom_masks(instance.__dict__.pop("_cleared_log_ids", []))
+    else:
+        DailyLog.refresh_symptom_masks(pk_set)
+
+
+@receiver(pre_delete, sender=Symptom)
+def clear_symptom_bit(sender, instance, **kwargs):
+    """Убрать бит удаляемого симптома из масок: он может достаться новому симптому"""
+    if instance.bit is None:
+        return
+    mask = bitsets.mask_of_bits([instance.bit])
+    DailyLog.objects.alias(matched_symptoms=F("symptom_mask").bitand(mask)).exclude(
+        matched_symptoms=0,
+    ).update(symptom_mask=F("symptom_mask").bitand(~mask))
@@ -0,0 +1,24 @@
+"""Version of the health reference data (symptom categories and symptoms).
+
+The version changes on every write to the reference models, so anything
+derived from them can be cached under the version it was built from.
+"""
+
+import time
+
+from django.core.cache import cache
+
+REFERENCE_VERSION_KEY = "health-reference-version"
+
+
+def get_version():
+    return cache.get_or_set(REFERENCE_VERSION_KEY, time.time_ns, None)
+
+
+def bump_version():
+    try:
+        cache.incr(REFERENCE_VERSION_KEY)
+    except ValueError:
+        # Never read or evicted: restart from the clock so the new
+        # version can't repeat one that was already handed out.
+        cache.set(REFERENCE_VERSION_KEY, time.time_ns(), None)
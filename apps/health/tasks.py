@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from apps.health.alerts import check_symptom_alerts
+from apps.health.analytics import build_symptom_analytics
+
+
+@shared_task
+def rebuild_symptom_analytics():
+    """Recompute symptom co-occurrence and trends over all daily logs."""
+    return build_symptom_analytics()
+
+
+@shared_task
+def evaluate_symptom_alerts():
+    """Check the alert rules against the daily logs changed since the last run."""
+    return check_symptom_alerts()
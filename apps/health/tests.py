@@ -0,0 +1,529 @@
+import datetime
+import gzip
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.api.v1.health.bundle import accepts_gzip
+from apps.health.alerts import check_symptom_alerts
+from apps.health.analytics import build_symptom_analytics, trend_series
+from apps.health.models import (
+    DailyLog,
+    Symptom,
+    SymptomAlert,
+    SymptomAlertRule,
+    SymptomCategory,
+    SymptomCooccurrence,
+    SymptomTrend,
+)
+from apps.pets.models import Pet
+
+User = get_user_model()
+
+DATE = datetime.date(2026, 3, 2)
+
+
+class HealthTestCase(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="password")
+        self.pet = Pet.objects.create(owner=self.owner, name="Rex")
+        self.category = SymptomCategory.objects.create(name="Test category")
+        self.cough, self.fever, self.limp = (
+            Symptom.objects.create(category=self.category, name=name)
+            for name in ("Test cough", "Test fever", "Test limp")
+        )
+
+    def api(self, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.owner)
+        return client
+
+    def assertMaskMatchesSymptoms(self, log, expected):
+        log.refresh_from_db()
+        expected_ids = {symptom.pk for symptom in expected}
+        self.assertEqual(set(log.symptoms.values_list("pk", flat=True)), expected_ids)
+        self.assertEqual(log.symptom_mask, Symptom.mask_of(expected_ids))
+        self.assertEqual(set(Symptom.ids_of_mask(log.symptom_mask)), expected_ids)
+
+
+class TodayLogTests(HealthTestCase):
+    def test_reading_today_does_not_write(self):
+        log = DailyLog.find_today_log(self.pet)
+        self.assertTrue(log.is_virtual)
+        self.assertEqual(log.id, DailyLog.stable_id(self.pet.pk, log.date))
+        self.assertEqual(list(log.symptoms.all()), [])
+        self.assertFalse(DailyLog.objects.filter(pet=self.pet).exists())
+
+        saved = DailyLog.get_today_log(self.pet)
+        self.assertFalse(saved.is_virtual)
+        self.assertEqual(saved.id, log.id)
+        self.assertEqual(DailyLog.find_today_log(self.pet.pk).id, log.id)
+
+    def test_today_follows_the_timezone(self):
+        # 22:00 UTC is already the next day in Moscow (UTC+3).
+        now = datetime.datetime(2026, 3, 2, 22, 0, tzinfo=datetime.UTC)
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            self.assertEqual(DailyLog.find_today_log(self.pet).date, DATE)
+            self.assertEqual(
+                DailyLog.find_today_log(self.pet, "Europe/Moscow").date,
+                DATE + datetime.timedelta(days=1),
+            )
+
+    def test_get_endpoint_keeps_the_log_virtual(self):
+        url = reverse("symptom-logs-list", kwargs={"pet_pk": self.pet.pk})
+        response = self.api().get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["symptoms"], [])
+        self.assertFalse(DailyLog.objects.filter(pet=self.pet).exists())
+
+
+class ReferenceBundleTests(HealthTestCase):
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    def get(self, name, **headers):
+        return APIClient().get(reverse(name), headers=headers)
+
+    def test_symptoms_nest_their_category_without_recursion(self):
+        response = self.get("symptom-list")
+        self.assertEqual(response.status_code, 200)
+        cough = next(
+            item
+            for item in json.loads(response.content)
+            if item["name"] == "Test cough"
+        )
+        self.assertEqual(
+            cough["category"],
+            {
+                "id": str(self.category.pk),
+                "name": "Test category",
+                "description": self.category.description,
+            },
+        )
+
+    def test_etag_returns_not_modified(self):
+        response = self.get("symptomcategory-list")
+        etag = response["ETag"]
+        self.assertEqual(
+            self.get("symptomcategory-list", If_None_Match=etag).status_code, 304
+        )
+        self.assertEqual(
+            self.get("symptomcategory-list", If_None_Match=f"W/{etag}").status_code,
+            304,
+        )
+
+    def test_reference_write_changes_the_etag(self):
+        etag = self.get("symptom-list")["ETag"]
+        Symptom.objects.create(category=self.category, name="Test sneeze")
+        response = self.get("symptom-list", If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn(
+            "Test sneeze", [item["name"] for item in json.loads(response.content)]
+        )
+
+    def test_gzip_body_matches_identity_body(self):
+        plain = self.get("symptom-list")
+        zipped = self.get("symptom-list", Accept_Encoding="br, gzip")
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(zipped["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertEqual(zipped["ETag"], plain["ETag"])
+
+    def test_accepts_gzip_honours_q_values(self):
+        for header, expected in (
+            ("gzip", True),
+            ("deflate, gzip;q=0.5", True),
+            ("gzip;q=0", False),
+            ("*", True),
+            ("*;q=0", False),
+            ("gzip;q=0, *", False),
+            ("br", False),
+            ("", False),
+        ):
+            with self.subTest(header=header):
+                self.assertEqual(accepts_gzip(header), expected)
+
+
+class SymptomCalendarTests(HealthTestCase):
+    def log(self, date, *symptoms):
+        log = DailyLog.materialize_log(self.pet.pk, date)
+        log.add_symptoms([symptom.pk for symptom in symptoms])
+        return log
+
+    def calendar(self, **params):
+        url = reverse("symptom-logs-calendar", kwargs={"pet_pk": self.pet.pk})
+        return self.api().get(url, params)
+
+    def test_days_and_counts(self):
+        self.log(DATE, self.cough, self.fever)
+        self.log(DATE + datetime.timedelta(days=1))
+        self.log(DATE + datetime.timedelta(days=2), self.cough)
+        self.log(DATE + datetime.timedelta(days=40), self.limp)
+
+        response = self.calendar(**{"from": "2026-03-01", "to": "2026-03-31"})
+        self.assertEqual(response.status_code, 200)
+        days = [
+            (day["date"], set(map(str, day["symptoms"])))
+            for day in response.data["days"]
+        ]
+        self.assertEqual(
+            days,
+            [
+                ("2026-03-02", {str(self.cough.pk), str(self.fever.pk)}),
+                ("2026-03-04", {str(self.cough.pk)}),
+            ],
+        )
+        self.assertEqual(
+            response.data["symptom_counts"],
+            [
+                {"symptom_id": str(self.cough.pk), "days": 2},
+                {"symptom_id": str(self.fever.pk), "days": 1},
+            ],
+        )
+
+    def test_empty_range(self):
+        response = self.calendar(**{"from": "2026-03-01", "to": "2026-03-31"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["days"], [])
+        self.assertEqual(response.data["symptom_counts"], [])
+
+    def test_invalid_ranges(self):
+        for params in (
+            {"from": "2026-03-31", "to": "2026-03-01"},
+            {"from": "2025-01-01", "to": "2026-03-01"},
+            {"from": "yesterday"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.calendar(**params).status_code, 400)
+
+    def test_foreign_pet(self):
+        stranger = User.objects.create_user(username="stranger", password="password")
+        url = reverse("symptom-logs-calendar", kwargs={"pet_pk": self.pet.pk})
+        self.assertEqual(self.api(stranger).get(url).status_code, 404)
+
+
+class SymptomMaskTests(HealthTestCase):
+    """`DailyLog.symptom_mask` always matches the `symptoms` relation."""
+
+    def test_add_and_remove_symptoms(self):
+        log = DailyLog.materialize_log(self.pet.pk, DATE)
+        log.add_symptoms([self.cough.pk, self.fever.pk])
+        self.assertMaskMatchesSymptoms(log, [self.cough, self.fever])
+
+        log.remove_symptoms([self.cough.pk])
+        self.assertMaskMatchesSymptoms(log, [self.fever])
+
+        log.symptoms.clear()
+        self.assertMaskMatchesSymptoms(log, [])
+
+    def test_deleting_a_symptom_clears_its_bit(self):
+        log = DailyLog.materialize_log(self.pet.pk, DATE)
+        log.add_symptoms([self.cough.pk, self.fever.pk])
+        self.cough.delete()
+        self.assertMaskMatchesSymptoms(log, [self.fever])
+
+    def test_mask_filters(self):
+        both = DailyLog.materialize_log(self.pet.pk, DATE)
+        both.add_symptoms([self.cough.pk, self.fever.pk])
+        cough = DailyLog.materialize_log(self.pet.pk, DATE + datetime.timedelta(days=1))
+        cough.add_symptoms([self.cough.pk])
+        DailyLog.materialize_log(self.pet.pk, DATE + datetime.timedelta(days=2))
+
+        logs = DailyLog.objects.filter(pet=self.pet)
+        self.assertEqual(
+            set(logs.with_any_symptom([self.cough.pk, self.limp.pk])), {both, cough}
+        )
+        self.assertEqual(
+            set(logs.with_all_symptoms([self.cough.pk, self.fever.pk])), {both}
+        )
+        self.assertEqual(set(logs.with_any_symptom([self.limp.pk])), set())
+
+
+class SymptomAnalyticsTests(HealthTestCase):
+    def log(self, date, *symptoms, pet=None):
+        log = DailyLog.materialize_log((pet or self.pet).pk, date)
+        log.add_symptoms([symptom.pk for symptom in symptoms])
+
+    def test_cooccurrence(self):
+        self.log(DATE, self.cough, self.fever)
+        self.log(DATE + datetime.timedelta(days=1), self.cough, self.fever)
+        self.log(DATE + datetime.timedelta(days=2), self.cough)
+        self.log(DATE + datetime.timedelta(days=3))
+
+        self.assertEqual(build_symptom_analytics(chunk_size=2, min_together=2), 4)
+        pairs = {
+            (pair.symptom_id, pair.other_symptom_id): pair
+            for pair in SymptomCooccurrence.objects.all()
+        }
+        self.assertEqual(
+            set(pairs), {(self.cough.pk, self.fever.pk), (self.fever.pk, self.cough.pk)}
+        )
+        pair = pairs[self.cough.pk, self.fever.pk]
+        self.assertEqual(pair.together, 2)
+        self.assertAlmostEqual(pair.support, 2 / 4)
+        self.assertAlmostEqual(pair.confidence, 2 / 3)
+        self.assertAlmostEqual(pair.lift, 2 * 4 / (3 * 2))
+        self.assertAlmostEqual(pairs[self.fever.pk, self.cough.pk].confidence, 1.0)
+
+    def test_rare_pairs_are_dropped(self):
+        self.log(DATE, self.cough, self.fever)
+        build_symptom_analytics(min_together=2)
+        self.assertFalse(SymptomCooccurrence.objects.exists())
+
+    def test_trends_by_age_group_and_month(self):
+        self.pet.birth_date = DATE - datetime.timedelta(days=100)
+        self.pet.save()
+        self.log(DATE, self.cough)
+        self.log(DATE + datetime.timedelta(days=1), self.cough, self.fever)
+        self.log(DATE + datetime.timedelta(days=31))
+        unknown = Pet.objects.create(owner=self.owner, name="Stray")
+        self.log(DATE, self.fever, pet=unknown)
+
+        build_symptom_analytics(chunk_size=3)
+        trends = {
+            (trend.age_group, trend.month): trend
+            for trend in SymptomTrend.objects.all()
+        }
+        self.assertEqual(
+            set(trends),
+            {
+                ("puppy", datetime.date(2026, 3, 1)),
+                ("puppy", datetime.date(2026, 4, 1)),
+                ("unknown", datetime.date(2026, 3, 1)),
+            },
+        )
+        march = trends["puppy", datetime.date(2026, 3, 1)]
+        self.assertEqual(march.log_count, 2)
+
+        rows = [
+            (trend.month, trend.log_count, trend.symptom_counts)
+            for trend in trends.values()
+        ]
+        self.assertEqual(
+            trend_series(rows, self.cough.bit),
+            [
+                {
+                    "month": datetime.date(2026, 3, 1),
+                    "log_count": 3,
+                    "days": 2,
+                    "frequency": 2 / 3,
+                },
+                {
+                    "month": datetime.date(2026, 4, 1),
+                    "log_count": 1,
+                    "days": 0,
+                    "frequency": 0.0,
+                },
+            ],
+        )
+
+    def test_trend_endpoint_filters_by_age_group(self):
+        self.log(DATE, self.cough)
+        build_symptom_analytics()
+        url = reverse("symptom-trend-list")
+
+        response = self.api().get(
+            url, {"symptom": self.cough.pk, "age_group": "unknown"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            [{"month": "2026-03-01", "log_count": 1, "days": 1, "frequency": 1.0}],
+        )
+        response = self.api().get(url, {"symptom": self.cough.pk, "age_group": "puppy"})
+        self.assertEqual(response.data, [])
+        self.assertEqual(self.api().get(url).status_code, 400)
+
+
+class SymptomDiffTests(HealthTestCase):
+    def test_apply_symptom_diff(self):
+        log = DailyLog.materialize_log(self.pet.pk, DATE)
+        log.add_symptoms([self.cough.pk])
+
+        log_id, mask, _ = DailyLog.apply_symptom_diff(
+            self.pet.pk,
+            DATE,
+            add=[self.fever.pk],
+            remove=[self.cough.pk, self.limp.pk],
+        )
+        self.assertEqual(log_id, log.pk)
+        self.assertMaskMatchesSymptoms(log, [self.fever])
+        self.assertEqual(mask, log.symptom_mask)
+
+    def test_repeated_add_keeps_the_mask(self):
+        log = DailyLog.materialize_log(self.pet.pk, DATE)
+        log.add_symptoms([self.cough.pk])
+
+        DailyLog.apply_symptom_diff(
+            self.pet.pk, DATE, add=[self.cough.pk, self.fever.pk]
+        )
+        self.assertMaskMatchesSymptoms(log, [self.cough, self.fever])
+
+    def test_checks_owner(self):
+        DailyLog.materialize_log(self.pet.pk, DATE)
+        stranger = User.objects.create_user(username="stranger", password="password")
+        self.assertIsNone(
+            DailyLog.apply_symptom_diff(
+                self.pet.pk, DATE, add=[self.cough.pk], owner=stranger.pk
+            )
+        )
+
+    def diff(self, user=None, **data):
+        url = reverse("symptom-logs-diff", kwargs={"pet_pk": self.pet.pk})
+        return self.api(user).patch(url, data, format="json")
+
+    def test_endpoint_creates_the_log_on_first_add(self):
+        response = self.diff(remove=[str(self.cough.pk)])
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["id"])
+        self.assertFalse(DailyLog.objects.exists())
+
+        response = self.diff(add=[str(self.cough.pk), str(self.fever.pk)])
+        self.assertEqual(response.status_code, 200)
+        log = DailyLog.objects.get(pet=self.pet)
+        self.assertEqual(response.data["id"], str(log.pk))
+        self.assertEqual(
+            set(response.data["symptoms_id"]), {str(self.cough.pk), str(self.fever.pk)}
+        )
+
+        response = self.diff(remove=[str(self.cough.pk)])
+        self.assertEqual(response.data["symptoms_id"], [str(self.fever.pk)])
+        self.assertMaskMatchesSymptoms(log, [self.fever])
+
+    def test_endpoint_rejects_bad_diffs(self):
+        self.assertEqual(
+            self.diff(
+                add=[str(self.cough.pk)], remove=[str(self.cough.pk)]
+            ).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.diff(add=["00000000-0000-0000-0000-000000000000"]).status_code, 400
+        )
+        stranger = User.objects.create_user(username="stranger", password="password")
+        self.assertEqual(self.diff(stranger, add=[str(self.cough.pk)]).status_code, 404)
+        self.assertFalse(DailyLog.objects.exists())
+
+
+class SymptomSyncTests(HealthTestCase):
+    def test_bulk_sync_replaces_symptoms(self):
+        existing = DailyLog.materialize_log(self.pet.pk, DATE)
+        existing.add_symptoms([self.cough.pk, self.limp.pk])
+        next_day = DATE + datetime.timedelta(days=1)
+
+        rows = DailyLog.bulk_sync(
+            self.owner.pk,
+            {
+                (self.pet.pk, DATE): [self.fever.pk, self.limp.pk],
+                (self.pet.pk, next_day): [self.cough.pk],
+            },
+        )
+        self.assertEqual([row[2] for row in rows], [DATE, next_day])
+        self.assertMaskMatchesSymptoms(existing, [self.fever, self.limp])
+        self.assertMaskMatchesSymptoms(
+            DailyLog.objects.get(pet=self.pet, date=next_day), [self.cough]
+        )
+
+    def test_bulk_sync_skips_foreign_pets(self):
+        stranger = User.objects.create_user(username="stranger", password="password")
+        rows = DailyLog.bulk_sync(stranger.pk, {(self.pet.pk, DATE): [self.cough.pk]})
+        self.assertEqual(rows, [])
+        self.assertFalse(DailyLog.objects.filter(pet=self.pet).exists())
+
+    def sync(self, logs, user=None):
+        return self.api(user).post(
+            reverse("symptom-logs-sync-sync"), {"logs": logs}, format="json"
+        )
+
+    def test_endpoint_is_idempotent(self):
+        logs = [
+            {
+                "pet_id": str(self.pet.pk),
+                "days": {
+                    "2026-03-02": [str(self.cough.pk)],
+                    "2026-03-03": [],
+                },
+            }
+        ]
+        first = self.sync(logs)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(
+            [(row["date"], row["symptoms_id"]) for row in first.data],
+            [("2026-03-02", [str(self.cough.pk)]), ("2026-03-03", [])],
+        )
+
+        second = self.sync(logs)
+        self.assertEqual(
+            [row["id"] for row in second.data], [row["id"] for row in first.data]
+        )
+        self.assertEqual(DailyLog.objects.filter(pet=self.pet).count(), 2)
+
+    def test_endpoint_rejects_bad_batches(self):
+        future = DATE + datetime.timedelta(days=3650)
+        for logs in (
+            [{"pet_id": str(self.pet.pk), "days": {future.isoformat(): []}}],
+            [{"pet_id": str(self.pet.pk), "days": {"2026-03-02": ["bad"]}}],
+            [{"pet_id": str(self.pet.pk), "days": {}}],
+        ):
+            with self.subTest(logs=logs):
+                self.assertEqual(self.sync(logs).status_code, 400)
+
+        stranger = User.objects.create_user(username="stranger", password="password")
+        logs = [{"pet_id": str(self.pet.pk), "days": {"2026-03-02": []}}]
+        self.assertEqual(self.sync(logs, stranger).status_code, 404)
+        self.assertFalse(DailyLog.objects.exists())
+
+
+class SymptomAlertTests(HealthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rule = SymptomAlertRule.objects.create(
+            name="Test cough 2 of 3 days", symptom=self.cough, min_days=2, window_days=3
+        )
+
+    def log(self, *days):
+        for day in days:
+            log = DailyLog.materialize_log(
+                self.pet.pk, DATE + datetime.timedelta(days=day)
+            )
+            log.add_symptoms([self.cough.pk])
+
+    def alerts(self):
+        alerts = SymptomAlert.objects.filter(rule=self.rule).order_by("start_date")
+        return [
+            ((alert.start_date - DATE).days, (alert.end_date - DATE).days)
+            for alert in alerts
+        ]
+
+    def test_firing_days_form_one_alert(self):
+        self.log(0, 2, 3, 10)
+        check_symptom_alerts()
+        # Days 2 and 3 have two cough days in their window; day 10 is alone.
+        self.assertEqual(self.alerts(), [(2, 3)])
+
+        check_symptom_alerts()
+        self.assertEqual(self.alerts(), [(2, 3)])
+
+    def test_new_days_extend_and_merge_alerts(self):
+        self.log(0, 1, 4, 5)
+        check_symptom_alerts()
+        self.assertEqual(self.alerts(), [(1, 1), (5, 5)])
+
+        self.log(2, 3)
+        check_symptom_alerts()
+        # Days 2 to 4 now fire too and bridge both alerts.
+        self.assertEqual(self.alerts(), [(1, 5)])
+
+    def test_watermark_limits_the_next_run(self):
+        self.log(0, 1)
+        self.assertEqual(check_symptom_alerts(), 1)
+        self.rule.refresh_from_db()
+        self.assertIsNotNone(self.rule.checked_until)
+        self.assertEqual(check_symptom_alerts(), 0)
@@ -1,8 +1,7 @@
 import uuid
+
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models.signals import post_migrate
-from django.dispatch import receiver
 
 User = get_user_model()
 GENDERS = [("Male", "Male"), ("Female", "Female")]
@@ -144,208 +143,3 @@ class Pet(models.Model):
 
     def __str__(self):
         return self.name if self.name else "Pet"
-
-
-@receiver(post_migrate)
-def create_default_breed(sender, **kwargs):
-    """Creates default breeds if the Breed table is empty."""
-    if not Breed.objects.exists():
-        breeds = [
-            {
-                "name": "Labrador Retriever",
-                "size": "Large",
-                "exercise_needs": 120,  # Более 2 часов
-                "grooming_requirements": 7,  # Раз в неделю
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 49,
-                "max_weight": 77,
-                "min_height": 21,
-                "max_height": 24,
-            },
-            {
-                "name": "French Bulldog",
-                "size": "Small",
-                "exercise_needs": 60,  # До 1 часа
-                "grooming_requirements": 7,  # Раз в неделю
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 19,
-                "max_weight": 34,
-                "min_height": 12,
-                "max_height": 13,
-            },
-            {
-                "name": "German Shepherd",
-                "size": "Large",
-                "exercise_needs": 120,
-                "grooming_requirements": 4,  # Более одного раза в неделю
-                "coat_length": "Short & long",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 48,
-                "max_weight": 97,
-                "min_height": 22,
-                "max_height": 26,
-            },
-            {
-                "name": "Golden Retriever",
-                "size": "Large",
-                "exercise_needs": 120,
-                "grooming_requirements": 4,
-                "coat_length": "Medium",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 46,
-                "max_weight": 80,
-                "min_height": 20,
-                "max_height": 24,
-            },
-            {
-                "name": "Bulldog",
-                "size": "Medium",
-                "exercise_needs": 60,
-                "grooming_requirements": 7,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 9,
-                "min_weight": 55,
-                "max_weight": 99,
-                "min_height": 18,
-                "max_height": 26,
-            },
-            {
-                "name": "Poodle",
-                "size": "Medium",
-                "exercise_needs": 60,
-                "grooming_requirements": 1,  # Каждый день
-                "coat_length": "Medium",
-                "sheds": False,
-                "lifespan": 12,
-                "min_weight": 15,
-                "max_weight": 69,
-                "min_height": 14,
-                "max_height": 24,
-            },
-            {
-                "name": "Poodle Toy",
-                "size": "Small",
-                "exercise_needs": 60,
-                "grooming_requirements": 1,
-                "coat_length": "Medium",
-                "sheds": False,
-                "lifespan": 12,
-                "min_weight": 7,
-                "max_weight": 28,
-                "min_height": 8,
-                "max_height": 15,
-            },
-            {
-                "name": "Beagle",
-                "size": "Small",
-                "exercise_needs": 60,
-                "grooming_requirements": 7,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 12,
-                "min_weight": 17,
-                "max_weight": 37,
-                "min_height": 13,
-                "max_height": 16,
-            },
-            {
-                "name": "Rottweiler",
-                "size": "Large",
-                "exercise_needs": 120,
-                "grooming_requirements": 7,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 9,
-                "min_weight": 72,
-                "max_weight": 132,
-                "min_height": 23,
-                "max_height": 27,
-            },
-            {
-                "name": "German Shorthaired Pointer",
-                "size": "Medium",
-                "exercise_needs": 120,
-                "grooming_requirements": 7,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 42,
-                "max_weight": 79,
-                "min_height": 21,
-                "max_height": 25,
-            },
-            {
-                "name": "Dachshund",
-                "size": "Small",
-                "exercise_needs": 60,
-                "grooming_requirements": 7,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 12,
-                "min_weight": 5,
-                "max_weight": 32,
-                "min_height": 5,
-                "max_height": 11,
-            },
-            {
-                "name": "Boxer",
-                "size": "Large",
-                "exercise_needs": 120,
-                "grooming_requirements": 7,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 49,
-                "max_weight": 77,
-                "min_height": 21,
-                "max_height": 25,
-            },
-            {
-                "name": "Siberian Husky",
-                "size": "Medium",
-                "exercise_needs": 120,
-                "grooming_requirements": 4,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 34,
-                "max_weight": 67,
-                "min_height": 21,
-                "max_height": 23,
-            },
-            {
-                "name": "Cavalier King Charles Spaniel",
-                "size": "Small",
-                "exercise_needs": 60,
-                "grooming_requirements": 4,
-                "coat_length": "Medium",
-                "sheds": True,
-                "lifespan": 12,
-                "min_weight": 11,
-                "max_weight": 23,
-                "min_height": 12,
-                "max_height": 13,
-            },
-            {
-                "name": "Doberman Pinscher",
-                "size": "Medium",
-                "exercise_needs": 60,
-                "grooming_requirements": 7,
-                "coat_length": "Short",
-                "sheds": True,
-                "lifespan": 10,
-                "min_weight": 60,
-                "max_weight": 117,
-                "min_height": 24,
-                "max_height": 28,
-            },
-        ]
-        for breed in breeds:
-            Breed.objects.create(**breed)
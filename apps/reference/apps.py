@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+class ReferenceConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.reference"
+
+    def ready(self):
+        from apps.reference.seeding import seed_after_migrate
+
+        post_migrate.connect(seed_after_migrate, sender=self)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reference.seeding import DATA_SETS, seed_reference_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed breeds, symptoms, reminder types and symptom alert rules from "
+        "apps/reference/data. "
+        "Data sets whose file hash matches the last seed are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names",
+            nargs="*",
+            help=f"Data sets to seed (default: all of {', '.join(DATA_SETS)}).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Seed even if the data files have not changed.",
+        )
+
+    def handle(self, *args, names=None, force=False, **options):
+        unknown = set(names) - set(DATA_SETS)
+        if unknown:
+            raise CommandError(f"Unknown data sets: {', '.join(sorted(unknown))}.")
+
+        seeded = seed_reference_data(names or None, force=force)
+        if seeded:
+            self.stdout.write(self.style.SUCCESS(f"Seeded {', '.join(seeded)}."))
+        else:
+            self.stdout.write("Reference data is up to date.")
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ReferenceDataSeed",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Data set name", max_length=50, unique=True
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA-256 of the data file", max_length=64
+                    ),
+                ),
+                ("seeded_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Reference data seed",
+                "verbose_name_plural": "Reference data seeds",
+            },
+        ),
+    ]
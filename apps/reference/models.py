@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class ReferenceDataSeed(models.Model):
+    """Hash of the data file a reference data set was last seeded from"""
+
+    name = models.CharField(max_length=50, unique=True, help_text="Data set name")
+    content_hash = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of the data file",
+    )
+    seeded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Reference data seed"
+        verbose_name_plural = "Reference data seeds"
+
+    def __str__(self):
+        return self.name
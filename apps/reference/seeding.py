@@ -0,0 +1,204 @@
+"""Seeding of the reference tables from the JSON files in `data/`.
+
+Every table of a data set is written with one `INSERT ... ON CONFLICT DO
+UPDATE` statement, keyed on the unique `name`. A data set is skipped
+altogether while the SHA-256 of its file matches the hash stored in
+`ReferenceDataSeed`, so a `migrate` with unchanged data costs one query.
+"""
+
+import hashlib
+import json
+import uuid
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+# Serializes concurrent seeding, e.g. several containers running `migrate`.
+SEED_LOCK_ID = 0x5EED
+
+
+def seed_breeds(data, using):
+    from apps.pets.models import Breed
+    from apps.walks.goals import invalidate_breed_exercise_needs
+
+    _upsert(Breed, data, using)
+    invalidate_breed_exercise_needs()
+
+
+def seed_symptoms(data, using):
+    from apps.health import bitsets, reference
+    from apps.health.models import Symptom, SymptomCategory
+
+    category_ids = _upsert(SymptomCategory, [{"name": name} for name in data], using)
+
+    bits = dict(Symptom.objects.using(using).order_by().values_list("name", "bit"))
+    used = {bit for bit in bits.values() if bit is not None}
+    free = (bit for bit in range(bitsets.MASK_BITS) if bit not in used)
+    rows = {}
+    for category, names in data.items():
+        for name in names:
+            # A name listed under several categories stays in the first one.
+            if name in rows:
+                continue
+            bit = bits.get(name)
+            if bit is None:
+                bit = next(free, None)
+                if bit is None:
+                    raise ValidationError("No free symptom bit left.")
+            rows[name] = {
+                "name": name,
+                "category_id": category_ids[category],
+                "bit": bit,
+            }
+    _upsert(Symptom, list(rows.values()), using)
+    # Bulk writes send no post_save, so the cached reference data is dropped here.
+    reference.bump_version()
+
+
+def seed_reminder_types(data, using):
+    from apps.reminders.models import ReminderCategory, ReminderType
+
+    category_ids = _upsert(ReminderCategory, [{"name": name} for name in data], using)
+    rows = {}
+    for category, names in data.items():
+        for name in names:
+            rows.setdefault(
+                name,
+                {"name": name, "category_id": category_ids[category]},
+            )
+    _upsert(ReminderType, list(rows.values()), using)
+
+
+def seed_symptom_alert_rules(data, using):
+    from apps.health.models import Symptom, SymptomAlertRule
+
+    symptom_ids = dict(
+        Symptom.objects.using(using).order_by().values_list("name", "id")
+    )
+    unknown = sorted({rule["symptom"] for rule in data} - set(symptom_ids))
+    if unknown:
+        raise ValidationError(f"Unknown symptoms in alert rules: {unknown}")
+    rows = [
+        {
+            "name": rule["name"],
+            "symptom_id": symptom_ids[rule["symptom"]],
+            "min_days": rule["min_days"],
+            "window_days": rule["window_days"],
+        }
+        for rule in data
+    ]
+    _upsert(SymptomAlertRule, rows, using)
+
+
+# Ordered: alert rules refer to symptoms by name.
+DATA_SETS = {
+    "breeds": seed_breeds,
+    "symptoms": seed_symptoms,
+    "reminder_types": seed_reminder_types,
+    "symptom_alert_rules": seed_symptom_alert_rules,
+}
+
+
+def seed_reference_data(names=None, force=False, using=DEFAULT_DB_ALIAS):
+    """Seed the data sets `names` (all by default) whose files have changed.
+
+    Returns the names of the data sets that were written.
+    """
+    from apps.reference.models import ReferenceDataSeed
+
+    names = list(DATA_SETS if names is None else names)
+    contents = {name: (DATA_DIR / f"{name}.json").read_bytes() for name in names}
+    hashes = {
+        name: hashlib.sha256(content).hexdigest() for name, content in contents.items()
+    }
+
+    seeds = ReferenceDataSeed.objects.using(using)
+    stored = dict(seeds.filter(name__in=names).values_list("name", "content_hash"))
+    stale = [name for name in names if force or stored.get(name) != hashes[name]]
+    if not stale:
+        return []
+
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [SEED_LOCK_ID])
+        for name in stale:
+            DATA_SETS[name](json.loads(contents[name]), using)
+        seeds.bulk_create(
+            [ReferenceDataSeed(name=name, content_hash=hashes[name]) for name in stale],
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["content_hash", "seeded_at"],
+        )
+    return stale
+
+
+def seed_after_migrate(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """`post_migrate` receiver: seed once the reference tables exist."""
+    from django.apps import apps
+
+    tables = {
+        apps.get_model(label)._meta.db_table
+        for label in (
+            "reference.ReferenceDataSeed",
+            "pets.Breed",
+            "health.Symptom",
+            "health.SymptomCategory",
+            "reminders.ReminderCategory",
+            "reminders.ReminderType",
+            "health.SymptomAlertRule",
+        )
+    }
+    if not tables <= set(connections[using].introspection.table_names()):
+        return
+    seed_reference_data(using=using)
+
+
+def _upsert(model, rows, using):
+    """Insert or update `rows` (dicts of field values) by `name` in one statement.
+
+    Fields missing from the rows get their defaults on insert and are left
+    alone on update. Returns `{name: pk}` for every row.
+    """
+    if not rows:
+        return {}
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    opts = model._meta
+    objs = [model(**row) for row in rows]
+    fields = [field for field in opts.concrete_fields if not field.primary_key]
+    for obj in objs:
+        obj.pk = uuid.uuid4()
+
+    columns = [opts.pk, *fields]
+    arrays = [
+        [
+            column.get_db_prep_save(column.pre_save(obj, True), connection)
+            for obj in objs
+        ]
+        for column in columns
+    ]
+    given = set().union(*rows)
+    updates = [
+        field.column
+        for field in fields
+        if field.name != "name" and (field.name in given or field.attname in given)
+    ] or ["name"]
+
+    column_list = ", ".join(quote(column.column) for column in columns)
+    array_list = ", ".join(f"%s::{column.db_type(connection)}[]" for column in columns)
+    assignments = ", ".join(
+        f"{quote(column)} = EXCLUDED.{quote(column)}" for column in updates
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {quote(opts.db_table)} ({column_list})
+            SELECT * FROM unnest({array_list})
+            ON CONFLICT (name) DO UPDATE SET {assignments}
+            RETURNING name, {quote(opts.pk.column)}
+            """,
+            arrays,
+        )
+        return dict(cursor.fetchall())
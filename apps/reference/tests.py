@@ -0,0 +1,94 @@
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.health.models import Symptom, SymptomAlertRule
+from apps.pets.models import Breed
+from apps.reference import seeding
+from apps.reference.models import ReferenceDataSeed
+from apps.reminders.models import ReminderType
+
+
+def read_data(name, data_dir=seeding.DATA_DIR):
+    return json.loads((data_dir / f"{name}.json").read_text())
+
+
+class SeedReferenceDataTests(TestCase):
+    def setUp(self):
+        # Forget the seed done by `migrate`, so every test starts stale.
+        ReferenceDataSeed.objects.all().delete()
+
+    def test_seeds_every_data_set_then_skips(self):
+        self.assertEqual(seeding.seed_reference_data(), list(seeding.DATA_SETS))
+
+        breeds = {breed["name"] for breed in read_data("breeds")}
+        self.assertLessEqual(breeds, set(Breed.objects.values_list("name", flat=True)))
+        symptoms = {name for names in read_data("symptoms").values() for name in names}
+        self.assertLessEqual(
+            symptoms, set(Symptom.objects.values_list("name", flat=True))
+        )
+        types = {
+            name for names in read_data("reminder_types").values() for name in names
+        }
+        self.assertLessEqual(
+            types, set(ReminderType.objects.values_list("name", flat=True))
+        )
+        self.assertEqual(
+            SymptomAlertRule.objects.filter(
+                name__in=[rule["name"] for rule in read_data("symptom_alert_rules")]
+            ).count(),
+            len(read_data("symptom_alert_rules")),
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(seeding.seed_reference_data(), [])
+
+    def test_reseeding_keeps_ids_and_symptom_bits(self):
+        seeding.seed_reference_data()
+        symptoms = set(Symptom.objects.values_list("id", "name", "bit"))
+        breeds = set(Breed.objects.values_list("id", "name"))
+
+        self.assertEqual(
+            seeding.seed_reference_data(force=True), list(seeding.DATA_SETS)
+        )
+        self.assertEqual(
+            set(Symptom.objects.values_list("id", "name", "bit")), symptoms
+        )
+        self.assertEqual(set(Breed.objects.values_list("id", "name")), breeds)
+
+    def test_changed_file_is_upserted(self):
+        seeding.seed_reference_data()
+        with tempfile.TemporaryDirectory() as data_dir:
+            data_dir = Path(data_dir)
+            shutil.copytree(seeding.DATA_DIR, data_dir, dirs_exist_ok=True)
+            breeds = read_data("breeds", data_dir)
+            breeds[0]["exercise_needs"] += 15
+            breeds.append({**breeds[0], "name": "Test seeded breed"})
+            (data_dir / "breeds.json").write_text(json.dumps(breeds))
+
+            with mock.patch.object(seeding, "DATA_DIR", data_dir):
+                self.assertEqual(seeding.seed_reference_data(), ["breeds"])
+
+        self.assertEqual(
+            Breed.objects.get(name=breeds[0]["name"]).exercise_needs,
+            breeds[0]["exercise_needs"],
+        )
+        self.assertTrue(Breed.objects.filter(name="Test seeded breed").exists())
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command("seed_reference_data", "breeds", stdout=out)
+        self.assertIn("Seeded breeds.", out.getvalue())
+
+        out = io.StringIO()
+        call_command("seed_reference_data", "breeds", stdout=out)
+        self.assertIn("up to date", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("seed_reference_data", "cats")
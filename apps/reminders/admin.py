@@ -2,6 +2,7 @@ from django.contrib import admin
 
 from .models import Reminder, ReminderCategory, ReminderType
 
+
 class ReminderTypeInline(admin.TabularInline):
     model = ReminderType
     extra = 1 
@@ -32,6 +33,7 @@ class ReminderAdmin(admin.ModelAdmin):
         "reminder_type",
         "reminder_time",
         "is_recurring",
+        "next_fire_at",
     )
     search_fields = ("title", "owner__username", "reminder_type__name")
     list_filter = ("is_recurring", "reminder_type", "owner")
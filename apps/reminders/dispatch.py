@@ -0,0 +1,150 @@
+"""Firing of due reminders.
+
+Every dispatcher claims a batch of due reminders and advances them in one
+statement: the due rows are selected `FOR UPDATE SKIP LOCKED` through the
+partial `next_fire_at` index, and the same statement moves recurring
+reminders to their first occurrence after now and clears `next_fire_at` of
+one-off ones. Reminders with an `rrule` are advanced in Python within the
+same transaction. Concurrent dispatchers on any number of workers therefore
+claim disjoint batches, and a claimed reminder is no longer due once the
+batch commits. Delivery is queued only after the commit, in chunks spread
+over the workers, so a reminder is fired at most once per occurrence.
+Occurrences missed while nothing was dispatching are collapsed into one.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.reminders import recurrence
+from apps.reminders.models import Reminder
+from utils.datetime_utils import user_timezone
+
+BATCH_SIZE = 1000
+DELIVERY_CHUNK_SIZE = 200
+# A run stops claiming after this long; the next beat tick takes over.
+TIME_BUDGET_SECONDS = 50
+
+
+def dispatch_due_reminders(batch_size=BATCH_SIZE, time_budget=TIME_BUDGET_SECONDS):
+    """Claim and fire every due reminder; return the number of reminders fired."""
+    deadline = time.monotonic() + time_budget
+    fired = 0
+    while True:
+        claimed = claim_due_reminders(batch_size)
+        fired += len(claimed)
+        if len(claimed) < batch_size or time.monotonic() >= deadline:
+            return fired
+
+
+def claim_due_reminders(batch_size=BATCH_SIZE, now=None):
+    """Claim up to `batch_size` due reminders and queue their delivery.
+
+    Returns `[(reminder_id, fired_at, has_rule), ...]`.
+    """
+    from apps.reminders.tasks import deliver_reminders
+
+    now = now or timezone.now()
+    table = connection.ops.quote_name(Reminder._meta.db_table)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH due AS (
+                    SELECT id, next_fire_at
+                    FROM {table}
+                    WHERE next_fire_at <= %(now)s
+                    ORDER BY next_fire_at
+                    LIMIT %(batch_size)s
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE {table} AS reminder
+                SET next_fire_at = CASE
+                    WHEN reminder.rrule <> '' THEN due.next_fire_at
+                    WHEN reminder.is_recurring AND reminder.frequency_in_minutes > 0
+                    THEN due.next_fire_at + make_interval(
+                        mins => reminder.frequency_in_minutes * (
+                            floor(
+                                extract(epoch FROM %(now)s - due.next_fire_at)
+                                / 60
+                                / reminder.frequency_in_minutes
+                            )::integer + 1
+                        )
+                    )
+                END
+                FROM due
+                WHERE reminder.id = due.id
+                RETURNING reminder.id, due.next_fire_at, reminder.rrule <> ''
+                """,
+                {"now": now, "batch_size": batch_size},
+            )
+            claimed = cursor.fetchall()
+        _advance_rules(
+            [reminder_id for reminder_id, _, has_rule in claimed if has_rule],
+            now,
+        )
+
+        for start in range(0, len(claimed), DELIVERY_CHUNK_SIZE):
+            chunk = [
+                (str(reminder_id), fired_at.isoformat())
+                for reminder_id, fired_at, _ in claimed[
+                    start : start + DELIVERY_CHUNK_SIZE
+                ]
+            ]
+            transaction.on_commit(lambda chunk=chunk: deliver_reminders.delay(chunk))
+    return claimed
+
+
+def _advance_rules(reminder_ids, now):
+    """Move claimed `rrule` reminders to their next occurrence after `now`.
+
+    Rules can't be evaluated in SQL, so the claiming statement leaves these
+    rows due and they are advanced here, still under the row locks.
+    """
+    if not reminder_ids:
+        return
+    reminders = list(
+        Reminder.objects.filter(id__in=reminder_ids).select_related("owner__profile")
+    )
+    for reminder in reminders:
+        reminder.next_fire_at = recurrence.next_occurrence(
+            reminder.rrule,
+            reminder.reminder_time,
+            now,
+            user_timezone(reminder.owner),
+        )
+    Reminder.objects.bulk_update(reminders, ["next_fire_at"])
+
+
+def deliver(fired):
+    """Email the owners of `[(reminder_id, fired_at_iso), ...]`; return the number sent."""
+    fired_at = dict(fired)
+    reminders = (
+        Reminder.objects.filter(id__in=list(fired_at))
+        .select_related("owner")
+        .prefetch_related("pets")
+    )
+    messages = []
+    for reminder in reminders:
+        if not reminder.owner.email:
+            continue
+        pets = ", ".join(pet.name for pet in reminder.pets.all() if pet.name)
+        lines = [reminder.title]
+        if pets:
+            lines.append(f"Pets: {pets}")
+        if reminder.description:
+            lines.append(reminder.description)
+        lines.append(f"Scheduled for {fired_at[str(reminder.id)]}")
+        messages.append(
+            (
+                f"Reminder: {reminder.title}",
+                "\n\n".join(lines),
+                settings.DEFAULT_FROM_EMAIL,
+                [reminder.owner.email],
+            ),
+        )
+    # One SMTP connection for the whole chunk.
+    return send_mass_mail(messages, fail_silently=False) if messages else 0
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pets", "0002_initial"),
+        ("reminders", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reminder",
+            name="next_fire_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When the reminder fires next; empty once a one-off reminder fired",
+                null=True,
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE reminders_reminder
+            SET next_fire_at = CASE
+                WHEN reminder_time >= now() THEN reminder_time
+                WHEN is_recurring AND frequency_in_minutes > 0
+                THEN reminder_time + make_interval(
+                    mins => frequency_in_minutes * ceil(
+                        extract(epoch FROM now() - reminder_time)
+                        / 60
+                        / frequency_in_minutes
+                    )::integer
+                )
+            END
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="reminder",
+            index=models.Index(
+                condition=models.Q(("next_fire_at__isnull", False)),
+                fields=["next_fire_at"],
+                name="reminder_next_fire_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+import apps.reminders.recurrence
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reminders", "0003_reminder_next_fire_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reminder",
+            name="rrule",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="RFC 5545 recurrence rule, e.g. FREQ=MONTHLY;BYMONTHDAY=1; takes precedence over frequency_in_minutes",
+                max_length=500,
+                validators=[apps.reminders.recurrence.validate_rule],
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 11:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pets", "0002_initial"),
+        ("reminders", "0005_reminder_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reminder",
+            index=models.Index(
+                fields=["owner", "-reminder_time", "-id"],
+                name="reminder_owner_time_idx",
+            ),
+        ),
+    ]
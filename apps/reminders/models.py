@@ -1,11 +1,24 @@
+import datetime
 import uuid
 
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
-from django.db.models.signals import post_migrate
+from django.db.models.functions import Upper
+from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from apps.pets.models import Pet
+from apps.reminders import recurrence
+from apps.users.models import UserProfile
+from utils.datetime_utils import user_timezone
+
+# Handles Russian words and falls back to English stemming for Latin ones.
+SEARCH_CONFIG = "russian"
+# Changing any of these moves `Reminder.next_fire_at`.
+SCHEDULE_FIELDS = {"reminder_time", "is_recurring", "frequency_in_minutes", "rrule"}
 
 User = get_user_model()
 
@@ -81,6 +94,16 @@ class Reminder(models.Model):
         blank=True,
         help_text="Frequency of recurring reminder in minutes",
     )
+    rrule = models.CharField(
+        max_length=500,
+        blank=True,
+        default="",
+        validators=[recurrence.validate_rule],
+        help_text=(
+            "RFC 5545 recurrence rule, e.g. FREQ=MONTHLY;BYMONTHDAY=1; "
+            "takes precedence over frequency_in_minutes"
+        ),
+    )
     pets = models.ManyToManyField(
         Pet,
         related_name="reminders",
@@ -93,52 +116,122 @@ class Reminder(models.Model):
         related_name="reminders",
         help_text="Owner of the reminder",
     )
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Full-text search document over title and description",
+    )
+    next_fire_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the reminder fires next; empty once a one-off reminder fired",
+    )
 
     class Meta:
         ordering = ["-reminder_time"]
         verbose_name = "Reminder"
         verbose_name_plural = "Reminders"
+        indexes = [
+            # A user's reminders in list order; also serves keyset pagination.
+            models.Index(
+                fields=["owner", "-reminder_time", "-id"],
+                name="reminder_owner_time_idx",
+            ),
+            # Due reminders are claimed by the dispatcher in this order.
+            models.Index(
+                fields=["next_fire_at"],
+                condition=models.Q(next_fire_at__isnull=False),
+                name="reminder_next_fire_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="reminder_search_idx"),
+            # Substring (`icontains`) matches for words full-text search can't
+            # match yet, such as a half-typed prefix.
+            GinIndex(
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name="reminder_title_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("description"), name="gin_trgm_ops"),
+                name="reminder_description_trgm_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
-
-@receiver(post_migrate)
-def create_default_reminder_types(sender, **kwargs) -> None:
-    from django.db.utils import IntegrityError
-
-    if sender.name == "apps.reminders":
-        categories = {
-            "Wellness": [
-                "Wellness Exams",
-                "Preventive Care",
-                "Grooming",
-                "Boarding",
-            ],
-            "Appointments": [
-                "Consultation",
-            ],
-            "Medicine": [
-                "Vaccination",
-                "Dental Service",
-                "Spraying/Neutering",
-                "Diagnostic Tests",
-                "X-ray and Imaging",
-                "Surgery",
-                "Emergency Care",
-                "Microchipping",
-            ],
-        }
-
-        for category_name, types in categories.items():
-            category, created = ReminderCategory.objects.get_or_create(
-                name=category_name,
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if SCHEDULE_FIELDS <= set(field_names):
+            instance._loaded_schedule = instance.schedule
+        return instance
+
+    @property
+    def schedule(self):
+        return (
+            self.reminder_time,
+            self.is_recurring,
+            self.frequency_in_minutes,
+            self.rrule,
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        schedule_saved = update_fields is None or SCHEDULE_FIELDS & set(update_fields)
+        if schedule_saved and self.schedule != getattr(self, "_loaded_schedule", None):
+            self.next_fire_at = self.compute_next_fire_at()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "next_fire_at"}
+        elif update_fields is None and not self._state.adding:
+            # The dispatcher advances next_fire_at under its row lock, so the
+            # copy loaded here may be stale; leave it to the dispatcher.
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and not field.generated
+                and field.attname not in deferred
+                and field.name != "next_fire_at"
+            ]
+        super().save(*args, **kwargs)
+        if schedule_saved:
+            self._loaded_schedule = self.schedule
+
+    def compute_next_fire_at(self, now=None) -> datetime.datetime | None:
+        """First occurrence at or after `now`, or None if there is none left."""
+        now = now or timezone.now()
+        if self.rrule:
+            # `after` is exclusive; an occurrence right at `now` still counts.
+            return recurrence.next_occurrence(
+                self.rrule,
+                self.reminder_time,
+                now - datetime.timedelta(microseconds=1),
+                user_timezone(self.owner),
             )
-            for type_name in types:
-                try:
-                    ReminderType.objects.get_or_create(
-                        name=type_name,
-                        category=category,
-                    )
-                except IntegrityError:
-                    pass
+        if self.reminder_time >= now:
+            return self.reminder_time
+        if self.is_recurring and self.frequency_in_minutes:
+            step = datetime.timedelta(minutes=self.frequency_in_minutes)
+            return self.reminder_time + step * -((self.reminder_time - now) // step)
+        return None
+
+
+@receiver(post_save, sender=UserProfile)
+def reschedule_rules_on_timezone_change(sender, instance, **kwargs):
+    # Rules repeat in the owner's local time, so the next occurrence moves.
+    # Reminders that are already due keep their slot until they are fired.
+    if not instance.timezone_changed:
+        return
+    now = timezone.now()
+    reminders = list(
+        Reminder.objects.filter(owner_id=instance.user_id, next_fire_at__gt=now)
+        .exclude(rrule="")
+        .select_related("owner__profile"),
+    )
+    for reminder in reminders:
+        reminder.next_fire_at = reminder.compute_next_fire_at(now)
+    Reminder.objects.bulk_update(reminders, ["next_fire_at"])
@@ -0,0 +1,67 @@
+"""Expansion of reminders into their occurrences within a time window.
+
+A recurring reminder fires at `reminder_time + k * frequency_in_minutes`
+for every k >= 0. The first occurrence inside a window and the number of
+occurrences in it follow from integer division, so expanding a reminder
+costs one step per occurrence *inside* the window, however long ago the
+reminder started. The per-reminder sequences are already sorted and are
+merged lazily with `heapq.merge`. Reminders with an `rrule` are expanded
+by their (cached) rule instead.
+"""
+
+import datetime
+import heapq
+import operator
+
+from django.db.models import Q
+
+from apps.reminders import recurrence
+from apps.reminders.models import Reminder
+
+
+def reminders_in_window(queryset, start, end):
+    """Narrow `queryset` to the reminders that may occur in `[start, end)`."""
+    return queryset.filter(reminder_time__lt=end).filter(
+        Q(reminder_time__gte=start)
+        | Q(is_recurring=True, frequency_in_minutes__gt=0)
+        | ~Q(rrule=""),
+    )
+
+
+def expand(reminder: Reminder, start, end, zone=None):
+    """Yield the occurrence times of `reminder` in `[start, end)` in order.
+
+    `zone` is the owner's timezone, in which `rrule` rules are evaluated.
+    """
+    first = reminder.reminder_time
+    if first >= end:
+        return
+    if reminder.rrule:
+        yield from recurrence.occurrences_between(
+            reminder.rrule, first, start, end, zone
+        )
+        return
+    if not (reminder.is_recurring and reminder.frequency_in_minutes):
+        if first >= start:
+            yield first
+        return
+
+    step = datetime.timedelta(minutes=reminder.frequency_in_minutes)
+    if first < start:
+        # Ceiling division: the first occurrence at or after `start`.
+        first += step * -((first - start) // step)
+    for index in range(-((first - end) // step)):
+        yield first + step * index
+
+
+def occurrences(reminders, start, end, zone=None):
+    """Yield `(occurs_at, reminder)` for all `reminders` in `[start, end)` in time order."""
+    return heapq.merge(
+        *(_tagged(reminder, start, end, zone) for reminder in reminders),
+        key=operator.itemgetter(0),
+    )
+
+
+def _tagged(reminder, start, end, zone):
+    for occurs_at in expand(reminder, start, end, zone):
+        yield occurs_at, reminder
@@ -0,0 +1,137 @@
+"""RFC 5545 recurrence rules (`Reminder.rrule`).
+
+Rule strings are parsed once per process into `dateutil.rrule` objects kept
+in a bounded LRU cache keyed by the string, so the thousands of reminders
+sharing "every Monday" parse it once. A parsed rule is bound to a reminder
+by replacing its start with the reminder's `reminder_time`.
+
+dateutil walks a rule forward from its start, so a rule with a fixed-length
+period (MINUTELY to WEEKLY) is bound to the last whole stride at or before
+the queried time instead, the way `occurrences.expand` handles
+`frequency_in_minutes`. Shifting the start by whole strides keeps every
+later occurrence, so the cost no longer grows with the reminder's age.
+Sub-daily rules with BY* parts can't always be shifted that way and are
+rejected.
+
+Rules are evaluated in the owner's wall-clock time: "every day at 09:00"
+stays at 09:00 local across DST changes. Occurrences are returned as
+aware datetimes.
+"""
+
+import datetime
+import functools
+from typing import NamedTuple
+
+import pytz
+from dateutil import rrule
+from django.core.exceptions import ValidationError
+
+RULE_CACHE_SIZE = 1024
+# Placeholder start of cached rules; every use replaces it.
+_PARSE_START = datetime.datetime(2000, 1, 1)
+FIXED_PERIODS = {
+    rrule.MINUTELY: datetime.timedelta(minutes=1),
+    rrule.HOURLY: datetime.timedelta(hours=1),
+    rrule.DAILY: datetime.timedelta(days=1),
+    rrule.WEEKLY: datetime.timedelta(weeks=1),
+}
+SUB_DAILY = {rrule.MINUTELY, rrule.HOURLY}
+
+
+class CompiledRule(NamedTuple):
+    rule: rrule.rrule
+    # INTERVAL periods of a fixed-length FREQ, or None for MONTHLY/YEARLY.
+    stride: datetime.timedelta | None
+    # Whether the rule has BY* parts, i.e. may fire more than once a period.
+    has_by_parts: bool
+
+
+@functools.lru_cache(maxsize=RULE_CACHE_SIZE)
+def parse_rule(rule: str) -> CompiledRule:
+    """Parse an `RRULE` value such as `FREQ=WEEKLY;BYDAY=MO,TH`.
+
+    :raises ValueError: If the rule is not a valid recurrence rule we support.
+    :raises TypeError: If the value is not a single recurrence rule.
+    """
+    upper = rule.upper()
+    if "DTSTART" in upper:
+        raise ValueError("DTSTART is taken from the reminder time.")
+    # An UTC `UNTIL` ("...Z") only parses against an aware start.
+    start = _PARSE_START
+    if "Z" in upper.partition("UNTIL=")[2].split(";")[0]:
+        start = pytz.UTC.localize(start)
+    parsed = rrule.rrulestr(rule, dtstart=start, forceset=False)
+    if not isinstance(parsed, rrule.rrule):
+        raise TypeError("Only a single RRULE is supported.")
+    if parsed._freq == rrule.SECONDLY:
+        raise ValueError("FREQ=SECONDLY is not supported.")
+
+    names = {part.partition("=")[0].strip() for part in upper.split(":")[-1].split(";")}
+    has_by_parts = any(name.startswith("BY") for name in names)
+    if parsed._freq in SUB_DAILY and has_by_parts:
+        raise ValueError("MINUTELY and HOURLY rules can't have BY* parts.")
+    period = FIXED_PERIODS.get(parsed._freq)
+    stride = period * parsed._interval if period else None
+    return CompiledRule(parsed, stride, has_by_parts)
+
+
+def validate_rule(rule: str):
+    try:
+        parse_rule(rule)
+    except (ValueError, TypeError) as error:
+        raise ValidationError(f"Invalid recurrence rule: {error}", code="invalid")
+
+
+def occurrences_between(rule, reminder_time, start, end, zone=None):
+    """Occurrences of `rule` starting at `reminder_time` in `[start, end)`."""
+    zone = zone or pytz.UTC
+    local_start = _local(start, zone)
+    bound = _bind(rule, reminder_time, zone, local_start)
+    if bound is None:
+        return
+    for occurrence in bound.xafter(local_start, inc=True):
+        occurrence = zone.localize(occurrence)
+        if occurrence >= end:
+            return
+        yield occurrence
+
+
+def next_occurrence(rule, reminder_time, now, zone=None):
+    """First occurrence of `rule` after `now`, or None if the rule has ended."""
+    zone = zone or pytz.UTC
+    local_now = _local(now, zone)
+    bound = _bind(rule, reminder_time, zone, local_now)
+    occurrence = bound.after(local_now) if bound is not None else None
+    return zone.localize(occurrence) if occurrence else None
+
+
+def _bind(rule, reminder_time, zone, since):
+    """Bind `rule` to `reminder_time`, starting as late as possible before `since`.
+
+    Returns None when a COUNT-limited rule has no occurrences left.
+    """
+    compiled = parse_rule(rule)
+    parsed = compiled.rule
+    until = parsed._until
+    if until is not None and until.tzinfo is not None:
+        until = _local(until, zone)
+
+    dtstart = _local(reminder_time, zone)
+    count = parsed._count
+    if compiled.stride and since > dtstart:
+        strides = (since - dtstart) // compiled.stride
+        if count is not None:
+            if compiled.has_by_parts:
+                # Occurrences per period vary, so the skipped ones can't be
+                # counted; COUNT keeps this walk bounded anyway.
+                strides = 0
+            else:
+                count -= strides
+                if count <= 0:
+                    return None
+        dtstart += compiled.stride * strides
+    return parsed.replace(dtstart=dtstart, until=until, count=count)
+
+
+def _local(value, zone):
+    return value.astimezone(zone).replace(tzinfo=None)
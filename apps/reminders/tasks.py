@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from apps.reminders import dispatch
+
+
+@shared_task
+def dispatch_reminders():
+    """Fire the reminders that are due; safe to run on several workers at once."""
+    return dispatch.dispatch_due_reminders()
+
+
+@shared_task(autoretry_for=(OSError,), retry_backoff=True, max_retries=3)
+def deliver_reminders(fired):
+    """Send one chunk of fired reminders, `[(reminder_id, fired_at_iso), ...]`."""
+    return dispatch.deliver(fired)
@@ -0,0 +1,425 @@
+import datetime
+import json
+from unittest import mock
+
+import pytz
+from dateutil import rrule
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.api.v1.reminders.filters import ReminderFilter
+from apps.reminders import dispatch, recurrence
+from apps.reminders.models import Reminder
+from apps.reminders.occurrences import expand, occurrences
+
+User = get_user_model()
+
+BERLIN = pytz.timezone("Europe/Berlin")
+START = datetime.datetime(2026, 3, 2, 9, 0, tzinfo=datetime.UTC)
+NOW = datetime.datetime(2026, 10, 18, 12, 0, tzinfo=datetime.UTC)
+
+
+def hours(count):
+    return datetime.timedelta(hours=count)
+
+
+class ReminderTestCase(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="password")
+
+    def reminder(self, **fields):
+        return Reminder.objects.create(
+            owner=self.owner, title="Walk", reminder_time=START, **fields
+        )
+
+
+class NextFireAtTests(ReminderTestCase):
+    def test_one_off(self):
+        reminder = self.reminder()
+        self.assertEqual(reminder.compute_next_fire_at(START - hours(1)), START)
+        self.assertEqual(reminder.compute_next_fire_at(START), START)
+        self.assertIsNone(reminder.compute_next_fire_at(START + hours(1)))
+
+    def test_interval(self):
+        reminder = self.reminder(is_recurring=True, frequency_in_minutes=90)
+        self.assertEqual(reminder.compute_next_fire_at(START), START)
+        self.assertEqual(
+            reminder.compute_next_fire_at(START + hours(2)), START + hours(3)
+        )
+        self.assertEqual(
+            reminder.compute_next_fire_at(START + hours(3)), START + hours(3)
+        )
+
+    def test_rrule_keeps_local_time_across_dst(self):
+        self.owner.profile.timezone = "Europe/Berlin"
+        self.owner.profile.save()
+        reminder = self.reminder(rrule="FREQ=DAILY")
+
+        # 10:00 in Berlin is 09:00 UTC in winter and 08:00 UTC in summer.
+        next_fire_at = reminder.compute_next_fire_at(NOW)
+        self.assertEqual(
+            next_fire_at, datetime.datetime(2026, 10, 19, 8, 0, tzinfo=datetime.UTC)
+        )
+        after_dst = reminder.compute_next_fire_at(NOW + datetime.timedelta(days=14))
+        self.assertEqual(
+            after_dst, datetime.datetime(2026, 11, 2, 9, 0, tzinfo=datetime.UTC)
+        )
+
+    def test_rrule_with_count_ends(self):
+        reminder = self.reminder(rrule="FREQ=DAILY;INTERVAL=2;COUNT=3")
+        self.assertEqual(
+            reminder.compute_next_fire_at(START + hours(1)),
+            START + datetime.timedelta(days=2),
+        )
+        self.assertEqual(
+            reminder.compute_next_fire_at(START + datetime.timedelta(days=4)),
+            START + datetime.timedelta(days=4),
+        )
+        self.assertIsNone(reminder.compute_next_fire_at(NOW))
+
+    def test_schedule_change_recomputes_next_fire_at(self):
+        reminder = self.reminder(is_recurring=True, frequency_in_minutes=60)
+        self.assertIsNotNone(reminder.next_fire_at)
+
+        reminder.is_recurring = False
+        reminder.save()
+        self.assertIsNone(reminder.next_fire_at)
+
+
+class DispatchTests(ReminderTestCase):
+    def due(self, **fields):
+        reminder = self.reminder(**fields)
+        Reminder.objects.filter(pk=reminder.pk).update(next_fire_at=START)
+        return reminder
+
+    def claim(self, now):
+        with (
+            mock.patch("apps.reminders.tasks.deliver_reminders.delay") as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            claimed = dispatch.claim_due_reminders(now=now)
+        return claimed, delay
+
+    def next_fire_at(self, reminder):
+        reminder.refresh_from_db()
+        return reminder.next_fire_at
+
+    def test_claim_advances_and_queues_delivery(self):
+        one_off = self.due()
+        interval = self.due(is_recurring=True, frequency_in_minutes=60)
+        later = self.reminder()
+        Reminder.objects.filter(pk=later.pk).update(next_fire_at=START + hours(5))
+
+        claimed, delay = self.claim(START + datetime.timedelta(minutes=150))
+        self.assertEqual(
+            {(reminder_id, fired_at) for reminder_id, fired_at, _ in claimed},
+            {(one_off.pk, START), (interval.pk, START)},
+        )
+        delay.assert_called_once()
+        self.assertEqual(
+            {reminder_id for reminder_id, _ in delay.call_args.args[0]},
+            {str(one_off.pk), str(interval.pk)},
+        )
+
+        self.assertIsNone(self.next_fire_at(one_off))
+        # Missed occurrences collapse into one; the next is after now.
+        self.assertEqual(self.next_fire_at(interval), START + hours(3))
+        self.assertEqual(self.next_fire_at(later), START + hours(5))
+
+        claimed, delay = self.claim(START + datetime.timedelta(minutes=150))
+        self.assertEqual(claimed, [])
+        delay.assert_not_called()
+
+    def test_claim_advances_rules_to_their_next_occurrence(self):
+        rule = self.due(rrule="FREQ=WEEKLY;BYDAY=MO,TH")
+        # START is a Monday; the next occurrence is Thursday at the same time.
+        self.claim(START + hours(1))
+        self.assertEqual(self.next_fire_at(rule), START + datetime.timedelta(days=3))
+
+    def test_batches_are_claimed_in_order(self):
+        first = self.due()
+        second = self.reminder()
+        Reminder.objects.filter(pk=second.pk).update(next_fire_at=START + hours(1))
+
+        with mock.patch("apps.reminders.tasks.deliver_reminders.delay"):
+            claimed = dispatch.claim_due_reminders(batch_size=1, now=START + hours(2))
+            self.assertEqual([row[0] for row in claimed], [first.pk])
+            claimed = dispatch.claim_due_reminders(batch_size=1, now=START + hours(2))
+            self.assertEqual([row[0] for row in claimed], [second.pk])
+
+    def test_stale_copy_does_not_write_back_next_fire_at(self):
+        reminder = self.due(is_recurring=True, frequency_in_minutes=60)
+        stale = Reminder.objects.get(pk=reminder.pk)
+        self.claim(START + datetime.timedelta(minutes=30))
+
+        stale.title = "Feed"
+        stale.save()
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.title, "Feed")
+        self.assertEqual(reminder.next_fire_at, START + hours(1))
+
+
+class OccurrenceTests(ReminderTestCase):
+    def test_interval_window(self):
+        reminder = self.reminder(is_recurring=True, frequency_in_minutes=45)
+        start = START + hours(900)
+        self.assertEqual(
+            list(expand(reminder, start, start + hours(2))),
+            [
+                start,
+                start + datetime.timedelta(minutes=45),
+                start + datetime.timedelta(minutes=90),
+            ],
+        )
+
+    def test_window_before_start_is_empty(self):
+        reminder = self.reminder(is_recurring=True, frequency_in_minutes=45)
+        self.assertEqual(list(expand(reminder, START - hours(5), START)), [])
+
+    def test_one_off_window(self):
+        reminder = self.reminder()
+        self.assertEqual(list(expand(reminder, START, START + hours(1))), [START])
+        self.assertEqual(list(expand(reminder, START + hours(1), NOW)), [])
+
+    def test_rrule_window(self):
+        reminder = self.reminder(rrule="FREQ=WEEKLY;BYDAY=MO,TH")
+        start = datetime.datetime(2026, 10, 19, tzinfo=datetime.UTC)
+        self.assertEqual(
+            list(expand(reminder, start, start + datetime.timedelta(days=7))),
+            [start + hours(9), start + datetime.timedelta(days=3) + hours(9)],
+        )
+
+    def test_rrule_matches_unbounded_expansion(self):
+        rules = [
+            "FREQ=MINUTELY;INTERVAL=7",
+            "FREQ=HOURLY;INTERVAL=5;COUNT=2000",
+            "FREQ=DAILY;INTERVAL=3;COUNT=100",
+            "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;COUNT=30",
+            "FREQ=MONTHLY;BYMONTHDAY=-1",
+        ]
+        end = NOW + datetime.timedelta(days=2)
+        for rule in rules:
+            with self.subTest(rule=rule):
+                local = START.astimezone(BERLIN).replace(tzinfo=None)
+                expected = [
+                    BERLIN.localize(occurrence)
+                    for occurrence in rrule.rrulestr(rule, dtstart=local).between(
+                        NOW.astimezone(BERLIN).replace(tzinfo=None),
+                        end.astimezone(BERLIN).replace(tzinfo=None),
+                        inc=True,
+                    )
+                ]
+                expected = [occurrence for occurrence in expected if occurrence < end]
+                self.assertEqual(
+                    list(recurrence.occurrences_between(rule, START, NOW, end, BERLIN)),
+                    expected,
+                )
+
+    def test_occurrences_are_merged_in_order(self):
+        hourly = self.reminder(is_recurring=True, frequency_in_minutes=60)
+        every_90 = self.reminder(is_recurring=True, frequency_in_minutes=90)
+        pairs = list(occurrences([hourly, every_90], START, START + hours(3)))
+        self.assertEqual(
+            [occurs_at for occurs_at, _ in pairs],
+            [START, START, START + hours(1), START + hours(1.5), START + hours(2)],
+        )
+        self.assertEqual({pairs[0][1], pairs[1][1]}, {hourly, every_90})
+
+    def get(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        return client.get(reverse("reminder-occurrences"), params)
+
+    def test_endpoint_expands_rules_in_the_profile_zone(self):
+        self.owner.profile.timezone = "Europe/Berlin"
+        self.owner.profile.save()
+        self.reminder(rrule="FREQ=DAILY")
+
+        # Europe has left summer time and the US has not: 10:00 in Berlin
+        # is 05:00 in New York, while a rule in New York's zone would give 04:00.
+        response = self.get(
+            **{
+                "from": "2026-10-26T00:00:00",
+                "to": "2026-10-28T00:00:00",
+                "timezone": "America/New_York",
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            [item["occurs_at"] for item in body],
+            ["2026-10-26T05:00:00-04:00", "2026-10-27T05:00:00-04:00"],
+        )
+
+    def test_endpoint_rejects_bad_ranges(self):
+        for params in (
+            {"from": "2026-10-19T00:00:00Z"},
+            {"from": "2026-10-19T00:00:00Z", "to": "2026-10-18T00:00:00Z"},
+            {"from": "2026-01-01T00:00:00Z", "to": "2027-01-01T00:00:00Z"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(**params).status_code, 400)
+
+
+class RuleValidationTests(TestCase):
+    def test_rejected_rules(self):
+        for rule in (
+            "FREQ=SECONDLY",
+            "FREQ=HOURLY;BYMINUTE=15",
+            "DTSTART:20260101T000000\nRRULE:FREQ=DAILY",
+            "FREQ=SOMETIMES",
+        ):
+            with self.subTest(rule=rule), self.assertRaises(ValidationError):
+                recurrence.validate_rule(rule)
+
+    def test_accepted_rules(self):
+        for rule in (
+            "FREQ=DAILY;BYHOUR=8,20",
+            "FREQ=MONTHLY;BYMONTHDAY=1",
+            "FREQ=WEEKLY;UNTIL=20270101T000000Z",
+        ):
+            with self.subTest(rule=rule):
+                recurrence.validate_rule(rule)
+
+
+class ReminderTimeFilterTests(ReminderTestCase):
+    def filter(self, **params):
+        filterset = ReminderFilter(
+            params, queryset=Reminder.objects.filter(owner=self.owner)
+        )
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        return set(filterset.qs)
+
+    def test_one_off_reminders_match_by_reminder_time(self):
+        fired = self.reminder()
+        self.assertIsNone(fired.next_fire_at)
+        self.assertEqual(self.filter(time_from="2026-03-01T00:00:00Z"), {fired})
+        self.assertEqual(self.filter(time_to="2026-03-01T00:00:00Z"), set())
+        self.assertEqual(
+            self.filter(
+                time_from="2026-03-02T00:00:00Z", time_to="2026-03-03T00:00:00Z"
+            ),
+            {fired},
+        )
+
+    def test_recurring_reminders_match_by_upcoming_occurrence(self):
+        with mock.patch("django.utils.timezone.now", return_value=NOW):
+            recurring = self.reminder(is_recurring=True, frequency_in_minutes=60)
+        self.assertEqual(recurring.next_fire_at, NOW)
+
+        self.assertEqual(
+            self.filter(time_from="2026-10-18T00:00:00Z", time_to=self.at(NOW)),
+            {recurring},
+        )
+        self.assertEqual(self.filter(time_to=self.at(NOW - hours(1))), set())
+        self.assertEqual(self.filter(time_from=self.at(NOW + hours(1))), set())
+        # The rule fired every hour in March, but those occurrences are past.
+        self.assertEqual(
+            self.filter(
+                time_from="2026-03-02T00:00:00Z", time_to="2026-03-03T00:00:00Z"
+            ),
+            set(),
+        )
+
+    def at(self, moment):
+        return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class TimezoneChangeTests(ReminderTestCase):
+    def test_rules_follow_the_new_timezone(self):
+        with mock.patch("django.utils.timezone.now", return_value=NOW):
+            rule = self.reminder(rrule="FREQ=DAILY")
+            interval = self.reminder(is_recurring=True, frequency_in_minutes=60)
+            self.assertEqual(
+                rule.next_fire_at,
+                datetime.datetime(2026, 10, 19, 9, 0, tzinfo=datetime.UTC),
+            )
+
+            self.owner.profile.timezone = "Europe/Berlin"
+            self.owner.profile.save()
+
+        # The rule keeps 10:00 Berlin time, which is 08:00 UTC in summer.
+        rule.refresh_from_db()
+        self.assertEqual(
+            rule.next_fire_at,
+            datetime.datetime(2026, 10, 19, 8, 0, tzinfo=datetime.UTC),
+        )
+        next_fire_at = interval.next_fire_at
+        interval.refresh_from_db()
+        self.assertEqual(interval.next_fire_at, next_fire_at)
+
+
+class ReminderSearchTests(ReminderTestCase):
+    def get(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        return client.get(reverse("reminder-list"), params)
+
+    def test_search_is_ranked(self):
+        walk = self.reminder(description="Evening walk in the park")
+        feed = Reminder.objects.create(
+            owner=self.owner,
+            title="Feed",
+            reminder_time=START + hours(1),
+            description="Walk to the shop for food",
+        )
+        Reminder.objects.create(owner=self.owner, title="Vet", reminder_time=START)
+
+        response = self.get(search="walk")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {reminder["id"] for reminder in response.data["results"]},
+            {str(walk.pk), str(feed.pk)},
+        )
+        self.assertEqual(response.data["results"][0]["id"], str(walk.pk))
+
+    def test_cursor_mode_rejects_other_orderings(self):
+        for params in (
+            {"pagination": "cursor", "search": "walk"},
+            {"cursor": "W10", "search": "walk"},
+            {"pagination": "cursor", "ordering": "title"},
+        ):
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("pagination", response.data)
+
+        self.assertEqual(self.get(pagination="cursor", search="").status_code, 200)
+
+
+class ReminderCursorTests(ReminderTestCase):
+    def test_cursor_pages_are_stable_across_ties(self):
+        for offset in (0, 0, 0, 0, 1, 1, 2):
+            Reminder.objects.create(
+                owner=self.owner, title="Feed", reminder_time=START + hours(offset)
+            )
+        expected = [
+            str(reminder_id)
+            for reminder_id in Reminder.objects.filter(owner=self.owner)
+            .order_by("-reminder_time", "-id")
+            .values_list("id", flat=True)
+        ]
+
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        response = client.get(
+            reverse("reminder-list"), {"pagination": "cursor", "page_size": 2}
+        )
+        seen = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen.extend(reminder["id"] for reminder in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = client.get(response.data["next"])
+
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_not_found(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        response = client.get(reverse("reminder-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
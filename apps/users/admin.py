@@ -13,7 +13,7 @@ class UserProfileInline(admin.StackedInline):
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ("user", "date_of_birth", "bio")
+    list_display = ("user", "date_of_birth", "bio", "timezone")
     search_fields = ("user__username", "bio")
     list_filter = ("date_of_birth",)
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="timezone",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -26,6 +26,7 @@ class UserProfile(models.Model):
     avatar = models.ImageField(upload_to=user_avatar_upload_path, null=True, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     bio = models.TextField(max_length=500, null=True, blank=True)
+    timezone = models.CharField(max_length=64, blank=True, default="")
 
     def __str__(self):
         return self.user.username if self.user.username else "UserProfile"
@@ -34,6 +35,18 @@ class UserProfile(models.Model):
         verbose_name = "Профиль пользователя"
         verbose_name_plural = "Профили пользователей"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "timezone" in field_names:
+            instance._loaded_timezone = instance.timezone
+        return instance
+
+    @property
+    def timezone_changed(self):
+        """Часовой пояс отличается от сохраненного в БД (проверяется в post_save)"""
+        return self.timezone != getattr(self, "_loaded_timezone", "")
+
     def save(self, *args, **kwargs):
         # Проверяем, изменился ли аватар
         if (
@@ -42,9 +55,11 @@ class UserProfile(models.Model):
             previous = UserProfile.objects.get(pk=self.pk)
             if previous.avatar == self.avatar:
                 super().save(*args, **kwargs)
+                self._loaded_timezone = self.timezone
                 return
 
         super().save(*args, **kwargs)
+        self._loaded_timezone = self.timezone
         if self.avatar:
             try:
                 img = Image.open(self.avatar.path)
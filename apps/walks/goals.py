@@ -0,0 +1,113 @@
+"""Daily exercise goals of pets, from `Breed.exercise_needs` and `WalkStats`.
+
+Progress for any number of pets is one query returning `(pet, breed, date,
+minutes)` rows for the window, followed by array arithmetic over a
+`pets x days` matrix of minutes.
+"""
+
+import datetime
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import FilteredRelation, Q
+
+from apps.pets.models import Breed
+
+GOAL_WINDOW_DAYS = 7
+EXERCISE_NEEDS_CACHE_KEY = "breed-exercise-needs"
+
+
+def breed_exercise_needs():
+    """Return `{breed_id: minutes per day}` for every breed, cached."""
+    needs = cache.get(EXERCISE_NEEDS_CACHE_KEY)
+    if needs is None:
+        needs = dict(Breed.objects.values_list("id", "exercise_needs"))
+        cache.set(EXERCISE_NEEDS_CACHE_KEY, needs, settings.CACHE_TIMEOUT)
+    return needs
+
+
+def invalidate_breed_exercise_needs():
+    cache.delete(EXERCISE_NEEDS_CACHE_KEY)
+
+
+def goal_progress(pets, today, days=GOAL_WINDOW_DAYS):
+    """Exercise goal progress of every pet in the `pets` queryset.
+
+    Returns one dict per pet with the minutes walked on `today`, the goal
+    of its breed, today's progress ratio and the share of the last `days`
+    days (today included) on which the goal was met. Ratios are None for
+    pets without a breed or a goal.
+    """
+    start = today - datetime.timedelta(days=days - 1)
+    rows = list(
+        pets.order_by()
+        .annotate(
+            window_stats=FilteredRelation(
+                "walk_stats",
+                condition=Q(walk_stats__date__range=(start, today)),
+            ),
+        )
+        .values_list(
+            "id",
+            "breed_id",
+            "window_stats__date",
+            "window_stats__total_duration",
+        ),
+    )
+    if not rows:
+        return []
+
+    pet_ids, breed_ids, dates, durations = zip(*rows)
+    pet_ids, first_rows, pet_index = np.unique(
+        np.array(pet_ids, dtype=object),
+        return_index=True,
+        return_inverse=True,
+    )
+    # Pets without stats in the window come back once with NULL date/minutes.
+    dates = np.array(dates, dtype="datetime64[D]")
+    durations = np.array(durations, dtype=np.float64)
+    has_stats = ~np.isnat(dates)
+
+    minutes = np.zeros((len(pet_ids), days))
+    day_index = (dates[has_stats] - np.datetime64(start, "D")).astype(np.int64)
+    minutes[pet_index[has_stats], day_index] = durations[has_stats]
+
+    needs = breed_exercise_needs()
+    breed_ids = np.array(breed_ids, dtype=object)[first_rows]
+    goals = np.fromiter(
+        (needs.get(breed_id) or 0 for breed_id in breed_ids),
+        dtype=np.float64,
+        count=len(breed_ids),
+    )
+    has_goal = goals > 0
+
+    today_minutes = minutes[:, -1]
+    progress = np.divide(
+        today_minutes,
+        goals,
+        out=np.full(len(goals), np.nan),
+        where=has_goal,
+    )
+    days_met = ((minutes >= goals[:, None]) & has_goal[:, None]).sum(axis=1)
+    compliance = np.where(has_goal, days_met / days, np.nan)
+
+    return [
+        {
+            "pet_id": pet_id,
+            "date": today,
+            "minutes_today": int(minutes_today),
+            "goal_minutes": int(goal) if goal else None,
+            "progress": None if np.isnan(ratio) else float(ratio),
+            "days_goal_met": int(met),
+            "compliance": None if np.isnan(share) else float(share),
+        }
+        for pet_id, minutes_today, goal, ratio, met, share in zip(
+            pet_ids,
+            today_minutes,
+            goals,
+            progress,
+            days_met,
+            compliance,
+        )
+    ]
@@ -0,0 +1,56 @@
+"""In-progress walk sessions kept in the cache.
+
+A live walk only exists in the cache until it is stopped; heartbeats just
+extend the TTL of the cache key, so an active walk costs no database writes
+until the final Walk row is created.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def _session_key(user_id, pet_id):
+    return f"walk-session:{user_id}:{pet_id}"
+
+
+def start_session(user_id, pet_id):
+    """Start a live walk; return `(session, created)`.
+
+    If the pet already has a live walk, it is returned unchanged.
+    """
+    session = {
+        "id": uuid.uuid4(),
+        "pet_id": pet_id,
+        "start_time": timezone.now(),
+    }
+    key = _session_key(user_id, pet_id)
+    if cache.add(key, session, settings.WALK_SESSION_TTL):
+        return session, True
+
+    existing = cache.get(key)
+    if existing is None:
+        # Expired between add() and get().
+        cache.set(key, session, settings.WALK_SESSION_TTL)
+        return session, True
+    return existing, False
+
+
+def heartbeat(user_id, pet_id):
+    """Extend the TTL of the live walk; return the session or None if it expired."""
+    key = _session_key(user_id, pet_id)
+    session = cache.get(key)
+    if session is not None:
+        cache.touch(key, settings.WALK_SESSION_TTL)
+    return session
+
+
+def stop_session(user_id, pet_id):
+    """Remove the live walk from the cache and return it, or None if there is none."""
+    key = _session_key(user_id, pet_id)
+    session = cache.get(key)
+    if session is not None:
+        cache.delete(key)
+    return session
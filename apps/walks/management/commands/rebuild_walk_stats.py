@@ -0,0 +1,150 @@
+import datetime
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Exists, OuterRef, Q
+
+# Models are imported inside the functions: worker processes are spawned and
+# import this module to unpickle `_process_chunk` before Django is set up.
+
+MAX_REPORTED_MISMATCHES = 50
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _process_chunk(pet_ids, since, verify):
+    """Rebuild or verify the stats of one chunk of pets inside a worker process."""
+    from apps.walks.models import WalkStats
+
+    try:
+        if verify:
+            return len(pet_ids), WalkStats.verify(pet_ids, since=since)
+        WalkStats.rebuild(pet_ids, since=since)
+        return len(pet_ids), []
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild WalkStats and the weekly/monthly rollups from Walk. "
+        "Pets are streamed in chunks and each chunk is recomputed with one "
+        "aggregated query in a pool of worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=datetime.date.fromisoformat,
+            help="Only rebuild buckets from this date (YYYY-MM-DD) onwards.",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Dry run: report buckets that differ from the walks, write nothing.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of pets recomputed by one query (default: 500).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (default: number of CPUs).",
+        )
+
+    def handle(self, *args, since=None, verify=False, **options):
+        from apps.pets.models import Pet
+        from apps.walks.models import Walk, WalkStats
+
+        chunk_size = options["chunk_size"]
+        workers = options["workers"]
+        if chunk_size < 1 or workers < 1:
+            raise CommandError("--chunk-size and --workers must be positive.")
+
+        pets = Pet.objects.order_by("pk")
+        if since is not None:
+            pets = pets.filter(
+                Q(
+                    Exists(
+                        Walk.objects.filter(
+                            pet=OuterRef("pk"),
+                            start_time__date__gte=since,
+                        ),
+                    ),
+                )
+                | Q(
+                    Exists(
+                        WalkStats.objects.filter(pet=OuterRef("pk"), date__gte=since),
+                    ),
+                ),
+            )
+        pet_ids = pets.values_list("id", flat=True).iterator(chunk_size=chunk_size)
+
+        processed = 0
+        mismatches = []
+        self.mismatch_count = 0
+        # Workers are spawned rather than forked so they never share the
+        # connection the pet iterator is streaming from.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as executor:
+            pending = set()
+            for chunk in _chunks(pet_ids, chunk_size):
+                pending.add(executor.submit(_process_chunk, chunk, since, verify))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    processed += self._collect(done, mismatches)
+            processed += self._collect(pending, mismatches)
+
+        if verify:
+            for granularity, pet_id, bucket, stored, expected in mismatches:
+                self.stdout.write(
+                    f"{granularity} {pet_id} {bucket}: "
+                    f"stored {stored[0]} min / {stored[1]} walks, "
+                    f"expected {expected[0]} min / {expected[1]} walks",
+                )
+            style = self.style.ERROR if self.mismatch_count else self.style.SUCCESS
+            self.stdout.write(
+                style(
+                    f"Verified {processed} pets: "
+                    f"{self.mismatch_count} mismatched buckets.",
+                ),
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt walk stats for {processed} pets.")
+            )
+
+    def _collect(self, futures, mismatches):
+        processed = 0
+        for future in futures:
+            count, chunk_mismatches = future.result()
+            processed += count
+            self.mismatch_count += len(chunk_mismatches)
+            free = MAX_REPORTED_MISMATCHES - len(mismatches)
+            mismatches.extend(chunk_mismatches[:free])
+        return processed
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
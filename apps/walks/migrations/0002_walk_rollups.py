@@ -0,0 +1,115 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:24
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pets", "0002_initial"),
+        ("walks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyWalkStats",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "month_start",
+                    models.DateField(help_text="First day of the aggregated month"),
+                ),
+                (
+                    "total_duration",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Total duration of walks in minutes"
+                    ),
+                ),
+                (
+                    "total_walks",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Total number of walks"
+                    ),
+                ),
+                (
+                    "pet",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_walk_stats",
+                        to="pets.pet",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("pet", "month_start")},
+            },
+        ),
+        migrations.CreateModel(
+            name="WeeklyWalkStats",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "week_start",
+                    models.DateField(help_text="Monday of the aggregated week"),
+                ),
+                (
+                    "total_duration",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Total duration of walks in minutes"
+                    ),
+                ),
+                (
+                    "total_walks",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Total number of walks"
+                    ),
+                ),
+                (
+                    "pet",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="weekly_walk_stats",
+                        to="pets.pet",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("pet", "week_start")},
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO walks_weeklywalkstats (id, pet_id, week_start, total_duration, total_walks)
+            SELECT gen_random_uuid(), pet_id, date_trunc('week', date)::date,
+                   SUM(total_duration), SUM(total_walks)
+            FROM walks_walkstats
+            GROUP BY pet_id, date_trunc('week', date)::date;
+
+            INSERT INTO walks_monthlywalkstats (id, pet_id, month_start, total_duration, total_walks)
+            SELECT gen_random_uuid(), pet_id, date_trunc('month', date)::date,
+                   SUM(total_duration), SUM(total_walks)
+            FROM walks_walkstats
+            GROUP BY pet_id, date_trunc('month', date)::date;
+        """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
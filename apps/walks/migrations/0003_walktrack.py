@@ -0,0 +1,108 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:26
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("walks", "0002_walk_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WalkTrack",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "point_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of recorded GPS points"
+                    ),
+                ),
+                (
+                    "latitudes",
+                    models.BinaryField(
+                        default=bytes,
+                        help_text="Delta-encoded latitudes (int32, 1e-7 degrees)",
+                    ),
+                ),
+                (
+                    "longitudes",
+                    models.BinaryField(
+                        default=bytes,
+                        help_text="Delta-encoded longitudes (int32, 1e-7 degrees)",
+                    ),
+                ),
+                (
+                    "timestamps",
+                    models.BinaryField(
+                        default=bytes,
+                        help_text="Delta-encoded timestamps (int32, milliseconds)",
+                    ),
+                ),
+                (
+                    "base_timestamp",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Unix time of the first point in milliseconds",
+                        null=True,
+                    ),
+                ),
+                ("last_latitude", models.IntegerField(blank=True, null=True)),
+                ("last_longitude", models.IntegerField(blank=True, null=True)),
+                ("last_timestamp", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "distance",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Distance of the walk in metres",
+                        null=True,
+                    ),
+                ),
+                (
+                    "moving_time",
+                    models.PositiveIntegerField(
+                        blank=True, help_text="Time in motion in seconds", null=True
+                    ),
+                ),
+                (
+                    "pace",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Average pace while moving in seconds per kilometre",
+                        null=True,
+                    ),
+                ),
+                (
+                    "is_finalized",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the track is complete and its metrics are computed",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "walk",
+                    models.OneToOneField(
+                        help_text="The walk the track was recorded for",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="track",
+                        to="walks.walk",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pets", "0002_initial"),
+        ("walks", "0003_walktrack"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="walk",
+            index=models.Index(
+                fields=["owner", "pet", "-start_time", "-id"], name="walk_history_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:35
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pets", "0002_initial"),
+        ("walks", "0004_walk_history_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BreedWalkSketch",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "week_start",
+                    models.DateField(help_text="Monday of the sketched week"),
+                ),
+                (
+                    "pet_count",
+                    models.PositiveIntegerField(
+                        help_text="Number of pets of the breed with walk stats that week"
+                    ),
+                ),
+                (
+                    "zero_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of pets with zero minutes that week",
+                    ),
+                ),
+                (
+                    "min_index",
+                    models.IntegerField(
+                        default=0, help_text="Logarithmic index of the first bucket"
+                    ),
+                ),
+                (
+                    "cumulative_counts",
+                    models.BinaryField(
+                        default=bytes,
+                        help_text="Cumulative bucket counts of weekly minutes (uint32)",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "breed",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="walk_sketches",
+                        to="pets.breed",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("breed", "week_start")},
+            },
+        ),
+    ]
@@ -1,13 +1,75 @@
+import datetime
+import itertools
 import uuid
+
+import pytz
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F, Func, Sum, Value
+from django.db.models.functions import TruncYear
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 
-from apps.pets.models import Pet
+from apps.pets.models import Breed, Pet
+from apps.users.models import UserProfile
+from apps.walks import goals, versions
+from apps.walks import sketch as sketch_codec
+from apps.walks import track as track_codec
+from utils.datetime_utils import get_zone, local_today
 
 User = get_user_model()
 
 
+GRANULARITIES = ("day", "week", "month", "year")
+
+
+def walk_date(start_time, zone=None):
+    """Date of the WalkStats bucket a walk started at `start_time` belongs to.
+
+    Walks are bucketed by their local start date in the pet owner's
+    timezone `zone` (UTC when the owner has none).
+    """
+    if timezone.is_aware(start_time):
+        return timezone.localtime(start_time, zone or datetime.UTC).date()
+    return start_time.date()
+
+
+def stats_today(zone=None):
+    """Today's WalkStats bucket date for an owner in `zone`."""
+    return local_today(zone)
+
+
+def pet_zones(pet_ids):
+    """Return `{pet_id: zone name}` of the owners' timezones, "UTC" when unset."""
+    zones = {uuid.UUID(str(pet_id)): "UTC" for pet_id in pet_ids}
+    profiles = UserProfile.objects.filter(user__pets__in=zones).values_list(
+        "user__pets",
+        "timezone",
+    )
+    for pet_id, name in profiles:
+        try:
+            zones[pet_id] = get_zone(name).zone if name else "UTC"
+        except pytz.UnknownTimeZoneError:
+            pass
+    return zones
+
+
+def pet_zone(pet_id):
+    """Timezone the walks of `pet_id` are bucketed by."""
+    [name] = pet_zones([pet_id]).values()
+    return get_zone(name)
+
+
+def week_start(date):
+    return date - datetime.timedelta(days=date.weekday())
+
+
+def month_start(date):
+    return date.replace(day=1)
+
+
 class Walk(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     pet = models.ForeignKey(
@@ -34,18 +96,103 @@ class Walk(models.Model):
         help_text="Duration of the walk in minutes",
     )
 
-    def save(self, *args, **kwargs):
+    class Meta:
+        indexes = [
+            # Serves the walk history of a pet newest first, both for
+            # page-number and keyset pagination.
+            models.Index(
+                fields=["owner", "pet", "-start_time", "-id"],
+                name="walk_history_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not {"pet_id", "start_time", "duration"} & instance.get_deferred_fields():
+            # Remember what the stored row is counted as, so that save() and
+            # delete() can apply deltas instead of re-counting.
+            instance._stats_source = instance.stats_source()
+        return instance
+
+    def stats_source(self):
+        """Return `(pet_id, start_time, duration)` this walk adds to WalkStats, or None."""
+        if not self.duration or not self.start_time:
+            return None
+        return self.pet_id, self.start_time, self.duration
+
+    def compute_duration(self):
         if self.start_time and self.end_time:
             self.duration = int((self.end_time - self.start_time).total_seconds() / 60)
-        super().save(*args, **kwargs)
 
-        if self.duration:
-            date = self.start_time.date()
-            walk_stats, created = WalkStats.objects.get_or_create(
-                pet=self.pet,
-                date=date,
+    def save(self, *args, **kwargs):
+        self.compute_duration()
+
+        previous = getattr(self, "_stats_source", None)
+        current = self.stats_source()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous != current:
+                WalkStats.apply_deltas(
+                    bucket_deltas(
+                        removed=stats_bucket(previous),
+                        added=stats_bucket(current),
+                    ),
+                )
+        self._stats_source = current
+
+    @classmethod
+    def bulk_sync(cls, owner, pet_id, items):
+        """Insert walks recorded offline, skipping IDs that are already stored.
+
+        `items` are dicts with `id`, `start_time` and `end_time`. New walks are
+        written with one `INSERT ... ON CONFLICT DO NOTHING`, and the stats
+        deltas of exactly the inserted rows are applied like `save()` does.
+        Returns `(created_ids, existing_ids, conflicting_ids)`: existing IDs
+        are this pet's walks sent again, conflicting IDs belong to some other
+        walk and are not written.
+        """
+        items = {item["id"]: item for item in items}
+        with transaction.atomic():
+            walks = []
+            for walk_id, item in items.items():
+                walk = cls(
+                    id=walk_id,
+                    pet_id=pet_id,
+                    owner=owner,
+                    start_time=item["start_time"],
+                    end_time=item.get("end_time"),
+                )
+                walk.compute_duration()
+                walks.append(walk)
+            created = _insert_new_walks(walks)
+
+            zone = pet_zone(pet_id)
+            deltas = {}
+            for walk in walks:
+                if walk.id not in created:
+                    continue
+                for key, (duration, count) in bucket_deltas(
+                    added=stats_bucket(walk.stats_source(), zone),
+                ).items():
+                    prev_duration, prev_count = deltas.get(key, (0, 0))
+                    deltas[key] = (prev_duration + duration, prev_count + count)
+            if deltas:
+                WalkStats.apply_deltas(deltas)
+
+            skipped = [walk_id for walk_id in items if walk_id not in created]
+            existing = set(
+                cls.objects.filter(
+                    id__in=skipped,
+                    pet_id=pet_id,
+                    pet__owner=owner,
+                ).values_list("id", flat=True),
             )
-            walk_stats.increment_walk(self.duration)
+        return (
+            [walk.id for walk in walks if walk.id in created],
+            sorted(existing),
+            sorted(walk_id for walk_id in skipped if walk_id not in existing),
+        )
 
     def clean(self):
         if self.start_time and self.end_time and self.start_time > self.end_time:
@@ -71,24 +218,77 @@ class WalkStats(models.Model):
     class Meta:
         unique_together = ("pet", "date")
 
-    def increment_walk(self, duration):
-        self.total_duration += duration
-        self.total_walks += 1
-        self.save()
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """Apply `{(pet_id, date): (duration_delta, walks_delta)}` to every rollup.
+
+        The daily deltas are folded into weekly and monthly deltas. Pure
+        increments for all three tables go out as one statement of chained
+        `INSERT ... ON CONFLICT DO UPDATE`, so concurrent walks for the same
+        pet never lose an update. Decrements only ever touch existing rows
+        and are applied with F-expressions.
+        """
+        increments = []
+        for model, date_field, truncate, _ in ROLLUPS:
+            folded = {}
+            for (pet_id, date), (duration, walks) in deltas.items():
+                key = (pet_id, truncate(date))
+                prev_duration, prev_walks = folded.get(key, (0, 0))
+                folded[key] = (prev_duration + duration, prev_walks + walks)
+
+            rows = []
+            for (pet_id, date), (duration, walks) in folded.items():
+                if not duration and not walks:
+                    continue
+                if duration >= 0 and walks >= 0:
+                    rows.append((pet_id, date, duration, walks))
+                else:
+                    model.objects.filter(pet_id=pet_id, **{date_field: date}).update(
+                        total_duration=F("total_duration") + duration,
+                        total_walks=F("total_walks") + walks,
+                    )
+            if rows:
+                increments.append((model, date_field, rows))
+
+        if increments:
+            _upsert_increments(increments)
+        _bump_versions_on_commit(pet_id for pet_id, _ in deltas)
+
+    @classmethod
+    def rebuild(cls, pet_ids, dates=None, since=None):
+        """Recompute the rollups of `pet_ids` from their walks.
+
+        Only the buckets containing `dates`, or the buckets from `since`
+        onwards, are rebuilt when given. The recomputation is a single
+        aggregated statement that overwrites the stored totals, so it is
+        idempotent and safe to repeat.
+        """
+        pet_ids = list(pet_ids)
+        _rebuild_rollups(pet_ids, dates=dates, since=since)
+        _bump_versions_on_commit(pet_ids)
+
+    @classmethod
+    def verify(cls, pet_ids, since=None):
+        """Compare the rollups of `pet_ids` with their walks without writing.
+
+        Returns a list of `(granularity, pet_id, bucket, stored, expected)`.
+        """
+        return _verify_rollups(list(pet_ids), since=since)
 
     @staticmethod
     def get_weekly_stats(pet_id, start_date, end_date):
-        stats = WalkStats.objects.filter(
+        totals = WalkStats.objects.filter(
             pet__id=pet_id,
             date__range=(start_date, end_date),
+        ).aggregate(
+            total_walks=Sum("total_walks", default=0),
+            total_duration=Sum("total_duration", default=0),
         )
-        total_duration = sum(stat.total_duration for stat in stats)
-        total_walks = sum(stat.total_walks for stat in stats)
         return {
             "start_date": start_date,
             "end_date": end_date,
-            "total_walks": total_walks,
-            "total_duration_minutes": total_duration,
+            "total_walks": totals["total_walks"],
+            "total_duration_minutes": totals["total_duration"],
         }
 
     @staticmethod
@@ -98,3 +298,655 @@ class WalkStats(models.Model):
             date__range=(start_date, end_date),
         ).order_by("-date")
         return stats
+
+    @staticmethod
+    def get_buckets(pet_id, granularity, start_date, end_date):
+        """Walk totals per `granularity` bucket overlapping `[start_date, end_date]`.
+
+        Each granularity is read from the coarsest rollup that can answer it
+        (years are summed from the monthly table), so the number of rows
+        scanned is the number of buckets, not the number of days.
+        Buckets without walks are filled with zeros.
+        """
+        if granularity == "day":
+            model, date_field, truncate, step = WalkStats, "date", None, _next_day
+        elif granularity == "week":
+            model, date_field, truncate, step = (
+                WeeklyWalkStats,
+                "week_start",
+                week_start,
+                _next_week,
+            )
+        elif granularity == "month":
+            model, date_field, truncate, step = (
+                MonthlyWalkStats,
+                "month_start",
+                month_start,
+                _next_month,
+            )
+        elif granularity == "year":
+            model, date_field, truncate, step = (
+                MonthlyWalkStats,
+                "month_start",
+                _year_start,
+                _next_year,
+            )
+        else:
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        first = truncate(start_date) if truncate else start_date
+        last = truncate(end_date) if truncate else end_date
+        if granularity == "year":
+            last = _next_year(last) - datetime.timedelta(days=1)
+
+        queryset = model.objects.filter(
+            pet__id=pet_id,
+            **{f"{date_field}__range": (first, last)},
+        )
+        if granularity == "year":
+            rows = (
+                queryset.annotate(bucket=TruncYear(date_field))
+                .values("bucket")
+                .annotate(
+                    walks=Sum("total_walks"),
+                    duration=Sum("total_duration"),
+                )
+                .values_list("bucket", "walks", "duration")
+            )
+        else:
+            rows = queryset.values_list(date_field, "total_walks", "total_duration")
+        totals = {bucket: (walks, duration) for bucket, walks, duration in rows}
+
+        buckets = []
+        bucket = first
+        while bucket <= last:
+            next_bucket = step(bucket)
+            walks, duration = totals.get(bucket, (0, 0))
+            buckets.append(
+                {
+                    "period_start": bucket,
+                    "period_end": next_bucket - datetime.timedelta(days=1),
+                    "total_walks": walks,
+                    "total_duration": duration,
+                },
+            )
+            bucket = next_bucket
+        return buckets
+
+
+class WeeklyWalkStats(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    pet = models.ForeignKey(
+        Pet,
+        on_delete=models.CASCADE,
+        related_name="weekly_walk_stats",
+    )
+    week_start = models.DateField(help_text="Monday of the aggregated week")
+    total_duration = models.PositiveIntegerField(
+        help_text="Total duration of walks in minutes",
+        default=0,
+    )
+    total_walks = models.PositiveIntegerField(
+        help_text="Total number of walks",
+        default=0,
+    )
+
+    class Meta:
+        unique_together = ("pet", "week_start")
+
+
+class MonthlyWalkStats(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    pet = models.ForeignKey(
+        Pet,
+        on_delete=models.CASCADE,
+        related_name="monthly_walk_stats",
+    )
+    month_start = models.DateField(help_text="First day of the aggregated month")
+    total_duration = models.PositiveIntegerField(
+        help_text="Total duration of walks in minutes",
+        default=0,
+    )
+    total_walks = models.PositiveIntegerField(
+        help_text="Total number of walks",
+        default=0,
+    )
+
+    class Meta:
+        unique_together = ("pet", "month_start")
+
+
+class BreedWalkSketch(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    breed = models.ForeignKey(
+        Breed,
+        on_delete=models.CASCADE,
+        related_name="walk_sketches",
+    )
+    week_start = models.DateField(help_text="Monday of the sketched week")
+    pet_count = models.PositiveIntegerField(
+        help_text="Number of pets of the breed with walk stats that week",
+    )
+    zero_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of pets with zero minutes that week",
+    )
+    min_index = models.IntegerField(
+        default=0,
+        help_text="Logarithmic index of the first bucket",
+    )
+    cumulative_counts = models.BinaryField(
+        default=bytes,
+        help_text="Cumulative bucket counts of weekly minutes (uint32)",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("breed", "week_start")
+
+    @classmethod
+    def build(cls, since):
+        """Rebuild the sketches of every breed for the weeks from `since` onwards.
+
+        The weekly totals of each pet are streamed from `WeeklyWalkStats`
+        ordered by breed and week, so only one group of durations is held
+        in memory at a time.
+        """
+        since = week_start(since)
+        rows = (
+            WeeklyWalkStats.objects.filter(
+                week_start__gte=since,
+                pet__breed__isnull=False,
+            )
+            .order_by("pet__breed_id", "week_start")
+            .values_list("pet__breed_id", "week_start", "total_duration")
+            .iterator(chunk_size=5000)
+        )
+
+        sketches = []
+        for (breed_id, week), group in itertools.groupby(
+            rows,
+            key=lambda row: (row[0], row[1]),
+        ):
+            durations = [duration for _, _, duration in group]
+            zero_count, min_index, cumulative = sketch_codec.build(durations)
+            sketches.append(
+                cls(
+                    breed_id=breed_id,
+                    week_start=week,
+                    pet_count=len(durations),
+                    zero_count=zero_count,
+                    min_index=min_index,
+                    cumulative_counts=cumulative,
+                ),
+            )
+
+        # Readers keep seeing the previous sketches until the commit.
+        with transaction.atomic():
+            cls.objects.filter(week_start__gte=since).delete()
+            cls.objects.bulk_create(sketches, batch_size=1000)
+        return len(sketches)
+
+    def percentile_rank(self, total_duration):
+        """Percentile of `total_duration` minutes among the breed that week."""
+        return sketch_codec.percentile_rank(
+            total_duration,
+            self.zero_count,
+            self.min_index,
+            bytes(self.cumulative_counts),
+        )
+
+    def quantile(self, q):
+        return sketch_codec.quantile(
+            q,
+            self.zero_count,
+            self.min_index,
+            bytes(self.cumulative_counts),
+        )
+
+
+class WalkTrack(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    walk = models.OneToOneField(
+        Walk,
+        on_delete=models.CASCADE,
+        related_name="track",
+        help_text="The walk the track was recorded for",
+    )
+    point_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of recorded GPS points",
+    )
+    latitudes = models.BinaryField(
+        default=bytes,
+        help_text="Delta-encoded latitudes (int32, 1e-7 degrees)",
+    )
+    longitudes = models.BinaryField(
+        default=bytes,
+        help_text="Delta-encoded longitudes (int32, 1e-7 degrees)",
+    )
+    timestamps = models.BinaryField(
+        default=bytes,
+        help_text="Delta-encoded timestamps (int32, milliseconds)",
+    )
+    base_timestamp = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Unix time of the first point in milliseconds",
+    )
+    last_latitude = models.IntegerField(null=True, blank=True)
+    last_longitude = models.IntegerField(null=True, blank=True)
+    last_timestamp = models.BigIntegerField(null=True, blank=True)
+    distance = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Distance of the walk in metres",
+    )
+    moving_time = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Time in motion in seconds",
+    )
+    pace = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Average pace while moving in seconds per kilometre",
+    )
+    is_finalized = models.BooleanField(
+        default=False,
+        help_text="Whether the track is complete and its metrics are computed",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Track of {self.walk_id} ({self.point_count} points)"
+
+    @classmethod
+    def append(cls, walk, points):
+        """Append a chunk of `[[lat, lon, unix_ts], ...]` points to the walk's track.
+
+        The chunk is encoded with NumPy and concatenated to the stored blobs
+        in SQL, so the existing points are never read back. Returns the new
+        number of points.
+        """
+        try:
+            points = track_codec.parse_points(points)
+        except ValueError as exc:
+            raise ValidationError(str(exc))
+
+        with transaction.atomic():
+            track, _ = (
+                cls.objects.select_for_update()
+                .only(
+                    "id",
+                    "point_count",
+                    "is_finalized",
+                    "last_latitude",
+                    "last_longitude",
+                    "last_timestamp",
+                )
+                .get_or_create(walk=walk)
+            )
+            if track.is_finalized:
+                raise ValidationError("Track is already finalized.")
+
+            updates = {}
+            if track.point_count:
+                last = (track.last_latitude, track.last_longitude, track.last_timestamp)
+            else:
+                base_timestamp = track_codec.quantize_timestamp(points[0, 2])
+                last = (0, 0, base_timestamp)
+                updates["base_timestamp"] = base_timestamp
+
+            try:
+                lat, lon, ts, new_last = track_codec.encode_points(points, last)
+            except ValueError as exc:
+                raise ValidationError(str(exc))
+
+            cls.objects.filter(pk=track.pk).update(
+                latitudes=_concat_bytes("latitudes", lat),
+                longitudes=_concat_bytes("longitudes", lon),
+                timestamps=_concat_bytes("timestamps", ts),
+                point_count=F("point_count") + len(points),
+                last_latitude=new_last[0],
+                last_longitude=new_last[1],
+                last_timestamp=new_last[2],
+                updated_at=timezone.now(),
+                **updates,
+            )
+        return track.point_count + len(points)
+
+    def decode(self):
+        """Return `(latitudes, longitudes, timestamps)` NumPy arrays."""
+        return track_codec.decode(
+            self.latitudes,
+            self.longitudes,
+            self.timestamps,
+            self.base_timestamp or 0,
+        )
+
+    def finalize(self):
+        """Compute distance, moving time and pace and close the track for uploads."""
+        self.distance, self.moving_time, self.pace = track_codec.compute_metrics(
+            *self.decode(),
+        )
+        self.is_finalized = True
+        self.save(
+            update_fields=[
+                "distance",
+                "moving_time",
+                "pace",
+                "is_finalized",
+                "updated_at",
+            ],
+        )
+
+
+def _concat_bytes(field, chunk):
+    return Func(
+        F(field),
+        Value(chunk, output_field=models.BinaryField()),
+        template="%(expressions)s",
+        arg_joiner=" || ",
+        output_field=models.BinaryField(),
+    )
+
+
+# (model, bucket column, date -> bucket) for every incrementally maintained rollup.
+ROLLUPS = (
+    (WalkStats, "date", lambda date: date, "day"),
+    (WeeklyWalkStats, "week_start", week_start, "week"),
+    (MonthlyWalkStats, "month_start", month_start, "month"),
+)
+
+
+def _next_day(date):
+    return date + datetime.timedelta(days=1)
+
+
+def _next_week(date):
+    return date + datetime.timedelta(days=7)
+
+
+def _next_month(date):
+    return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def _year_start(date):
+    return date.replace(month=1, day=1)
+
+
+def _next_year(date):
+    return date.replace(year=date.year + 1, month=1, day=1)
+
+
+def _bump_versions_on_commit(pet_ids):
+    pet_ids = {str(pet_id) for pet_id in pet_ids}
+    if pet_ids:
+        transaction.on_commit(lambda: versions.bump_versions(pet_ids))
+
+
+def _upsert_increments(increments):
+    """Upsert `[(model, date_field, rows)]` increments in a single statement."""
+    statements = []
+    params = []
+    for model, date_field, rows in increments:
+        table = connection.ops.quote_name(model._meta.db_table)
+        column = connection.ops.quote_name(date_field)
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+        statements.append(
+            f"""
+            INSERT INTO {table} (id, pet_id, {column}, total_duration, total_walks)
+            VALUES {values}
+            ON CONFLICT (pet_id, {column}) DO UPDATE SET
+                total_duration = {table}.total_duration + EXCLUDED.total_duration,
+                total_walks = {table}.total_walks + EXCLUDED.total_walks
+            """,
+        )
+        for pet_id, date, duration, walks in rows:
+            params.extend([uuid.uuid4(), pet_id, date, duration, walks])
+
+    *ctes, main = statements
+    if ctes:
+        with_clause = ", ".join(
+            f"rollup_{index} AS ({statement})" for index, statement in enumerate(ctes)
+        )
+        main = f"WITH {with_clause} {main}"
+
+    with connection.cursor() as cursor:
+        cursor.execute(main, params)
+
+
+def _fresh_rollup(rollup, zones, dates=None, since=None):
+    """SQL aggregating walks into `rollup` buckets, plus a filter for stored rows.
+
+    `zones` is `pet_zones()` of the pets to aggregate.
+    Returns `(fresh_sql, fresh_params, stored_filter, stored_params)`; the
+    stored filter refers to the rollup table under the alias `stored`.
+    """
+    _, date_field, truncate, unit = rollup
+    walk_table = connection.ops.quote_name(Walk._meta.db_table)
+    column = connection.ops.quote_name(date_field)
+    bucket = f"date_trunc('{unit}', walk.start_time AT TIME ZONE zone.name)::date"
+    pet_ids = list(zones)
+
+    if dates is not None:
+        buckets = sorted({truncate(date) for date in dates})
+        walk_filter, walk_params = f"AND {bucket} = ANY(%s)", [buckets]
+        stored_filter, stored_params = f"AND stored.{column} = ANY(%s)", [buckets]
+    elif since is not None:
+        first = truncate(since)
+        # No zone is more than a day ahead of UTC, so the start_time bound
+        # only narrows the scan and the bucket bound decides.
+        walk_filter = f"AND walk.start_time >= %s AND {bucket} >= %s"
+        walk_params = [
+            datetime.datetime.combine(
+                first - datetime.timedelta(days=1),
+                datetime.time(),
+                datetime.UTC,
+            ),
+            first,
+        ]
+        stored_filter, stored_params = f"AND stored.{column} >= %s", [first]
+    else:
+        walk_filter, walk_params = "", []
+        stored_filter, stored_params = "", []
+
+    fresh_sql = f"""
+        SELECT walk.pet_id, {bucket} AS bucket,
+               SUM(walk.duration) AS total_duration,
+               COUNT(*) AS total_walks
+        FROM {walk_table} walk
+        JOIN unnest(%s::uuid[], %s::text[]) AS zone (pet_id, name)
+            ON zone.pet_id = walk.pet_id
+        WHERE walk.duration > 0 {walk_filter}
+        GROUP BY 1, 2
+    """
+    return (
+        fresh_sql,
+        [pet_ids, list(zones.values()), *walk_params],
+        f"stored.pet_id = ANY(%s) {stored_filter}",
+        [pet_ids, *stored_params],
+    )
+
+
+def _rebuild_rollups(pet_ids, dates=None, since=None):
+    """Overwrite rollup buckets with totals aggregated from the walks table."""
+    zones = pet_zones(pet_ids)
+    parts = []
+    for index, rollup in enumerate(ROLLUPS):
+        model, date_field = rollup[:2]
+        table = connection.ops.quote_name(model._meta.db_table)
+        column = connection.ops.quote_name(date_field)
+        fresh_sql, fresh_params, stored_filter, stored_params = _fresh_rollup(
+            rollup,
+            zones,
+            dates=dates,
+            since=since,
+        )
+
+        parts.append((f"fresh_{index}", fresh_sql, fresh_params))
+        parts.append(
+            (
+                f"stale_{index}",
+                f"""
+                DELETE FROM {table} stored
+                WHERE {stored_filter}
+                AND NOT EXISTS (
+                    SELECT 1 FROM fresh_{index} fresh
+                    WHERE fresh.pet_id = stored.pet_id
+                    AND fresh.bucket = stored.{column}
+                )
+                """,
+                stored_params,
+            ),
+        )
+        parts.append(
+            (
+                f"upsert_{index}",
+                f"""
+                INSERT INTO {table} AS stored
+                    (id, pet_id, {column}, total_duration, total_walks)
+                SELECT gen_random_uuid(), pet_id, bucket, total_duration, total_walks
+                FROM fresh_{index}
+                ON CONFLICT (pet_id, {column}) DO UPDATE SET
+                    total_duration = EXCLUDED.total_duration,
+                    total_walks = EXCLUDED.total_walks
+                WHERE (stored.total_duration, stored.total_walks)
+                    IS DISTINCT FROM (EXCLUDED.total_duration, EXCLUDED.total_walks)
+                """,
+                [],
+            ),
+        )
+
+    *ctes, (_, main, main_params) = parts
+    sql = "WITH " + ", ".join(f"{name} AS ({body})" for name, body, _ in ctes) + main
+    params = [param for _, _, cte_params in ctes for param in cte_params]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + main_params)
+
+
+def _verify_rollups(pet_ids, since=None):
+    """Return buckets whose stored totals differ from the walks table.
+
+    Rows are `(granularity, pet_id, bucket, stored, expected)` where `stored`
+    and `expected` are `(total_duration, total_walks)`; empty buckets that
+    are missing on one side count as equal.
+    """
+    zones = pet_zones(pet_ids)
+    mismatches = []
+    for rollup in ROLLUPS:
+        model, date_field, _, unit = rollup
+        table = connection.ops.quote_name(model._meta.db_table)
+        column = connection.ops.quote_name(date_field)
+        fresh_sql, fresh_params, stored_filter, stored_params = _fresh_rollup(
+            rollup,
+            zones,
+            since=since,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH fresh AS ({fresh_sql})
+                SELECT COALESCE(fresh.pet_id, stored.pet_id),
+                       COALESCE(fresh.bucket, stored.{column}),
+                       COALESCE(stored.total_duration, 0),
+                       COALESCE(stored.total_walks, 0),
+                       COALESCE(fresh.total_duration, 0),
+                       COALESCE(fresh.total_walks, 0)
+                FROM fresh
+                FULL OUTER JOIN (
+                    SELECT * FROM {table} stored WHERE {stored_filter}
+                ) stored
+                ON fresh.pet_id = stored.pet_id AND fresh.bucket = stored.{column}
+                WHERE (COALESCE(stored.total_duration, 0), COALESCE(stored.total_walks, 0))
+                    IS DISTINCT FROM
+                    (COALESCE(fresh.total_duration, 0), COALESCE(fresh.total_walks, 0))
+                """,
+                fresh_params + stored_params,
+            )
+            for pet_id, bucket, *totals in cursor.fetchall():
+                mismatches.append(
+                    (unit, pet_id, bucket, tuple(totals[:2]), tuple(totals[2:])),
+                )
+    return mismatches
+
+
+def _insert_new_walks(walks):
+    """Insert `walks` whose IDs are not taken yet; return the set of inserted IDs."""
+    if not walks:
+        return set()
+    fields = Walk._meta.concrete_fields
+    table = connection.ops.quote_name(Walk._meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({columns})
+            SELECT * FROM unnest(
+                {", ".join(f"%s::{field.db_type(connection)}[]" for field in fields)}
+            )
+            ON CONFLICT (id) DO NOTHING
+            RETURNING id
+            """,
+            [
+                [
+                    field.get_db_prep_save(getattr(walk, field.attname), connection)
+                    for walk in walks
+                ]
+                for field in fields
+            ],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def stats_bucket(source, zone=None):
+    """Turn a walk's `stats_source()` into its `(pet_id, date, duration)` bucket.
+
+    The pet owner's timezone is looked up unless `zone` is given.
+    """
+    if source is None:
+        return None
+    pet_id, start_time, duration = source
+    if zone is None:
+        zone = pet_zone(pet_id)
+    return pet_id, walk_date(start_time, zone), duration
+
+
+def bucket_deltas(removed=None, added=None):
+    """Build WalkStats deltas for a walk moving from bucket `removed` to bucket `added`."""
+    deltas = {}
+    if removed:
+        pet_id, date, duration = removed
+        deltas[(pet_id, date)] = (-duration, -1)
+    if added:
+        pet_id, date, duration = added
+        prev_duration, prev_walks = deltas.get((pet_id, date), (0, 0))
+        deltas[(pet_id, date)] = (prev_duration + duration, prev_walks + 1)
+    return deltas
+
+
+@receiver(post_delete, sender=Walk)
+def subtract_deleted_walk(sender, instance, **kwargs):
+    if hasattr(instance, "_stats_source"):
+        source = instance._stats_source
+    else:
+        source = instance.stats_source()
+    if source:
+        WalkStats.apply_deltas(bucket_deltas(removed=stats_bucket(source)))
+
+
+@receiver(post_save, sender=UserProfile)
+def rebucket_walks_on_timezone_change(sender, instance, **kwargs):
+    # Buckets are local dates of the owner, so all of them may move.
+    if instance.timezone_changed:
+        WalkStats.rebuild(
+            Pet.objects.filter(owner_id=instance.user_id).values_list("id", flat=True),
+        )
+
+
+@receiver(post_save, sender=Breed)
+@receiver(post_delete, sender=Breed)
+def invalidate_exercise_needs(sender, **kwargs):
+    goals.invalidate_breed_exercise_needs()
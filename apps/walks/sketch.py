@@ -0,0 +1,102 @@
+"""Mergeable quantile sketches of walk durations.
+
+A sketch is a histogram over logarithmic buckets: a positive value `x`
+falls into bucket `ceil(log(x) / log(GAMMA))`, so every bucket spans values
+within `RELATIVE_ACCURACY` of each other, whatever their magnitude.
+Zeros are counted apart. Sketches with the same `GAMMA` merge by adding
+their bucket counts.
+
+The counts are stored cumulatively as little-endian uint32, so the rank of
+a value is two array reads: `percentile_rank()` is O(1).
+"""
+
+import math
+
+import numpy as np
+
+RELATIVE_ACCURACY = 0.02
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+COUNT_DTYPE = np.dtype("<u4")
+
+
+def bucket_indexes(values):
+    return np.ceil(np.log(values) / LOG_GAMMA).astype(np.int64)
+
+
+def build(values):
+    """Return `(zero_count, min_index, cumulative_bytes)` for non-negative values."""
+    values = np.asarray(values, dtype=np.float64)
+    positive = values[values > 0]
+    zero_count = len(values) - len(positive)
+    if not len(positive):
+        return zero_count, 0, b""
+
+    indexes = bucket_indexes(positive)
+    min_index = int(indexes.min())
+    counts = np.bincount(indexes - min_index)
+    return zero_count, min_index, np.cumsum(counts).astype(COUNT_DTYPE).tobytes()
+
+
+def merge(sketches):
+    """Merge `[(zero_count, min_index, cumulative_bytes), ...]` into one sketch."""
+    parts = [
+        (min_index, _counts(cumulative))
+        for _, min_index, cumulative in sketches
+        if cumulative
+    ]
+    zero_count = sum(zero_count for zero_count, _, _ in sketches)
+    if not parts:
+        return zero_count, 0, b""
+
+    min_index = min(start for start, _ in parts)
+    end = max(start + len(counts) for start, counts in parts)
+    merged = np.zeros(end - min_index, dtype=np.int64)
+    for start, counts in parts:
+        merged[start - min_index : start - min_index + len(counts)] += counts
+    return zero_count, min_index, np.cumsum(merged).astype(COUNT_DTYPE).tobytes()
+
+
+def percentile_rank(value, zero_count, min_index, cumulative):
+    """Percentage of the sketched values below `value`, counting ties as half."""
+    cumulative = np.frombuffer(cumulative, dtype=COUNT_DTYPE)
+    positive = int(cumulative[-1]) if len(cumulative) else 0
+    total = zero_count + positive
+    if not total:
+        return None
+
+    if value <= 0:
+        below, equal = 0, zero_count
+    else:
+        position = int(bucket_indexes(value)) - min_index
+        if position < 0:
+            below, equal = zero_count, 0
+        elif position >= len(cumulative):
+            below, equal = total, 0
+        else:
+            before = int(cumulative[position - 1]) if position else 0
+            below = zero_count + before
+            equal = int(cumulative[position]) - before
+    return 100 * (below + equal / 2) / total
+
+
+def quantile(q, zero_count, min_index, cumulative):
+    """Approximate value at quantile `q` (0..1) of the sketched values."""
+    cumulative = np.frombuffer(cumulative, dtype=COUNT_DTYPE)
+    total = zero_count + (int(cumulative[-1]) if len(cumulative) else 0)
+    if not total:
+        return None
+
+    rank = q * (total - 1)
+    if rank < zero_count:
+        return 0.0
+    position = int(np.searchsorted(cumulative, rank - zero_count, side="right"))
+    # Midpoint of the bucket in the relative sense, as in DDSketch.
+    return 2 * GAMMA ** (position + min_index) / (GAMMA + 1)
+
+
+def _counts(cumulative):
+    return np.diff(
+        np.frombuffer(cumulative, dtype=COUNT_DTYPE).astype(np.int64),
+        prepend=0,
+    )
@@ -0,0 +1,16 @@
+import datetime
+
+from celery import shared_task
+from django.utils import timezone
+
+from apps.walks.models import BreedWalkSketch, week_start
+
+
+@shared_task
+def build_breed_walk_sketches(weeks=2):
+    """Rebuild the breed sketches of the last `weeks` weeks, the current one included.
+
+    The previous week is rebuilt too, since walks synced late still land in it.
+    """
+    since = week_start(timezone.now().date()) - datetime.timedelta(weeks=weeks - 1)
+    return BreedWalkSketch.build(since)
@@ -0,0 +1,611 @@
+import datetime
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.pets.models import Breed, Pet
+from apps.walks import goals, sketch
+from apps.walks.models import (
+    BreedWalkSketch,
+    MonthlyWalkStats,
+    Walk,
+    WalkStats,
+    WalkTrack,
+    WeeklyWalkStats,
+)
+
+User = get_user_model()
+
+MONDAY = datetime.datetime(2026, 3, 2, 10, 0, tzinfo=datetime.UTC)
+
+
+def create_breed(name="Test breed", exercise_needs=60):
+    return Breed.objects.create(
+        name=name,
+        size="Medium",
+        exercise_needs=exercise_needs,
+        grooming_requirements=7,
+        coat_length="Short",
+        lifespan=13,
+        min_weight=20,
+        max_weight=30,
+        min_height=13,
+        max_height=16,
+    )
+
+
+def walk_at(start_time, minutes):
+    return {
+        "start_time": start_time,
+        "end_time": start_time + datetime.timedelta(minutes=minutes),
+    }
+
+
+class WalkTestCase(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="password")
+        self.pet = Pet.objects.create(owner=self.owner, name="Rex")
+
+    def create_walk(self, start_time, minutes, pet=None):
+        return Walk.objects.create(
+            pet=pet or self.pet, owner=self.owner, **walk_at(start_time, minutes)
+        )
+
+    def daily(self, date):
+        stats = WalkStats.objects.filter(pet=self.pet, date=date).first()
+        return (stats.total_duration, stats.total_walks) if stats else None
+
+    def api(self, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.owner)
+        return client
+
+    def assertRollupsMatchWalks(self):
+        self.assertEqual(WalkStats.verify([self.pet.pk]), [])
+
+
+class WalkStatsDeltaTests(WalkTestCase):
+    def test_create_adds_walk(self):
+        self.create_walk(MONDAY, 30)
+        self.create_walk(MONDAY + datetime.timedelta(hours=3), 15)
+
+        self.assertEqual(self.daily(MONDAY.date()), (45, 2))
+        self.assertRollupsMatchWalks()
+
+    def test_edit_moves_walk_between_days(self):
+        self.create_walk(MONDAY, 30)
+        walk = Walk.objects.get(pet=self.pet)
+        tuesday = MONDAY + datetime.timedelta(days=1)
+        walk.start_time = tuesday
+        walk.end_time = tuesday + datetime.timedelta(minutes=20)
+        walk.save()
+
+        self.assertEqual(self.daily(MONDAY.date()), (0, 0))
+        self.assertEqual(self.daily(tuesday.date()), (20, 1))
+        self.assertRollupsMatchWalks()
+
+    def test_delete_subtracts_walk(self):
+        self.create_walk(MONDAY, 30)
+        self.create_walk(MONDAY + datetime.timedelta(hours=3), 15)
+        Walk.objects.filter(pet=self.pet).order_by("start_time").first().delete()
+
+        self.assertEqual(self.daily(MONDAY.date()), (15, 1))
+        self.assertRollupsMatchWalks()
+
+    def test_unfinished_walk_is_not_counted(self):
+        walk = Walk.objects.create(pet=self.pet, owner=self.owner, start_time=MONDAY)
+        self.assertIsNone(self.daily(MONDAY.date()))
+
+        walk.end_time = MONDAY + datetime.timedelta(minutes=25)
+        walk.save()
+        self.assertEqual(self.daily(MONDAY.date()), (25, 1))
+        self.assertRollupsMatchWalks()
+
+
+class WalkStatsTimezoneTests(WalkTestCase):
+    # 23:30 UTC on Monday is already Tuesday in Moscow (UTC+3).
+    LATE = MONDAY.replace(hour=23, minute=30)
+
+    def set_timezone(self, name):
+        self.owner.profile.timezone = name
+        self.owner.profile.save()
+
+    def test_walks_are_bucketed_by_the_owner_timezone(self):
+        self.set_timezone("Europe/Moscow")
+        self.create_walk(self.LATE, 20)
+        Walk.bulk_sync(
+            self.owner, self.pet.pk, [{"id": uuid.uuid4(), **walk_at(self.LATE, 10)}]
+        )
+
+        tuesday = MONDAY.date() + datetime.timedelta(days=1)
+        self.assertIsNone(self.daily(MONDAY.date()))
+        self.assertEqual(self.daily(tuesday), (30, 2))
+        self.assertRollupsMatchWalks()
+
+    def test_timezone_change_moves_the_buckets(self):
+        walk = self.create_walk(self.LATE, 20)
+        self.assertEqual(self.daily(MONDAY.date()), (20, 1))
+
+        self.set_timezone("Europe/Moscow")
+        tuesday = MONDAY.date() + datetime.timedelta(days=1)
+        self.assertIsNone(self.daily(MONDAY.date()))
+        self.assertEqual(self.daily(tuesday), (20, 1))
+        self.assertRollupsMatchWalks()
+
+        walk.delete()
+        self.assertEqual(self.daily(tuesday), (0, 0))
+        self.assertRollupsMatchWalks()
+
+    def test_daily_stats_default_to_the_owner_today(self):
+        self.set_timezone("Europe/Moscow")
+        self.create_walk(self.LATE, 20)
+        url = reverse("walk-stats-daily-stats", kwargs={"pet_pk": self.pet.pk})
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=self.LATE + datetime.timedelta(minutes=30),
+        ):
+            response = self.api().get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_duration"], 20)
+
+
+class WalkRollupTests(WalkTestCase):
+    def totals(self, model, date_field):
+        return dict(
+            (date, (duration, walks))
+            for date, duration, walks in model.objects.filter(pet=self.pet)
+            .exclude(total_walks=0)
+            .values_list(date_field, "total_duration", "total_walks")
+        )
+
+    def test_walks_are_rolled_up_by_week_and_month(self):
+        self.create_walk(MONDAY, 30)
+        self.create_walk(MONDAY + datetime.timedelta(days=6), 20)
+        self.create_walk(MONDAY - datetime.timedelta(days=2), 10)
+
+        self.assertEqual(
+            self.totals(WeeklyWalkStats, "week_start"),
+            {
+                datetime.date(2026, 2, 23): (10, 1),
+                datetime.date(2026, 3, 2): (50, 2),
+            },
+        )
+        self.assertEqual(
+            self.totals(MonthlyWalkStats, "month_start"),
+            {
+                datetime.date(2026, 2, 1): (10, 1),
+                datetime.date(2026, 3, 1): (50, 2),
+            },
+        )
+        self.assertRollupsMatchWalks()
+
+    def test_edit_moves_walk_between_months(self):
+        walk = self.create_walk(MONDAY, 30)
+        walk = Walk.objects.get(pk=walk.pk)
+        walk.start_time = MONDAY - datetime.timedelta(days=7)
+        walk.end_time = walk.start_time + datetime.timedelta(minutes=30)
+        walk.save()
+
+        self.assertEqual(
+            self.totals(MonthlyWalkStats, "month_start"),
+            {datetime.date(2026, 2, 1): (30, 1)},
+        )
+        self.assertRollupsMatchWalks()
+
+    def buckets(self, user=None, **params):
+        url = reverse("walk-stats-bucket-stats", kwargs={"pet_pk": self.pet.pk})
+        return self.api(user).get(url, params)
+
+    def test_buckets_are_zero_filled(self):
+        self.create_walk(MONDAY, 30)
+        response = self.buckets(
+            granularity="week", start_date="2026-02-25", end_date="2026-03-10"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                (bucket["period_start"], bucket["total_walks"])
+                for bucket in response.data
+            ],
+            [("2026-02-23", 0), ("2026-03-02", 1), ("2026-03-09", 0)],
+        )
+
+    def test_year_buckets_sum_months(self):
+        self.create_walk(MONDAY, 30)
+        self.create_walk(MONDAY + datetime.timedelta(days=60), 15)
+        response = self.buckets(
+            granularity="year", start_date="2026-01-01", end_date="2026-12-31"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                (bucket["total_walks"], bucket["total_duration"])
+                for bucket in response.data
+            ],
+            [(2, 45)],
+        )
+
+    def test_long_day_ranges_need_a_coarser_granularity(self):
+        response = self.buckets(start_date="2026-01-01", end_date="2026-01-31")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 31)
+
+        response = self.buckets(start_date="2026-01-01", end_date="2026-02-01")
+        self.assertEqual(response.status_code, 400)
+        response = self.buckets(
+            granularity="month", start_date="2026-01-01", end_date="2026-02-01"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_granularity(self):
+        self.assertEqual(self.buckets(granularity="hour").status_code, 400)
+
+    def test_other_owners_pet_is_not_found(self):
+        stranger = User.objects.create_user(username="stranger", password="password")
+        self.assertEqual(self.buckets(user=stranger).status_code, 404)
+
+
+class WalkTrackTests(WalkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.walk = self.create_walk(MONDAY, 30)
+        self.url = reverse(
+            "walk-track", kwargs={"pet_pk": self.pet.pk, "pk": self.walk.pk}
+        )
+
+    def points(self, start, count):
+        # Northwards at about 1.1 m/s, one point per second.
+        timestamp = MONDAY.timestamp()
+        return [
+            [55.75 + index * 0.00001, 37.62, timestamp + index]
+            for index in range(start, start + count)
+        ]
+
+    def test_chunks_are_appended_and_decoded(self):
+        points = self.points(0, 5) + self.points(5, 5)
+        WalkTrack.append(self.walk, points[:5])
+        WalkTrack.append(self.walk, points[5:])
+
+        track = WalkTrack.objects.get(walk=self.walk)
+        self.assertEqual(track.point_count, 10)
+        latitudes, longitudes, timestamps = track.decode()
+        self.assertEqual(
+            [list(point) for point in zip(latitudes, longitudes, timestamps)],
+            [[round(lat, 7), lon, ts] for lat, lon, ts in points],
+        )
+
+        track.finalize()
+        self.assertAlmostEqual(track.distance, 10.0, delta=0.1)
+        self.assertEqual(track.moving_time, 9)
+
+    def test_post_chunk(self):
+        response = self.api().post(
+            self.url, {"points": self.points(0, 3)}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["point_count"], 3)
+
+    def test_malformed_bodies_are_bad_requests(self):
+        for body in (
+            self.points(0, 3),
+            {},
+            {"points": []},
+            {"points": [[55.75, 37.62]]},
+            {"points": "not points"},
+        ):
+            with self.subTest(body=body):
+                response = self.api().post(self.url, body, format="json")
+                self.assertEqual(response.status_code, 400)
+
+    def test_timestamps_must_not_go_backwards(self):
+        self.api().post(self.url, {"points": self.points(5, 2)}, format="json")
+        response = self.api().post(
+            self.url, {"points": self.points(0, 2)}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["detail"], "Timestamps must not go backwards.")
+
+
+class WalkBulkSyncTests(WalkTestCase):
+    def items(self):
+        return [
+            {"id": uuid.uuid4(), **walk_at(MONDAY, 30)},
+            {"id": uuid.uuid4(), **walk_at(MONDAY + datetime.timedelta(hours=5), 10)},
+        ]
+
+    def test_sync_is_idempotent_and_counts_new_walks_once(self):
+        items = self.items()
+        ids = sorted(item["id"] for item in items)
+        created, existing, conflicts = Walk.bulk_sync(self.owner, self.pet.pk, items)
+        self.assertEqual((sorted(created), existing, conflicts), (ids, [], []))
+
+        created, existing, conflicts = Walk.bulk_sync(self.owner, self.pet.pk, items)
+        self.assertEqual((created, existing, conflicts), ([], ids, []))
+
+        self.assertEqual(self.daily(MONDAY.date()), (40, 2))
+        self.assertRollupsMatchWalks()
+
+    def test_ids_of_other_pets_are_conflicts(self):
+        other = Pet.objects.create(owner=self.owner, name="Max")
+        walk = self.create_walk(MONDAY, 30, pet=other)
+
+        created, existing, conflicts = Walk.bulk_sync(
+            self.owner, self.pet.pk, [{"id": walk.pk, **walk_at(MONDAY, 45)}]
+        )
+        self.assertEqual((created, existing, conflicts), ([], [], [walk.pk]))
+        self.assertIsNone(self.daily(MONDAY.date()))
+
+    def test_sync_endpoint(self):
+        url = reverse("walk-sync", kwargs={"pet_pk": self.pet.pk})
+        walks = [
+            {
+                "id": str(item["id"]),
+                "start_time": item["start_time"].isoformat(),
+                "end_time": item["end_time"].isoformat(),
+            }
+            for item in self.items()
+        ]
+        response = self.api().post(url, {"walks": walks}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["created"]), 2)
+
+        stranger = User.objects.create_user(username="stranger", password="password")
+        response = self.api(stranger).post(url, {"walks": walks}, format="json")
+        self.assertEqual(response.status_code, 404)
+
+
+class WalkStatsRebuildTests(WalkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_walk(MONDAY, 30)
+        self.create_walk(MONDAY + datetime.timedelta(days=40), 20)
+
+    def test_verify_reports_drift_without_writing(self):
+        WalkStats.objects.filter(pet=self.pet, date=MONDAY.date()).update(
+            total_duration=99
+        )
+        mismatches = WalkStats.verify([self.pet.pk])
+        self.assertEqual(
+            mismatches,
+            [("day", self.pet.pk, MONDAY.date(), (99, 1), (30, 1))],
+        )
+        self.assertEqual(self.daily(MONDAY.date()), (99, 1))
+
+    def test_rebuild_restores_every_rollup(self):
+        WalkStats.objects.filter(pet=self.pet).delete()
+        WeeklyWalkStats.objects.filter(pet=self.pet).update(total_walks=7)
+        MonthlyWalkStats.objects.create(
+            pet=self.pet, month_start=datetime.date(2025, 1, 1), total_walks=3
+        )
+
+        WalkStats.rebuild([self.pet.pk])
+        self.assertEqual(self.daily(MONDAY.date()), (30, 1))
+        self.assertFalse(
+            MonthlyWalkStats.objects.filter(
+                pet=self.pet, month_start=datetime.date(2025, 1, 1)
+            ).exists()
+        )
+        self.assertRollupsMatchWalks()
+
+    def test_rebuild_since_leaves_older_buckets(self):
+        WalkStats.objects.filter(pet=self.pet).update(total_duration=99)
+        later = (MONDAY + datetime.timedelta(days=40)).date()
+
+        WalkStats.rebuild([self.pet.pk], since=later)
+        self.assertEqual(self.daily(MONDAY.date()), (99, 1))
+        self.assertEqual(self.daily(later), (20, 1))
+
+    def test_command_rejects_bad_options(self):
+        with self.assertRaises(CommandError):
+            call_command("rebuild_walk_stats", workers=0)
+
+
+class LiveWalkTests(WalkTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def post(self, name):
+        return self.api().post(reverse(name, kwargs={"pet_pk": self.pet.pk}))
+
+    def test_walk_is_written_only_when_stopped(self):
+        started = self.post("walk-start")
+        self.assertEqual(started.status_code, 201)
+        self.assertEqual(self.post("walk-start").data["id"], started.data["id"])
+        self.assertEqual(self.post("walk-heartbeat").status_code, 200)
+        self.assertFalse(Walk.objects.filter(pet=self.pet).exists())
+
+        stopped = self.post("walk-stop")
+        self.assertEqual(stopped.status_code, 201)
+        self.assertEqual(stopped.data["id"], started.data["id"])
+        self.assertTrue(Walk.objects.filter(pk=started.data["id"]).exists())
+
+        self.assertEqual(self.post("walk-heartbeat").status_code, 404)
+        self.assertEqual(self.post("walk-stop").status_code, 404)
+
+    def test_other_owners_pet_cannot_be_walked(self):
+        stranger = User.objects.create_user(username="stranger", password="password")
+        url = reverse("walk-start", kwargs={"pet_pk": self.pet.pk})
+        self.assertEqual(self.api(stranger).post(url).status_code, 404)
+
+
+class WalkHistoryCursorTests(WalkTestCase):
+    def test_cursor_pages_are_stable_across_ties(self):
+        # Several walks share a start time, so the cursor must break ties by id.
+        for hours in (0, 0, 0, 0, 0, 1, 1, 2):
+            self.create_walk(MONDAY + datetime.timedelta(hours=hours), 10)
+        expected = [
+            str(walk_id)
+            for walk_id in Walk.objects.filter(pet=self.pet)
+            .order_by("-start_time", "-id")
+            .values_list("id", flat=True)
+        ]
+
+        client = self.api()
+        url = reverse("walk-list", kwargs={"pet_pk": self.pet.pk})
+        response = client.get(url, {"pagination": "cursor", "page_size": 3})
+        seen = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen.extend(walk["id"] for walk in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = client.get(response.data["next"])
+
+        self.assertEqual(seen, expected)
+
+    def test_page_number_mode_is_unchanged(self):
+        self.create_walk(MONDAY, 10)
+        url = reverse("walk-list", kwargs={"pet_pk": self.pet.pk})
+        response = self.api().get(url)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_invalid_cursor_is_not_found(self):
+        url = reverse("walk-list", kwargs={"pet_pk": self.pet.pk})
+        response = self.api().get(url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class WalkStatsETagTests(WalkTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("walk-stats-weekly-stats", kwargs={"pet_pk": self.pet.pk})
+        self.params = {"start_date": "2026-03-01", "end_date": "2026-03-07"}
+
+    def get(self, etag=None, user=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.api(user).get(self.url, self.params, headers=headers)
+
+    def test_unchanged_stats_are_not_modified(self):
+        etag = self.get()["ETag"]
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.get(f"W/{etag}").status_code, 304)
+
+    def test_new_walk_changes_the_etag(self):
+        etag = self.get()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_walk(MONDAY, 30)
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_query_is_part_of_the_etag(self):
+        etag = self.get()["ETag"]
+        self.params["end_date"] = "2026-03-08"
+        self.assertEqual(self.get(etag).status_code, 200)
+
+    def test_other_owner_is_not_found_even_with_a_matching_etag(self):
+        etag = self.get()["ETag"]
+        stranger = User.objects.create_user(username="stranger", password="password")
+        self.assertEqual(self.get(etag, user=stranger).status_code, 404)
+
+
+class BreedSketchTests(WalkTestCase):
+    def test_quantiles_are_within_the_relative_accuracy(self):
+        values = list(range(1, 1001))
+        summary = sketch.build(values)
+        for q in (0.1, 0.5, 0.9, 0.99):
+            with self.subTest(q=q):
+                exact = values[round(q * (len(values) - 1))]
+                self.assertAlmostEqual(
+                    sketch.quantile(q, *summary),
+                    exact,
+                    delta=exact * sketch.RELATIVE_ACCURACY * 1.01,
+                )
+        self.assertAlmostEqual(sketch.percentile_rank(500, *summary), 50, delta=2)
+        self.assertEqual(sketch.percentile_rank(0, *summary), 0)
+        self.assertEqual(sketch.percentile_rank(10_000, *summary), 100)
+
+    def test_merge_matches_a_single_sketch(self):
+        first, second = [0, 0, 5, 30, 60], [45, 90, 120, 240]
+        self.assertEqual(
+            sketch.merge([sketch.build(first), sketch.build(second)]),
+            sketch.build(first + second),
+        )
+
+    def test_build_from_weekly_stats(self):
+        breed = create_breed()
+        self.pet.breed = breed
+        self.pet.save()
+        others = [
+            Pet.objects.create(owner=self.owner, name=f"Dog {index}", breed=breed)
+            for index in range(3)
+        ]
+        for minutes, pet in zip((30, 60, 90), others):
+            self.create_walk(MONDAY, minutes, pet=pet)
+        self.create_walk(MONDAY, 75)
+
+        self.assertEqual(BreedWalkSketch.build(MONDAY.date()), 1)
+        built = BreedWalkSketch.objects.get(breed=breed)
+        self.assertEqual((built.week_start, built.pet_count), (MONDAY.date(), 4))
+        self.assertAlmostEqual(built.percentile_rank(75), 62.5, delta=0.1)
+
+        url = reverse("walk-stats-percentile", kwargs={"pet_pk": self.pet.pk})
+        response = self.api().get(url, {"date": "2026-03-04"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_duration"], 75)
+        self.assertAlmostEqual(response.data["percentile"], 62.5, delta=0.1)
+
+    def test_pet_without_breed_has_no_percentile(self):
+        url = reverse("walk-stats-percentile", kwargs={"pet_pk": self.pet.pk})
+        self.assertEqual(self.api().get(url).status_code, 404)
+
+
+class GoalProgressTests(WalkTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.breed = create_breed(exercise_needs=60)
+        self.pet.breed = self.breed
+        self.pet.save()
+
+    def progress(self, today=MONDAY.date()):
+        pets = Pet.objects.filter(owner=self.owner)
+        return {row["pet_id"]: row for row in goals.goal_progress(pets, today)}
+
+    def test_progress_and_compliance(self):
+        self.create_walk(MONDAY, 30)
+        for days in (1, 2):
+            self.create_walk(MONDAY - datetime.timedelta(days=days), 60)
+        self.create_walk(MONDAY - datetime.timedelta(days=7), 90)
+
+        row = self.progress()[self.pet.pk]
+        self.assertEqual((row["minutes_today"], row["goal_minutes"]), (30, 60))
+        self.assertEqual(row["progress"], 0.5)
+        self.assertEqual(row["days_goal_met"], 2)
+        self.assertAlmostEqual(row["compliance"], 2 / 7)
+
+    def test_pets_without_stats_or_breed(self):
+        stray = Pet.objects.create(owner=self.owner, name="Stray")
+        rows = self.progress()
+        self.assertEqual(rows[self.pet.pk]["minutes_today"], 0)
+        self.assertEqual(rows[self.pet.pk]["progress"], 0)
+        self.assertIsNone(rows[stray.pk]["goal_minutes"])
+        self.assertIsNone(rows[stray.pk]["compliance"])
+
+    def test_breed_change_invalidates_cached_needs(self):
+        self.assertEqual(self.progress()[self.pet.pk]["goal_minutes"], 60)
+        self.breed.exercise_needs = 90
+        self.breed.save()
+        self.assertEqual(self.progress()[self.pet.pk]["goal_minutes"], 90)
+
+    def test_goal_endpoints(self):
+        other = Pet.objects.create(owner=self.owner, name="Max")
+        response = self.api().get(reverse("walk-goals-list"))
+        self.assertEqual(
+            {row["pet_id"] for row in response.data}, {str(self.pet.pk), str(other.pk)}
+        )
+
+        url = reverse("walk-stats-goal", kwargs={"pet_pk": self.pet.pk})
+        self.assertEqual(self.api().get(url).data["goal_minutes"], 60)
+        stranger = User.objects.create_user(username="stranger", password="password")
+        self.assertEqual(self.api(stranger).get(url).status_code, 404)
@@ -0,0 +1,111 @@
+"""Packed storage and metrics for GPS tracks of walks.
+
+A track is stored as three little-endian int32 arrays of deltas:
+latitudes and longitudes in 1e-7 degrees (about 1 cm), timestamps in
+milliseconds. Each chunk is delta-encoded against the last point already
+stored, so chunks can be appended to the blobs without decoding them.
+"""
+
+import numpy as np
+
+COORDINATE_SCALE = 10_000_000
+TIMESTAMP_SCALE = 1000
+DELTA_DTYPE = np.dtype("<i4")
+
+EARTH_RADIUS = 6_371_008.8  # metres
+MIN_MOVING_SPEED = 0.5  # m/s, slower than this is standing still
+MAX_MOVING_GAP = 30  # seconds, longer gaps are treated as pauses
+MAX_POINTS_PER_CHUNK = 20_000
+
+
+def parse_points(points):
+    """Validate `[[lat, lon, unix_ts], ...]` and return an `(n, 3)` float64 array."""
+    try:
+        array = np.asarray(points, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Points must be a list of [latitude, longitude, timestamp].")
+
+    if array.ndim != 2 or array.shape[1] != 3 or not len(array):
+        raise ValueError("Points must be a list of [latitude, longitude, timestamp].")
+    if len(array) > MAX_POINTS_PER_CHUNK:
+        raise ValueError(
+            f"A chunk cannot contain more than {MAX_POINTS_PER_CHUNK} points."
+        )
+    if not np.isfinite(array).all():
+        raise ValueError("Points must contain finite numbers only.")
+    if (np.abs(array[:, 0]) > 90).any() or (np.abs(array[:, 1]) > 180).any():
+        raise ValueError("Latitude or longitude is out of range.")
+    return array
+
+
+def quantize_timestamp(timestamp):
+    return int(np.rint(timestamp * TIMESTAMP_SCALE))
+
+
+def encode_points(points, last):
+    """Delta-encode parsed points against `last = (lat, lon, ts)` quantized values.
+
+    The first chunk of a track is encoded against `(0, 0, first_ts)`, so
+    coordinates start absolute and timestamps relative to the first point.
+    Returns `(lat_bytes, lon_bytes, ts_bytes, new_last)`; `new_last` holds the
+    quantized values of the final point so the next chunk can continue the chain.
+    """
+    quantized = np.empty((len(points), 3), dtype=np.int64)
+    quantized[:, :2] = np.rint(points[:, :2] * COORDINATE_SCALE)
+    quantized[:, 2] = np.rint(points[:, 2] * TIMESTAMP_SCALE)
+
+    deltas = np.diff(quantized, axis=0, prepend=np.array([last], dtype=np.int64))
+
+    if (deltas[:, 2] < 0).any():
+        raise ValueError("Timestamps must not go backwards.")
+    info = np.iinfo(DELTA_DTYPE)
+    if (deltas < info.min).any() or (deltas > info.max).any():
+        raise ValueError("Gap between consecutive points is too large.")
+
+    encoded = deltas.astype(DELTA_DTYPE)
+    new_last = tuple(int(value) for value in quantized[-1])
+    return (
+        encoded[:, 0].tobytes(),
+        encoded[:, 1].tobytes(),
+        encoded[:, 2].tobytes(),
+        new_last,
+    )
+
+
+def decode(lat_bytes, lon_bytes, ts_bytes, base_timestamp):
+    """Decode stored blobs into float arrays of degrees and unix seconds."""
+    latitudes = np.cumsum(np.frombuffer(lat_bytes, dtype=DELTA_DTYPE), dtype=np.int64)
+    longitudes = np.cumsum(np.frombuffer(lon_bytes, dtype=DELTA_DTYPE), dtype=np.int64)
+    timestamps = np.cumsum(np.frombuffer(ts_bytes, dtype=DELTA_DTYPE), dtype=np.int64)
+    return (
+        latitudes / COORDINATE_SCALE,
+        longitudes / COORDINATE_SCALE,
+        (timestamps + base_timestamp) / TIMESTAMP_SCALE,
+    )
+
+
+def compute_metrics(latitudes, longitudes, timestamps):
+    """Return `(distance_m, moving_time_s, pace_s_per_km)` for decoded arrays."""
+    if len(latitudes) < 2:
+        return 0.0, 0, None
+
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    dlat = np.diff(lat)
+    dlon = np.diff(lon)
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    )
+    segments = 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    intervals = np.diff(timestamps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speeds = np.where(intervals > 0, segments / intervals, 0)
+    moving = (speeds >= MIN_MOVING_SPEED) & (intervals <= MAX_MOVING_GAP)
+
+    distance = float(segments.sum())
+    moving_distance = float(segments[moving].sum())
+    moving_time = round(float(intervals[moving].sum()))
+    pace = moving_time / (moving_distance / 1000) if moving_distance else None
+    return distance, moving_time, pace
@@ -0,0 +1,30 @@
+"""Per-pet version counters of the walk statistics.
+
+The version changes whenever any rollup of the pet changes, so it can be
+used to build ETags of the stats endpoints without querying the stats.
+"""
+
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(pet_id):
+    return f"walk-stats-version:{pet_id}"
+
+
+def get_version(pet_id):
+    """Return the current stats version of the pet."""
+    return cache.get_or_set(_version_key(pet_id), time.time_ns, None)
+
+
+def bump_versions(pet_ids):
+    """Change the stats version of every pet in `pet_ids`."""
+    for pet_id in set(pet_ids):
+        key = _version_key(pet_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read or evicted: restart from the clock so the new
+            # version can't repeat one that was already handed out.
+            cache.set(key, time.time_ns(), None)
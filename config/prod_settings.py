@@ -29,6 +29,16 @@ DATABASES = {
     },
 }
 
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+        },
+    }
+
 STATIC_URL = "/dj_static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
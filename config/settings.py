@@ -3,6 +3,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import sentry_sdk
+from celery.schedules import crontab
 from sentry_sdk.integrations.celery import CeleryIntegration
 from sentry_sdk.integrations.django import DjangoIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
@@ -60,6 +61,7 @@ INSTALLED_APPS = [
     "apps.reminders",
     "apps.health",
     "apps.walks",
+    "apps.reference",
 ]
 
 
@@ -146,6 +148,9 @@ CACHES = {
 
 CACHE_TIMEOUT = 3600
 
+# Время жизни незавершённой прогулки без heartbeat (в секундах)
+WALK_SESSION_TTL = 15 * 60
+
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -368,6 +373,30 @@ CELERY_WORKER_CONCURRENCY = 4  # Число воркеров
 CELERY_ENABLE_UTC = True
 CELERY_TIMEZONE = "UTC"
 
+# Периодические задачи (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    # Перцентили прогулок по породам, пересчёт каждую ночь
+    "build-breed-walk-sketches": {
+        "task": "apps.walks.tasks.build_breed_walk_sketches",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    # Совместная встречаемость и тренды симптомов
+    "rebuild-symptom-analytics": {
+        "task": "apps.health.tasks.rebuild_symptom_analytics",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Тревоги по сериям симптомов, только по измененным логам
+    "evaluate-symptom-alerts": {
+        "task": "apps.health.tasks.evaluate_symptom_alerts",
+        "schedule": crontab(minute="*/15"),
+    },
+    # Напоминания, время которых наступило
+    "dispatch-reminders": {
+        "task": "apps.reminders.tasks.dispatch_reminders",
+        "schedule": crontab(),
+    },
+}
+
 
 try:
     from .local_settings import *
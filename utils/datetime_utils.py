@@ -1,8 +1,13 @@
 # utils/datetime_utils.py
+import functools
 from datetime import datetime
 
 import pytz
+from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+_UNSET = object()
 
 
 def convert_to_utc(dt: str | datetime) -> datetime:
@@ -47,3 +52,62 @@ def convert_to_utc(dt: str | datetime) -> datetime:
         return dt.astimezone(pytz.UTC)
     except Exception as e:
         raise ValueError(f"Не удалось преобразовать время в UTC: {e}")
+
+
+@functools.cache
+def get_zone(name: str) -> pytz.BaseTzInfo:
+    """Возвращает часовой пояс по имени IANA.
+
+    Объекты поясов кешируются на весь процесс, поэтому имя разбирается
+    только при первом обращении. Неизвестные имена не кешируются.
+
+    :raises pytz.UnknownTimeZoneError: Если часовой пояс неизвестен.
+    """
+    return pytz.timezone(name)
+
+
+def local_today(zone: pytz.BaseTzInfo | None = None):
+    """Текущая дата в часовом поясе `zone` (по умолчанию UTC)."""
+    if zone is None:
+        return timezone.now().date()
+    return timezone.now().astimezone(zone).date()
+
+
+def request_timezone(request) -> pytz.BaseTzInfo | None:
+    """Часовой пояс пользователя для запроса.
+
+    Параметр `?timezone=` имеет приоритет над поясом из профиля. Пояс
+    вычисляется один раз и сохраняется на объекте запроса. Если пояс не
+    задан, возвращается None.
+
+    :raises ValidationError: Если передан неизвестный часовой пояс.
+    """
+    zone = getattr(request, "_user_timezone", _UNSET)
+    if zone is not _UNSET:
+        return zone
+
+    name = request.query_params.get("timezone")
+    if name:
+        try:
+            zone = get_zone(name)
+        except pytz.UnknownTimeZoneError:
+            raise ValidationError({"timezone": "Unknown timezone."})
+    elif request.user.is_authenticated:
+        zone = user_timezone(request.user)
+    else:
+        zone = None
+
+    request._user_timezone = zone
+    return zone
+
+
+def user_timezone(user) -> pytz.BaseTzInfo | None:
+    """Часовой пояс из профиля пользователя или None, если он не задан."""
+    try:
+        name = user.profile.timezone
+    except ObjectDoesNotExist:
+        return None
+    try:
+        return get_zone(name) if name else None
+    except pytz.UnknownTimeZoneError:
+        return None
@@ -1,7 +1,219 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError as APIValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over a unique ordering, e.g. `("-start_time", "-id")`.
+
+    The cursor holds the ordering values of the last row of the page, and the
+    next page is selected with a `WHERE (a, b) < (x, y)` style condition, so
+    page N costs the same as page 1: no `COUNT(*)` and no `OFFSET`.
+    """
+
+    ordering = ()
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(
+                self._after(self.decode_cursor(encoded, queryset.model)),
+            )
+
+        page = list(queryset[: self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[: self.page_size]
+        self.next_position = self._position(page[-1]) if self.has_next else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("results", data),
+                ],
+            ),
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Курсор следующей страницы из поля `next`.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Количество результатов на странице.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def encode_cursor(self, position):
+        payload = json.dumps(position, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, encoded, model):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position(self, instance):
+        position = []
+        for name in self.ordering:
+            value = getattr(instance, name.lstrip("-"))
+            position.append(
+                value.isoformat() if hasattr(value, "isoformat") else str(value)
+            )
+        return position
+
+    def _after(self, position):
+        """Rows strictly after `position` in `self.ordering`."""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+
+        # The redundant bound on the leading column lets Postgres turn the
+        # condition into an index range instead of a filter.
+        first = self.ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & condition
+
+
+class PageNumberOrKeysetPagination(CustomPageNumberPagination):
+    """Page-number pagination with opt-in keyset pagination.
+
+    Clients that pass `?pagination=cursor` (or a `cursor` from a previous
+    response) get `KeysetPagination` over `keyset_ordering`; everyone else
+    keeps the page-number contract. Keyset pages replace the queryset's
+    ordering, so parameters that order results some other way are listed in
+    `keyset_conflicting_params` and rejected in cursor mode.
+    """
+
+    keyset_ordering = ()
+    keyset_query_param = "pagination"
+    keyset_conflicting_params = ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if (
+            request.query_params.get(self.keyset_query_param) == "cursor"
+            or KeysetPagination.cursor_query_param in request.query_params
+        ):
+            conflicting = [
+                name
+                for name in self.keyset_conflicting_params
+                if request.query_params.get(name)
+            ]
+            if conflicting:
+                raise APIValidationError(
+                    {
+                        self.keyset_query_param: (
+                            "Cursor pagination cannot be combined with "
+                            f"{', '.join(conflicting)}."
+                        ),
+                    },
+                )
+            self.keyset = KeysetPagination(ordering=self.keyset_ordering)
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.keyset_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "`cursor` — курсорная пагинация (поля `next` и `results`, "
+                    "без общего количества)."
+                ),
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": KeysetPagination.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Курсор следующей страницы из поля `next`.",
+                "schema": {"type": "string"},
+            },
+        ]